@@ -0,0 +1,195 @@
+import glob
+import html
+import json
+import random
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, NamedTuple
+
+# corpus sintetis untuk benchmark offline: isi artikel diambil dari
+# data/outputs/*.jsonl, markup meniru halaman listing & artikel Bisnis.com
+
+PAGE_SIZE = 20
+# setiap artikel ke-N (yang cukup panjang) dipecah menjadi beberapa halaman (?page=)
+MULTIPAGE_EVERY = 5
+MULTIPAGE_PAGES = 3
+
+HOST_CHANNELS = {
+    "ekonomi.bisnis.com": [9, 10, 44, 47, 257, 259],
+    "finansial.bisnis.com": [89, 90, 215, 563],
+    "market.bisnis.com": [7, 192, 235],
+    "kabar24.bisnis.com": [15, 16, 243],
+    "teknologi.bisnis.com": [84, 101],
+    "bola.bisnis.com": [396, 397, 398],
+    "sumatra.bisnis.com": [533, 534],
+    "video.bisnis.com": [600],
+}
+
+_HEAD_NOISE = (
+    "<script>window.dataLayer = window.dataLayer || [];"
+    " dataLayer.push({'event': 'pageview', 'content_description': 'article'});</script>"
+    "<style>.x{display:none}</style>"
+)
+_MONTHS_ID = ["Januari", "Februari", "Maret", "April", "Mei", "Juni", "Juli",
+              "Agustus", "September", "Oktober", "November", "Desember"]
+_DAYS_ID = ["Senin", "Selasa", "Rabu", "Kamis", "Jumat", "Sabtu", "Minggu"]
+
+
+class Article(NamedTuple):
+    host: str
+    channel: int
+    article_id: int
+    published: datetime
+    slug: str
+    title: str
+    paragraphs: List[str]
+    pages: int = 1
+
+    @property
+    def path(self) -> str:
+        return f"/read/{self.published:%Y%m%d}/{self.channel}/{self.article_id}/{self.slug}"
+
+    @property
+    def url(self) -> str:
+        return f"https://{self.host}{self.path}"
+
+
+def _load_records(pattern: str = "data/outputs/*.jsonl") -> List[dict]:
+    records = {}
+    for path in sorted(glob.glob(pattern)):
+        if path.endswith("latest.jsonl"):
+            continue
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    rec = json.loads(line)
+                    records.setdefault(rec["link"], rec)
+    return list(records.values())
+
+
+def _split_paragraphs(content: str) -> List[str]:
+    # content tersimpan tanpa batas paragraf; pecah per kalimat berawalan kapital
+    parts = re.split(r"(?<=\S) (?=[A-Z“])", content)
+    paragraphs, buf = [], []
+    for part in parts:
+        buf.append(part)
+        if sum(len(b) for b in buf) > 200:
+            paragraphs.append(" ".join(buf) + ".")
+            buf = []
+    if buf:
+        paragraphs.append(" ".join(buf) + ".")
+    return paragraphs
+
+
+class Corpus:
+    def __init__(self, n_articles: int = 1000, end_day: date = date(2025, 11, 15), days: int = 7, seed: int = 42):
+        rng = random.Random(seed)
+        records = _load_records() or [{"title": "Judul Artikel", "content": "Isi artikel contoh. " * 40}]
+        hosts = list(HOST_CHANNELS)
+        self.articles: List[Article] = []
+        first_id = 1930000
+        for i in range(n_articles):
+            rec = records[i % len(records)]
+            paragraphs = _split_paragraphs(rec["content"])
+            multipage = i % MULTIPAGE_EVERY == 0 and len(paragraphs) >= MULTIPAGE_PAGES * 2
+            host = hosts[i % len(hosts)]
+            # id naik seiring waktu terbit (seperti id Bisnis.com)
+            published = datetime.combine(end_day - timedelta(days=days - 1), datetime.min.time()) + timedelta(
+                seconds=int(i * days * 86400 / max(1, n_articles)) + rng.randint(0, 59)
+            )
+            self.articles.append(Article(
+                host=host,
+                channel=rng.choice(HOST_CHANNELS[host]),
+                article_id=first_id + i,
+                published=published,
+                slug=re.sub(r"[^a-z0-9]+", "-", rec["title"].lower()).strip("-")[:80] or "artikel",
+                title=rec["title"],
+                # record sumber dipakai berulang; kalimat penutup unik agar isi
+                # tiap artikel berbeda (tidak di-drop dedup hash konten)
+                paragraphs=paragraphs + [f"Laporan nomor {first_id + i} dari {host}."],
+                pages=MULTIPAGE_PAGES if multipage else 1,
+            ))
+        self.articles.sort(key=lambda a: a.article_id, reverse=True)
+        self.by_path: Dict[tuple, Article] = {(a.host, a.path): a for a in self.articles}
+
+    # listing pages
+    def listing(self, host: str, day: str = None) -> List[Article]:
+        items = self.articles
+        if host != "www.bisnis.com":
+            items = [a for a in items if a.host == host]
+        if day:
+            items = [a for a in items if a.published.strftime("%Y-%m-%d") == day]
+        return items
+
+    def render_listing(self, host: str, base_path: str, page: int, day: str = None) -> str:
+        items = self.listing(host, day)
+        chunk = items[(page - 1) * PAGE_SIZE: page * PAGE_SIZE]
+        rows = "".join(
+            f'<article class="list-news"><a href="{a.url}"><h2>{html.escape(a.title)}</h2></a>'
+            f'<div class="date">{a.published:%d/%m/%Y %H:%M}</div></article>'
+            for a in chunk
+        )
+        nav = "".join(f'<li><a href="https://{h}/">{h}</a></li>' for h in HOST_CHANNELS)
+        sep = "&" if "?" in base_path else "?"
+        next_link = (
+            f'<div class="paging"><a class="next" href="{base_path}{sep}page={page + 1}">Next</a></div>'
+            if page * PAGE_SIZE < len(items) else ""
+        )
+        return (
+            f"<html><head><title>Bisnis.com</title>{_HEAD_NOISE}</head><body>"
+            f"<nav><ul>{nav}</ul></nav><main>{rows}</main>{next_link}</body></html>"
+        )
+
+    def render_article(self, a: Article, page: int = 1) -> str:
+        ld = json.dumps({
+            "@context": "https://schema.org",
+            "@type": "NewsArticle",
+            "headline": a.title,
+            "datePublished": a.published.strftime("%Y-%m-%dT%H:%M:%S+07:00"),
+        }, ensure_ascii=False)
+        body = []
+        per_page = -(-len(a.paragraphs) // a.pages)
+        for i, p in enumerate(a.paragraphs[(page - 1) * per_page: page * per_page]):
+            body.append(f"<p>{html.escape(p)}</p>")
+            if i == 1:
+                body.append('<p><strong>Baca Juga : </strong><a href="/read/20251101/1/1/x">Artikel terkait</a></p>')
+        related = "".join(
+            f'<li><a href="/read/{a.published:%Y%m%d}/{a.channel}/{a.article_id - k}/terkait">Terkait {k}</a></li>'
+            for k in range(1, 11)
+        )
+        day = _DAYS_ID[a.published.weekday()]
+        return (
+            f"<html><head><title>{html.escape(a.title)}</title>"
+            f'<meta property="og:title" content="{html.escape(a.title)}">'
+            f'<meta property="article:published_time" content="{a.published:%Y-%m-%dT%H:%M:%S}+07:00">'
+            f'<script type="application/ld+json">{ld}</script>{_HEAD_NOISE}</head><body>'
+            f"<h1 class=\"detailsTitleCaption\">{html.escape(a.title)}</h1>"
+            f'<div class="detailsAttributeDates">{day}, {a.published.day} {_MONTHS_ID[a.published.month - 1]}'
+            f" {a.published.year} | {a.published:%H:%M}</div>"
+            f'<article class="detailsContent">{"".join(body)}</article>'
+            f"{self._article_pagination(a, page)}"
+            f'<aside><ul>{related}</ul></aside></body></html>'
+        )
+
+    def _article_pagination(self, a: Article, page: int) -> str:
+        if a.pages <= 1:
+            return ""
+        links = "".join(
+            f'<a href="{a.path}?page={n}" class="{"active" if n == page else ""}">{n}</a>'
+            for n in range(1, a.pages + 1)
+        )
+        return f'<div class="pagination">{links}</div>'
+
+    def render_sitemap(self, host: str) -> str:
+        urls = "".join(
+            f"<url><loc>{a.url}</loc><news:news><news:publication_date>"
+            f"{a.published:%Y-%m-%dT%H:%M:%S}+07:00</news:publication_date></news:news></url>"
+            for a in self.listing(host)[:100]
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+            ' xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+            f"{urls}</urlset>"
+        )
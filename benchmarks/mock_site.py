@@ -0,0 +1,83 @@
+import hashlib
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.corpus import Corpus
+
+# header yang dikirim ReplayDownloadHandler berisi host asli (market.bisnis.com, ...)
+HOST_HEADER = "X-Bench-Host"
+
+
+def make_handler(corpus: Corpus, latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8", etag: bool = False):
+            data = body.encode("utf-8")
+            if latency:
+                time.sleep(latency)
+            tag = f'"{hashlib.md5(data).hexdigest()}"' if etag else None
+            if tag and self.headers.get("If-None-Match") == tag:
+                # listing tidak berubah (conditional request dari HTTP cache)
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            if tag:
+                self.send_header("ETag", tag)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            host = (self.headers.get(HOST_HEADER) or self.headers.get("Host") or "").split(":")[0]
+            parsed = urlparse(self.path)
+            query = parse_qs(parsed.query)
+            page = int(query.get("page", ["1"])[0])
+            path = parsed.path
+
+            if path == "/robots.txt":
+                return self._send(200, "User-agent: *\nAllow: /\n", "text/plain")
+            if path in ("", "/"):
+                return self._send(200, corpus.render_listing(host, "/", page), etag=True)
+            if path == "/index":
+                day = query.get("d", [None])[0]
+                base = f"/index?c=0&d={day}"
+                return self._send(200, corpus.render_listing(host, base, page, day=day), etag=True)
+            if path == "/sitemap/news.xml":
+                return self._send(200, corpus.render_sitemap(host), "application/xml")
+            if path.startswith("/read/"):
+                article = corpus.by_path.get((host, path))
+                if article is not None:
+                    if page > article.pages:
+                        return self._send(404, "<html><body>not found</body></html>")
+                    return self._send(200, corpus.render_article(article, page))
+            return self._send(404, "<html><body>not found</body></html>")
+
+    return Handler
+
+
+def serve(port: int, n_articles: int, latency: float, ready=None):
+    corpus = Corpus(n_articles=n_articles)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(corpus, latency))
+    server.daemon_threads = True
+    if ready is not None:
+        ready.set()
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    # python -m benchmarks.mock_site [port] [n_articles] [latency_s]
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8750
+    n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    lat = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+    print(f"Mock bisnis.com on 127.0.0.1:{port} ({n} articles, latency {lat}s)")
+    serve(port, n, lat)
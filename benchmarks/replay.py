@@ -0,0 +1,44 @@
+import inspect
+import os
+from urllib.parse import urlparse
+
+from scrapy.core.downloader.handlers.http11 import HTTP11DownloadHandler
+
+from benchmarks.mock_site import HOST_HEADER
+
+# download handler benchmark: semua request https://*.bisnis.com/... dikirim ke
+# mock site lokal, response dikembalikan dengan URL asli sehingga spider,
+# offsite filter dan URL classifier bekerja seperti biasa
+MOCK_ADDRESS_ENV = "BENCH_MOCK_ADDRESS"
+
+
+def _to_local(request):
+    parsed = urlparse(request.url)
+    address = os.environ.get(MOCK_ADDRESS_ENV, "127.0.0.1:8750")
+    target = f"http://{address}{parsed.path or '/'}"
+    if parsed.query:
+        target += f"?{parsed.query}"
+    local = request.replace(url=target)
+    local.headers[HOST_HEADER] = parsed.hostname or ""
+    return local
+
+
+def _restore(response, request, local):
+    if "download_latency" in local.meta:
+        request.meta["download_latency"] = local.meta["download_latency"]
+    return response.replace(url=request.url, request=request)
+
+
+if inspect.iscoroutinefunction(HTTP11DownloadHandler.download_request):
+    class ReplayDownloadHandler(HTTP11DownloadHandler):
+        async def download_request(self, request):
+            local = _to_local(request)
+            response = await super().download_request(local)
+            return _restore(response, request, local)
+else:
+    class ReplayDownloadHandler(HTTP11DownloadHandler):
+        def download_request(self, request, spider):
+            local = _to_local(request)
+            d = super().download_request(local, spider)
+            d.addCallback(_restore, request, local)
+            return d
@@ -0,0 +1,136 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from scrapy.crawler import CrawlerProcess
+from scrapy.utils.project import get_project_settings
+
+from benchmarks.mock_site import serve
+from benchmarks.replay import MOCK_ADDRESS_ENV
+from bisnis_crawler.metrics import STAGES
+from bisnis_crawler.spiders.bisnis_spider import BisnisSpider
+
+# benchmark offline: BisnisSpider vs mock site lokal (corpus dari data/outputs)
+# python -m benchmarks.run --articles 1000 --latency 0.05 --concurrency 16
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline throughput benchmark for BisnisSpider")
+    parser.add_argument("--articles", type=int, default=500, help="jumlah artikel di corpus sintetis")
+    parser.add_argument("--latency", type=float, default=0.0, help="latency per response (detik)")
+    parser.add_argument("--concurrency", type=int, default=16, help="CONCURRENT_REQUESTS")
+    parser.add_argument("--mode", choices=["standard", "backtrack"], default="standard")
+    parser.add_argument("--discovery", choices=["html", "feeds", "both"], default="html")
+    parser.add_argument("--start", default="2025-11-09")
+    parser.add_argument("--end", default="2025-11-15")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override setting Scrapy (boleh berulang)")
+    parser.add_argument("--json", dest="json_out", help="tulis ringkasan ke file JSON")
+    return parser.parse_args(argv)
+
+
+def run(args) -> dict:
+    port = _free_port()
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(port, args.articles, args.latency, ready), daemon=True)
+    server.start()
+    ready.wait(30)
+    os.environ[MOCK_ADDRESS_ENV] = f"127.0.0.1:{port}"
+
+    settings = get_project_settings()
+    workdir = Path(tempfile.mkdtemp(prefix="bisnis-bench-"))
+    settings.setdict({
+        "DOWNLOAD_HANDLERS": {
+            "http": "benchmarks.replay.ReplayDownloadHandler",
+            "https": "benchmarks.replay.ReplayDownloadHandler",
+        },
+        "CONCURRENT_REQUESTS": args.concurrency,
+        "CONCURRENT_REQUESTS_PER_DOMAIN": args.concurrency,
+        "DOWNLOAD_DELAY": 0,
+        "AUTOTHROTTLE_ENABLED": False,
+        "HOST_THROTTLE_ENABLED": False,
+        "HTTPCACHE_ENABLED": False,
+        "TELNETCONSOLE_ENABLED": False,
+        "LOG_LEVEL": "WARNING",
+        "FEEDS": {},
+        "OUTPUT_PATH": str(workdir / "output.jsonl"),
+        "SEEN_STORE_PATH": str(workdir / "seen.u64"),
+        "HIGH_WATER_MARK_PATH": str(workdir / "hwm.json"),
+        "LISTING_DIGEST_PATH": str(workdir / "listing_digests.json"),
+        "NEAR_DUP_INDEX_PATH": str(workdir / "near_dup.bin"),
+        "METRICS_SUMMARY_DIR": str(workdir / "metrics"),
+        "FRONTIER_SPILL_DIR": str(workdir / "frontier"),
+    }, priority="cmdline")
+    for override in args.set:
+        name, _, value = override.partition("=")
+        settings.set(name, value, priority="cmdline")
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(BisnisSpider)
+    spider_args = {"start_date": args.start, "mode": args.mode, "discovery": args.discovery}
+    if args.mode == "backtrack":
+        spider_args["end_date"] = args.end
+    STAGES.reset()
+    try:
+        cpu0 = _cpu_seconds()
+        t0 = time.perf_counter()
+        process.crawl(crawler, **spider_args)
+        process.start()
+        elapsed = time.perf_counter() - t0
+        cpu = _cpu_seconds() - cpu0
+    finally:
+        server.terminate()
+
+    stats = crawler.stats.get_stats()
+    pages = stats.get("response_received_count", 0)
+    items = stats.get("item_scraped_count", 0)
+    return {
+        "config": {
+            "articles": args.articles,
+            "latency_s": args.latency,
+            "concurrency": args.concurrency,
+            "mode": args.mode,
+            "discovery": args.discovery,
+            "overrides": args.set,
+        },
+        "elapsed_s": round(elapsed, 3),
+        "pages": pages,
+        "articles": items,
+        "pages_per_s": round(pages / elapsed, 2) if elapsed else 0.0,
+        "articles_per_s": round(items / elapsed, 2) if elapsed else 0.0,
+        "cpu_s": round(cpu, 3),
+        "cpu_ms_per_article": round(cpu / items * 1000, 3) if items else None,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stages": STAGES.snapshot(),
+        "skips": {k: v for k, v in stats.items() if k.startswith("bisnis/")},
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run(args)
+    print(json.dumps(report, indent=2))
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
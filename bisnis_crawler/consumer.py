@@ -0,0 +1,272 @@
+import ctypes
+import ctypes.util
+import json
+import logging
+import mmap
+import os
+import select
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+OUT_DIR = Path("data/outputs")
+STATE_DIR = Path("data/consumers")
+PATTERN = "bisnis_*.jsonl"
+
+# inotify (Linux): bangun saat file output berubah / dibuat / dipindah / dihapus
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_IN_MASK = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200  # MODIFY CLOSE_WRITE MOVED_FROM MOVED_TO CREATE DELETE
+
+
+class DirWatcher:
+    # tunggu perubahan di satu direktori; inotify via libc, fallback polling
+    def __init__(self, directory: Path, poll_interval: float = 1.0):
+        self.poll_interval = poll_interval
+        self.fd = None
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), "inotify_init1")
+            if libc.inotify_add_watch(fd, os.fsencode(str(directory)), _IN_MASK) < 0:
+                os.close(fd)
+                raise OSError(ctypes.get_errno(), "inotify_add_watch")
+            self.fd = fd
+        except (OSError, AttributeError) as e:
+            logger.debug("inotify tidak tersedia (%s), pakai polling tiap %.1fs", e, poll_interval)
+
+    @property
+    def mode(self) -> str:
+        return "inotify" if self.fd is not None else "poll"
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        # True jika ada event (mode polling: selalu True setelah interval)
+        if self.fd is None:
+            time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+            return True
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+# consumer bernama atas file output JSONL (semua file bisnis_*.jsonl di OUT_DIR,
+# termasuk file siklus baru & hasil backtrack). Posisi per file (inode + offset
+# baris lengkap terakhir) disimpan di STATE_DIR/<name>.json; commit setelah record
+# diproses -> at-least-once: setelah crash batch terakhir dikirim ulang.
+# File yang diganti (dedupe, merge backtrack: inode baru) atau menyusut dibaca ulang
+# dari awal; file yang hilang (compaction) dilepas dari state.
+class OutputConsumer:
+    def __init__(
+        self,
+        name: str,
+        out_dir=OUT_DIR,
+        state_dir=STATE_DIR,
+        start: str = "earliest",
+        poll_interval: float = 1.0,
+    ):
+        if not name or "/" in name or name.startswith("."):
+            raise ValueError(f"invalid consumer name: {name!r}")
+        if start not in ("earliest", "latest"):
+            raise ValueError(f"unknown start position: {start!r}")
+        self.name = name
+        self.out_dir = Path(out_dir)
+        self.state_path = Path(state_dir) / f"{name}.json"
+        self.poll_interval = poll_interval
+        self.stats = {"records": 0, "restarted_files": 0, "lost_files": 0, "bad_lines": 0}
+        # posisi yang sudah di-commit (persisted) dan posisi setelah poll terakhir
+        self.committed: Dict[str, dict] = {}
+        state = read_state(self.state_path)
+        if state is not None:
+            self.committed = state["files"]
+        elif start == "latest":
+            for path in self._files():
+                st = path.stat()
+                self.committed[path.name] = {"inode": st.st_ino, "offset": self._last_line_end(path, st.st_size)}
+        self.position: Dict[str, dict] = {k: dict(v) for k, v in self.committed.items()}
+        self._watcher: Optional[DirWatcher] = None
+
+    def _files(self) -> List[Path]:
+        return [
+            p for p in sorted(self.out_dir.glob(PATTERN))
+            if not p.is_symlink() and not p.name.endswith("_latest.jsonl")
+        ]
+
+    @staticmethod
+    def _last_line_end(path: Path, size: int) -> int:
+        if not size:
+            return 0
+        with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return mm.rfind(b"\n", 0, size) + 1
+
+    def _read_file(self, path: Path, max_records: int, out: list):
+        try:
+            fh = path.open("rb")
+        except FileNotFoundError:
+            return
+        with fh:
+            st = os.fstat(fh.fileno())
+            pos = self.position.get(path.name)
+            if pos is not None and (pos["inode"] != st.st_ino or pos["offset"] > st.st_size):
+                logger.info("%s diganti/menyusut, dibaca ulang dari awal (consumer %s)", path.name, self.name)
+                self.stats["restarted_files"] += 1
+                pos = None
+            if pos is None:
+                pos = self.position[path.name] = {"inode": st.st_ino, "offset": 0}
+            offset = pos["offset"]
+            if st.st_size <= offset:
+                return
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # hanya baris lengkap; baris terakhir yang belum ter-flush dibaca di poll berikutnya
+                end = mm.rfind(b"\n", offset, st.st_size) + 1
+                while offset < end and len(out) < max_records:
+                    nl = mm.find(b"\n", offset, end)
+                    line = mm[offset:nl]
+                    offset = nl + 1
+                    if not line.strip():
+                        continue
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        self.stats["bad_lines"] += 1
+                        logger.warning("Baris JSON tidak valid di %s (consumer %s)", path.name, self.name)
+            pos["offset"] = offset
+
+    def poll(self, max_records: int = 500) -> List[dict]:
+        # record baru dari semua file; posisi maju di memori, persisted lewat commit()
+        out: List[dict] = []
+        files = self._files()
+        names = {p.name for p in files}
+        for name in [n for n in self.position if n not in names]:
+            # file hilang (compaction / dihapus); sisa yang belum terbaca tidak bisa diambil lagi
+            pos = self.position.pop(name)
+            self.committed.pop(name, None)
+            logger.debug("%s hilang dari %s pada offset %d (consumer %s)", name, self.out_dir, pos["offset"], self.name)
+            self.stats["lost_files"] += 1
+        for path in files:
+            if len(out) >= max_records:
+                break
+            self._read_file(path, max_records, out)
+        self.stats["records"] += len(out)
+        return out
+
+    def commit(self):
+        self.committed = {k: dict(v) for k, v in self.position.items()}
+        write_state(self.state_path, self.name, self.committed)
+
+    def rewind(self):
+        # lupakan posisi yang belum di-commit (record sejak commit terakhir dikirim ulang)
+        self.position = {k: dict(v) for k, v in self.committed.items()}
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._watcher is None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            self._watcher = DirWatcher(self.out_dir, self.poll_interval)
+        return self._watcher.wait(timeout)
+
+    def follow(self, batch_size: int = 500, idle_timeout: Optional[float] = None) -> Iterator[dict]:
+        # generator blocking; batch di-commit setelah semua record-nya selesai diproses
+        # (record berikutnya diminta). idle_timeout: berhenti jika tidak ada data baru.
+        idle_since = time.monotonic()
+        while True:
+            batch = self.poll(batch_size)
+            if batch:
+                yield from batch
+                self.commit()
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout is not None:
+                remaining = idle_timeout - (time.monotonic() - idle_since)
+                if remaining <= 0:
+                    return
+                self.wait(min(remaining, self.poll_interval * 30))
+            else:
+                # timeout tetap dipakai: event bisa terlewat sebelum watcher dibuat
+                self.wait(self.poll_interval * 30)
+
+    def lag(self) -> Dict[str, int]:
+        # byte yang belum di-commit per file
+        out = {}
+        for path in self._files():
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            pos = self.committed.get(path.name)
+            done = pos["offset"] if pos and pos["inode"] == st.st_ino else 0
+            if st.st_size > done:
+                out[path.name] = st.st_size - done
+        return out
+
+    def close(self):
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_state(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except ValueError:
+        logger.warning("State consumer %s rusak, diabaikan", path)
+        return None
+
+
+def write_state(path: Path, name: str, files: Dict[str, dict]):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    state = {"name": name, "updated_at": datetime.now(timezone.utc).isoformat(), "files": files}
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    tmp.replace(path)
+
+
+def list_consumers(state_dir=STATE_DIR) -> List[dict]:
+    return [s for s in (read_state(p) for p in sorted(Path(state_dir).glob("*.json"))) if s]
+
+
+def unconsumed_files(out_dir=OUT_DIR, state_dir=STATE_DIR, max_idle: float = 86400.0) -> List[Path]:
+    # file output yang belum habis dibaca consumer aktif (state diperbarui < max_idle
+    # detik lalu); compaction menahan file ini agar consumer tidak kehilangan data
+    now = datetime.now(timezone.utc)
+    pending = set()
+    for state in list_consumers(state_dir):
+        try:
+            updated = datetime.fromisoformat(state["updated_at"])
+        except (KeyError, ValueError):
+            continue
+        if max_idle and (now - updated).total_seconds() > max_idle:
+            continue
+        for path in Path(out_dir).glob(PATTERN):
+            if path.is_symlink():
+                continue
+            st = path.stat()
+            pos = state["files"].get(path.name)
+            if not pos or pos["inode"] != st.st_ino or pos["offset"] < st.st_size:
+                pending.add(path)
+    return sorted(pending)
+
+
+__all__ = ["OutputConsumer", "DirWatcher", "list_consumers", "unconsumed_files"]
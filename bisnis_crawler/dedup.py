@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .seenstore import KeySet, seen_key
+from .spiders.helpers import canonicalize_url
+
+# dedup streaming: dua key 64-bit per record
+#   - link    : id artikel (path /read/...) atau hash URL kanonik
+#   - content : hash isi artikel (artikel yang sama di-publish ulang dengan id lain)
+
+# lokasi value "link"/"content" di baris JSONL mentah (tanpa decode seluruh baris)
+_LINK_VALUE_RE = re.compile(rb'"link"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_CONTENT_VALUE_RE = re.compile(rb'"content"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def link_key(url: str) -> int:
+    # URL kanonik yang sama dengan spider/dupefilter: id artikel untuk /read/...,
+    # selain itu hash URL kanonik (https, tanpa www/fragment/query tracking)
+    return seen_key(canonicalize_url(url) or url.strip())
+
+
+def content_key(content) -> Optional[int]:
+    if not content:
+        return None
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), "little")
+
+
+class StreamDeduper:
+    def __init__(self, compact: bool = True):
+        # compact: array uint64 terurut (memori kecil untuk daemon yang berjalan
+        # berminggu-minggu); dedup file offline cukup memakai set biasa (lebih cepat)
+        self._links = KeySet() if compact else set()
+        self._contents = KeySet() if compact else set()
+
+    def check(self, link_k: int, content_k: Optional[int]) -> Optional[str]:
+        # None = record baru (dan langsung dicatat), selain itu alasan duplikat
+        if link_k in self._links:
+            return "link"
+        if content_k is not None and content_k in self._contents:
+            return "content"
+        self._links.add(link_k)
+        if content_k is not None:
+            self._contents.add(content_k)
+        return None
+
+    def compact(self):
+        if isinstance(self._links, KeySet):
+            self._links.compact()
+            self._contents.compact()
+
+    def check_item(self, link: str, content: str) -> Optional[str]:
+        return self.check(link_key(link), content_key(content))
+
+    def __len__(self):
+        return len(self._links)
+
+
+def line_link(line: bytes) -> Optional[str]:
+    m = _LINK_VALUE_RE.search(line)
+    if m is None:
+        return None
+    raw_link = m.group(1)
+    if b"\\" in raw_link:
+        # jarang: URL dengan escape JSON -> decode value-nya saja
+        return json.loads(b'"' + raw_link + b'"')
+    return raw_link.decode("utf-8", "replace")
+
+
+def _line_keys(line: bytes) -> Tuple[Optional[int], Optional[int]]:
+    link = line_link(line)
+    if link is None:
+        return None, None
+    c = _CONTENT_VALUE_RE.search(line)
+    # isi di-hash dalam bentuk escaped-nya; konsisten untuk satu file
+    return link_key(link), content_key(c.group(1)) if c else None
+
+
+def dedupe_files(infiles, outfile) -> Tuple[int, int]:
+    # gabung + dedup beberapa file JSONL: baris disalin apa adanya (bytes), hanya
+    # value link/content yang dibaca; hasil ditulis ke file sementara lalu replace atomic
+    outfile = Path(outfile)
+    deduper = StreamDeduper(compact=False)
+    kept = dropped = 0
+    fd, tmpname = tempfile.mkstemp(dir=str(outfile.parent), prefix=outfile.name, suffix=".tmp")
+    try:
+        # mkstemp membuat file 0600; samakan dengan file output biasa
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "wb") as out:
+            for infile in infiles:
+                with Path(infile).open("rb") as inf:
+                    for line in inf:
+                        if not line.strip():
+                            continue
+                        link_k, content_k = _line_keys(line)
+                        if link_k is None:
+                            # tanpa link: dedup berdasarkan isi baris utuh
+                            link_k = content_key(line.strip())
+                        if deduper.check(link_k, content_k) is not None:
+                            dropped += 1
+                            continue
+                        out.write(line if line.endswith(b"\n") else line + b"\n")
+                        kept += 1
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmpname, outfile)
+    except BaseException:
+        try:
+            os.unlink(tmpname)
+        except FileNotFoundError:
+            pass
+        raise
+    return kept, dropped
+
+
+def dedupe_file(infile, outfile=None) -> Tuple[int, int]:
+    # outfile=None -> replace infile
+    return dedupe_files([infile], outfile or infile)
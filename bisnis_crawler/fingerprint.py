@@ -0,0 +1,34 @@
+import hashlib
+from weakref import WeakKeyDictionary
+
+from scrapy.utils.request import fingerprint
+
+from .spiders.helpers import canonicalize_url, classify_article_url
+
+
+# fingerprint request (dupefilter, JOBDIR requests.seen, key httpcache):
+#   - GET artikel  -> id artikel; varian www/http/slug/?page=/utm_ jadi satu request
+#   - lainnya      -> fingerprint default Scrapy atas URL kanonik
+class ArticleRequestFingerprinter:
+    def __init__(self, crawler=None):
+        self._cache = WeakKeyDictionary()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def fingerprint(self, request) -> bytes:
+        fp = self._cache.get(request)
+        if fp is None:
+            fp = self._cache[request] = self._fingerprint(request)
+        return fp
+
+    def _fingerprint(self, request) -> bytes:
+        if request.method == "GET":
+            info = classify_article_url(request.url)
+            if info is not None:
+                return hashlib.sha1(b"bisnis-article:%d" % info.article_id).digest()
+            canonical = canonicalize_url(request.url)
+            if canonical and canonical != request.url:
+                return fingerprint(request.replace(url=canonical))
+        return fingerprint(request)
@@ -0,0 +1,180 @@
+import logging
+import os
+import shutil
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional
+
+from scrapy.core.scheduler import Scheduler
+from scrapy.dupefilters import BaseDupeFilter
+from scrapy.utils.job import job_dir
+
+from . import signals as bisnis_signals
+from .seenstore import KeySet
+
+logger = logging.getLogger(__name__)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# frontier dengan batas memori: tanpa JOBDIR, request di atas FRONTIER_MEMORY_REQUESTS
+# (atau semua request baru selama memory_pressure) ditulis ke disk queue Scrapy di
+# FRONTIER_SPILL_DIR/<pid>. Memory queue tetap dikuras lebih dulu; disk queue setelahnya.
+# Dengan JOBDIR perilaku Scheduler bawaan tidak berubah (semua request di disk).
+class SpillScheduler(Scheduler):
+    memory_limit = 10000
+    spill_root: Optional[Path] = None
+    pressure = False
+    _spill = False
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        scheduler = super().from_crawler(crawler)
+        settings = crawler.settings
+        scheduler.memory_limit = settings.getint("FRONTIER_MEMORY_REQUESTS", 10000)
+        spill_dir = settings.get("FRONTIER_SPILL_DIR")
+        scheduler.spill_root = Path(spill_dir) if spill_dir else None
+        crawler.signals.connect(scheduler._on_memory_pressure, signal=bisnis_signals.memory_pressure)
+        return scheduler
+
+    def open(self, spider):
+        self._spill = self.dqdir is None and self.spill_root is not None
+        if self._spill:
+            self.dqdir = str(self._spill_dir())
+        return super().open(spider)
+
+    def close(self, reason):
+        lost = len(self.dqs) if self._spill and self.dqs is not None else 0
+        result = super().close(reason)
+        if self._spill:
+            # bukan JOBDIR: isi spill tidak bisa di-resume (dupefilter/state tidak tersimpan)
+            if lost:
+                logger.info("%d request di frontier disk tidak diproses (spider ditutup: %s)", lost, reason)
+            shutil.rmtree(self.dqdir, ignore_errors=True)
+        return result
+
+    def _spill_dir(self) -> Path:
+        root = self.spill_root
+        root.mkdir(parents=True, exist_ok=True)
+        # sisa proses yang mati tanpa close (crash / kill -9)
+        for old in root.iterdir():
+            if old.is_dir() and old.name.isdigit() and not _pid_alive(int(old.name)):
+                shutil.rmtree(old, ignore_errors=True)
+        path = root / str(os.getpid())
+        shutil.rmtree(path, ignore_errors=True)
+        path.mkdir()
+        return path
+
+    def _dqpush(self, request) -> bool:
+        if self._spill and not self.pressure and (not self.memory_limit or len(self.mqs) < self.memory_limit):
+            return False
+        return super()._dqpush(request)
+
+    def spill(self) -> int:
+        # pindahkan seluruh memory queue ke disk (urutan prioritas tetap)
+        if self.dqs is None:
+            return 0
+        kept = []
+        moved = 0
+        while True:
+            request = self.mqs.pop()
+            if request is None:
+                break
+            if super()._dqpush(request):
+                moved += 1
+            else:
+                kept.append(request)
+        for request in kept:
+            self.mqs.push(request)
+        if moved and self.stats is not None:
+            self.stats.inc_value("bisnis/frontier/spilled", moved)
+        return moved
+
+    def _on_memory_pressure(self, spider, rss, active):
+        self.pressure = active
+        if active:
+            moved = self.spill()
+            logger.info("Memory pressure: %d request dipindah ke frontier disk (%d di disk)",
+                        moved, len(self.dqs) if self.dqs is not None else 0)
+
+
+# dupefilter dengan fingerprint disimpan sebagai uint64 (8 byte pertama SHA1) di KeySet,
+# bukan bytes 20 byte di set (~90 byte/request). Dibangun di atas BaseDupeFilter (API
+# publik) dengan file sendiri di JOBDIR: requests.seen.u64, uint64 little-endian per
+# request, append-only (entry parsial di ekor setelah crash diabaikan).
+class CompactDupeFilter(BaseDupeFilter):
+    filename = "requests.seen.u64"
+
+    def __init__(self, path=None, debug=False, *, fingerprinter=None, stats=None):
+        self.debug = debug
+        self.logdupes = True
+        self.fingerprinter = fingerprinter
+        self.stats = stats
+        self.file = None
+        self.keys = KeySet()
+        if path:
+            seen = Path(path) / self.filename
+            data = seen.read_bytes() if seen.exists() else b""
+            usable = len(data) - len(data) % 8
+            stored = array("Q")
+            stored.frombytes(data[:usable])
+            if sys.byteorder != "little":
+                stored.byteswap()
+            self.keys = KeySet(stored)
+            self.file = seen.open("ab")
+            # potong entry parsial supaya entry berikutnya tetap sejajar 8 byte
+            self.file.truncate(usable)
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        dupefilter = cls(
+            job_dir(settings),
+            settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=crawler.request_fingerprinter,
+            stats=crawler.stats,
+        )
+        crawler.signals.connect(dupefilter._on_memory_pressure, signal=bisnis_signals.memory_pressure)
+        return dupefilter
+
+    def request_seen(self, request) -> bool:
+        key = int.from_bytes(self.fingerprinter.fingerprint(request)[:8], "little")
+        if not self.keys.add(key):
+            return True
+        if self.file:
+            self.file.write(key.to_bytes(8, "little"))
+        return False
+
+    def close(self, reason):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def log(self, request, spider):
+        if self.debug:
+            logger.debug("Filtered duplicate request: %(request)s", {"request": request}, extra={"spider": spider})
+        elif self.logdupes:
+            logger.debug(
+                "Filtered duplicate request: %(request)s - no more duplicates will be shown"
+                " (see DUPEFILTER_DEBUG to show all duplicates)",
+                {"request": request}, extra={"spider": spider},
+            )
+            self.logdupes = False
+        if self.stats is not None:
+            self.stats.inc_value("dupefilter/filtered")
+
+    def _on_memory_pressure(self, spider, rss, active):
+        if active:
+            self.keys.compact()
+
+
+__all__ = ["SpillScheduler", "CompactDupeFilter"]
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional
+
+from scrapy.extensions.httpcache import RFC2616Policy
+
+logger = logging.getLogger(__name__)
+
+
+# cache HTTP hanya untuk halaman listing/indeks (request dengan meta "listing").
+# Response disimpan jika punya validator (ETag / Last-Modified); setiap request
+# berikutnya selalu dikirim sebagai conditional request (If-None-Match /
+# If-Modified-Since) -> 304 dilayani dari cache dengan flag "cached".
+class ListingCachePolicy(RFC2616Policy):
+    def should_cache_request(self, request) -> bool:
+        return bool(request.meta.get("listing")) and super().should_cache_request(request)
+
+    def should_cache_response(self, response, request) -> bool:
+        # tanpa validator, cache listing tidak berguna (ditangani digest link-set)
+        if response.status != 200:
+            return False
+        return b"ETag" in response.headers or b"Last-Modified" in response.headers
+
+    def is_cached_response_fresh(self, cachedresponse, request) -> bool:
+        # listing tidak pernah dianggap fresh: selalu tanya server
+        self._set_conditional_validators(request, cachedresponse)
+        return False
+
+
+def link_set_digest(links: Iterable[str]) -> str:
+    h = hashlib.blake2b(digest_size=8)
+    for link in sorted(set(links)):
+        h.update(link.encode("utf-8"))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+# digest link-set per URL listing (persisten lintas run): listing tanpa
+# ETag/Last-Modified yang isinya sama dengan fetch sebelumnya tidak di-parse ulang
+class ListingDigests:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.digests = {}
+        self._dirty = False
+        if self.path.exists():
+            try:
+                self.digests = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception:
+                logger.warning("File digest listing %s tidak valid, diabaikan.", self.path)
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["ListingDigests"]:
+        path = settings.get("LISTING_DIGEST_PATH")
+        return cls(path) if path else None
+
+    def changed(self, url: str, digest: str) -> bool:
+        if self.digests.get(url) == digest:
+            return False
+        self.digests[url] = digest
+        self._dirty = True
+        return True
+
+    def save(self):
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.digests, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
@@ -5,3 +5,6 @@ class ArticleItem(scrapy.Item):
     title = scrapy.Field()
     content = scrapy.Field()
     published_at = scrapy.Field()  # ISO 8601 string
+    cluster_id = scrapy.Field()    # id cluster near-duplicate (NearDuplicatePipeline)
+    pages = scrapy.Field()         # jumlah halaman (hanya artikel multi-halaman)
+    partial = scrapy.Field()       # True jika ada halaman yang gagal / timeout
@@ -0,0 +1,113 @@
+import ctypes
+import ctypes.util
+import gc
+import logging
+import os
+import time
+from typing import Optional
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.internet.task import LoopingCall
+
+from . import signals as bisnis_signals
+
+logger = logging.getLogger(__name__)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+_MB = 1024 * 1024
+
+
+def rss_bytes() -> Optional[int]:
+    # RSS saat ini (bukan peak seperti ru_maxrss); None jika /proc tidak ada
+    try:
+        with open("/proc/self/statm", "rb") as fh:
+            return int(fh.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def release_memory():
+    # gc + kembalikan arena malloc yang kosong ke OS (glibc); tanpa ini RSS jarang turun
+    gc.collect()
+    try:
+        ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+# batas RSS untuk daemon yang berjalan lama: RSS >= MEMORY_BUDGET_MB -> signal
+# memory_pressure (frontier di-spill ke disk, dedup/dupefilter/seen store
+# di-compact) lalu gc + malloc_trim; selesai saat RSS < budget x release_ratio
+class MemoryBudget:
+    def __init__(self, crawler, budget_mb: float, interval: float = 10.0, release_ratio: float = 0.85,
+                 cooldown: float = 60.0):
+        self.crawler = crawler
+        self.budget = int(budget_mb * _MB)
+        self.interval = interval
+        self.release_ratio = release_ratio
+        self.cooldown = cooldown
+        self.active = False
+        self.spider = None
+        self._last_pressure = 0.0
+        self._task = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        budget_mb = settings.getfloat("MEMORY_BUDGET_MB", 0)
+        if budget_mb <= 0:
+            raise NotConfigured
+        if rss_bytes() is None:
+            logger.warning("MEMORY_BUDGET_MB di-set tetapi RSS tidak bisa dibaca (/proc), dimatikan.")
+            raise NotConfigured
+        ext = cls(
+            crawler,
+            budget_mb,
+            interval=settings.getfloat("MEMORY_BUDGET_CHECK_INTERVAL", 10.0),
+            release_ratio=settings.getfloat("MEMORY_BUDGET_RELEASE_RATIO", 0.85),
+        )
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def spider_opened(self, spider):
+        self.spider = spider
+        self._task = LoopingCall(self.check)
+        self._task.start(self.interval, now=False)
+
+    def spider_closed(self, spider, reason):
+        if self._task is not None and self._task.running:
+            self._task.stop()
+        self._task = None
+
+    def check(self):
+        rss = rss_bytes()
+        if rss is None:
+            return
+        stats = self.crawler.stats
+        stats.max_value("bisnis/memory/rss_peak_mb", rss // _MB)
+        if rss >= self.budget:
+            now = time.monotonic()
+            if self.active and now - self._last_pressure < self.cooldown:
+                return
+            self.active = True
+            self._last_pressure = now
+            stats.inc_value("bisnis/memory/pressure")
+            self.crawler.signals.send_catch_log(
+                bisnis_signals.memory_pressure, spider=self.spider, rss=rss, active=True
+            )
+            release_memory()
+            logger.warning(
+                "RSS %d MB >= budget %d MB: frontier di-spill ke disk, struktur di-compact (RSS sekarang %d MB)",
+                rss // _MB, self.budget // _MB, (rss_bytes() or 0) // _MB,
+            )
+        elif self.active and rss < self.budget * self.release_ratio:
+            self.active = False
+            self.crawler.signals.send_catch_log(
+                bisnis_signals.memory_pressure, spider=self.spider, rss=rss, active=False
+            )
+            logger.info("RSS %d MB kembali di bawah budget, frontier memori aktif lagi", rss // _MB)
+
+
+__all__ = ["MemoryBudget", "rss_bytes", "release_memory"]
@@ -0,0 +1,259 @@
+import json
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+from twisted.web.resource import Resource
+from twisted.web.server import Site
+
+from . import signals as bisnis_signals
+
+logger = logging.getLogger(__name__)
+
+# batas atas bucket histogram (detik), gaya Prometheus (le=...)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # slot terakhir = +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        # perkiraan dari bucket: batas atas bucket tempat kuantil jatuh
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return BUCKETS[i] if i < len(BUCKETS) else BUCKETS[-1]
+        return BUCKETS[-1]
+
+    def cumulative(self):
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            yield ("+Inf" if i == len(BUCKETS) else repr(BUCKETS[i])), seen
+
+
+# akumulasi waktu per tahap hot-path (listing, extraction, cleaning, date parsing,
+# pipeline, download); sengaja murah: dua perf_counter + update dict per observasi.
+# Tahap "download" juga dicatat per host (latency per subdomain).
+class StageTimer:
+    def __init__(self):
+        self.enabled = True
+        self.totals = defaultdict(float)
+        self.counts = defaultdict(int)
+        self.histograms: Dict[Tuple[str, Optional[str]], Histogram] = defaultdict(Histogram)
+
+    def observe(self, stage: str, seconds: float, host: Optional[str] = None):
+        if not self.enabled:
+            return
+        self.totals[stage] += seconds
+        self.counts[stage] += 1
+        self.histograms[(stage, None)].observe(seconds)
+        if host:
+            self.histograms[(stage, host)].observe(seconds)
+
+    def time(self, stage: str) -> "_Timing":
+        return _Timing(self, stage)
+
+    def snapshot(self) -> dict:
+        out = {}
+        for stage, total in sorted(self.totals.items()):
+            hist = self.histograms[(stage, None)]
+            out[stage] = {
+                "count": self.counts[stage],
+                "total_s": round(total, 6),
+                "avg_ms": round(total / self.counts[stage] * 1000, 4) if self.counts[stage] else 0.0,
+                "p50_ms": round(hist.quantile(0.5) * 1000, 4),
+                "p95_ms": round(hist.quantile(0.95) * 1000, 4),
+            }
+        return out
+
+    def hosts(self, stage: str = "download") -> dict:
+        return {
+            host: {
+                "count": hist.count,
+                "avg_ms": round(hist.total / hist.count * 1000, 4) if hist.count else 0.0,
+                "p95_ms": round(hist.quantile(0.95) * 1000, 4),
+            }
+            for (s, host), hist in sorted(self.histograms.items(), key=lambda kv: str(kv[0]))
+            if s == stage and host
+        }
+
+    def reset(self):
+        self.totals.clear()
+        self.counts.clear()
+        self.histograms.clear()
+
+
+class _Timing:
+    __slots__ = ("_timer", "_stage", "_start")
+
+    def __init__(self, timer: StageTimer, stage: str):
+        self._timer = timer
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._timer.observe(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+STAGES = StageTimer()
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def render_prometheus(timer: StageTimer, stats: dict) -> str:
+    # text exposition format 0.0.4
+    lines = [
+        "# HELP bisnis_stage_seconds Waktu per tahap hot-path crawler.",
+        "# TYPE bisnis_stage_seconds histogram",
+    ]
+    download = []
+    for (stage, host), hist in sorted(timer.histograms.items(), key=lambda kv: str(kv[0])):
+        if host:
+            download.append((stage, host, hist))
+            continue
+        labels = f'stage="{_label(stage)}"'
+        for le, n in hist.cumulative():
+            lines.append(f'bisnis_stage_seconds_bucket{{{labels},le="{le}"}} {n}')
+        lines.append(f"bisnis_stage_seconds_sum{{{labels}}} {hist.total:.6f}")
+        lines.append(f"bisnis_stage_seconds_count{{{labels}}} {hist.count}")
+    lines += [
+        "# HELP bisnis_host_seconds Latency download per subdomain.",
+        "# TYPE bisnis_host_seconds histogram",
+    ]
+    for stage, host, hist in download:
+        labels = f'stage="{_label(stage)}",host="{_label(host)}"'
+        for le, n in hist.cumulative():
+            lines.append(f'bisnis_host_seconds_bucket{{{labels},le="{le}"}} {n}')
+        lines.append(f"bisnis_host_seconds_sum{{{labels}}} {hist.total:.6f}")
+        lines.append(f"bisnis_host_seconds_count{{{labels}}} {hist.count}")
+    # stats Scrapy (counter skip/dedup/item/response, ...) sebagai satu metric berlabel
+    lines += [
+        "# HELP bisnis_scrapy_stat Nilai numerik stats collector Scrapy.",
+        "# TYPE bisnis_scrapy_stat untyped",
+    ]
+    for key, value in sorted(stats.items()):
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f'bisnis_scrapy_stat{{key="{_label(key)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+class MetricsExtension:
+    # endpoint HTTP lokal (/metrics Prometheus, /summary JSON) selama crawler hidup
+    # + ringkasan JSON per run di METRICS_SUMMARY_DIR (ditulis ulang setiap siklus daemon)
+    def __init__(self, crawler, port: Optional[int], host: str, summary_dir: Optional[str]):
+        self.crawler = crawler
+        self.port = port
+        self.host = host
+        self.summary_dir = Path(summary_dir) if summary_dir else None
+        self.started_at = datetime.now(timezone.utc)
+        self.cycle = 0
+        self._listener = None
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("METRICS_ENABLED", True):
+            raise NotConfigured
+        port = settings.getint("METRICS_PORT", 0) or None
+        summary_dir = settings.get("METRICS_SUMMARY_DIR")
+        if port is None and not summary_dir:
+            raise NotConfigured
+        ext = cls(crawler, port, settings.get("METRICS_HOST", "127.0.0.1"), summary_dir)
+        crawler.signals.connect(ext.spider_opened, signal=signals.spider_opened)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        crawler.signals.connect(ext.cycle_finished, signal=bisnis_signals.cycle_finished)
+        return ext
+
+    def spider_opened(self, spider):
+        if self.port is None:
+            return
+        from twisted.internet import reactor
+
+        try:
+            self._listener = reactor.listenTCP(self.port, Site(_MetricsResource(self)), interface=self.host)
+        except Exception as e:
+            logger.warning("Endpoint metrics %s:%s gagal dibuka: %s", self.host, self.port, e)
+            return
+        logger.info("Metrics: http://%s:%s/metrics", self.host, self.port)
+
+    def cycle_finished(self, spider, cycle, started_at, finished_at):
+        self.cycle = cycle
+        self.write_summary()
+
+    def spider_closed(self, spider, reason):
+        self.write_summary(reason)
+        if self._listener is not None:
+            self._listener.stopListening()
+            self._listener = None
+
+    def summary(self, finish_reason: Optional[str] = None) -> dict:
+        stats = self.crawler.stats.get_stats()
+        return {
+            "run_started": self.started_at.isoformat(),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+            "cycle": self.cycle,
+            "finish_reason": finish_reason,
+            "stages": STAGES.snapshot(),
+            "hosts": STAGES.hosts(),
+            "skips": {k: v for k, v in stats.items() if k.startswith("bisnis/")},
+            "stats": stats,
+        }
+
+    def write_summary(self, finish_reason: Optional[str] = None):
+        if self.summary_dir is None:
+            return
+        self.summary_dir.mkdir(parents=True, exist_ok=True)
+        stamp = self.started_at.strftime("%Y-%m-%dT%H-%M-%SZ")
+        path = self.summary_dir / f"run_{stamp}_{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.summary(finish_reason), indent=1, default=str), encoding="utf-8")
+        tmp.replace(path)
+
+
+class _MetricsResource(Resource):
+    isLeaf = True
+
+    def __init__(self, ext: MetricsExtension):
+        super().__init__()
+        self.ext = ext
+
+    def render_GET(self, request):
+        if request.path == b"/metrics":
+            request.setHeader(b"Content-Type", b"text/plain; version=0.0.4; charset=utf-8")
+            return render_prometheus(STAGES, self.ext.crawler.stats.get_stats()).encode("utf-8")
+        if request.path == b"/summary":
+            request.setHeader(b"Content-Type", b"application/json")
+            return json.dumps(self.ext.summary(), default=str).encode("utf-8")
+        request.setResponseCode(404)
+        return b"not found\n"
+
+
+__all__ = ["StageTimer", "STAGES", "Histogram", "render_prometheus", "MetricsExtension"]
@@ -0,0 +1,255 @@
+import hashlib
+import logging
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# near-duplicate (artikel sindikasi di subdomain lain dengan edit kecil):
+# SimHash 64-bit dari shingle 3 kata isi artikel. Dua artikel dianggap near-dup
+# jika jarak Hamming <= max_distance (<= 3).
+#
+# LSH: 64 bit dibagi 4 band x 16 bit. Jarak <= 3 -> minimal satu band identik
+# (pigeonhole), jadi cukup 4 tabel: simhash yang di-rotate supaya band ke-i ada
+# di 16 bit teratas, diurutkan; lookup = bisect ke rentang prefix 16 bit lalu
+# cek Hamming kandidat di rentang itu (~n/65536 kandidat per tabel).
+
+SHINGLE_WORDS = 3
+BANDS = 4
+_BAND_BITS = 64 // BANDS
+_MASK = (1 << 64) - 1
+_SUFFIX_MASK = (1 << (64 - _BAND_BITS)) - 1
+_ENTRY = struct.Struct("<QQQ")  # simhash, key artikel, cluster id
+# konstanta multiplicative hashing (ganjil, 64-bit)
+_K1 = 0x9E3779B97F4A7C15
+_K2 = 0xC2B2AE3D27D4EB4F
+_K3 = 0x165667B19E3779F9
+_MIX = 0xBF58476D1CE4E5B9
+
+_WORD_RE = re.compile(r"\w+", flags=re.UNICODE)
+
+
+def _word_hash(word: str) -> int:
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def simhash(text: Optional[str]) -> Optional[int]:
+    if not text:
+        return None
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS * 2:
+        return None
+    # hash per kata unik (blake2b, stabil lintas process), shingle 3 kata = kombinasi
+    # multiplicative + finalizer; jauh lebih murah dari hash per string shingle
+    cache = {}
+    ids = []
+    for w in words:
+        h = cache.get(w)
+        if h is None:
+            h = cache[w] = _word_hash(w)
+        ids.append(h)
+    shingles = {(a * _K1 ^ b * _K2 ^ c * _K3) & _MASK for a, b, c in zip(ids, ids[1:], ids[2:])}
+    # bit ke-i = mayoritas bit ke-i semua shingle; kolom bit = slice string biner (di C)
+    bits = "".join([format((h ^ (h >> 29)) * _MIX & _MASK, "064b") for h in shingles])
+    half = len(shingles) / 2
+    value = 0
+    for i in range(64):
+        value = (value << 1) | (bits[i::64].count("1") > half)
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _rotate(value: int, band: int) -> int:
+    # band ke-`band` (dari bit teratas) dipindah ke 16 bit teratas
+    shift = band * _BAND_BITS
+    return ((value << shift) | (value >> (64 - shift))) & _MASK if shift else value
+
+
+def _splice(old: array, positions: List[int], values: List[int]) -> array:
+    # sisipkan values (terurut, posisi dari bisect di old) ke salinan old; potongan
+    # lama disalin per slice (C), hanya entry baru yang di-loop
+    merged = array("Q")
+    prev = 0
+    for i, value in zip(positions, values):
+        merged.extend(old[prev:i])
+        merged.append(value)
+        prev = i
+    merged.extend(old[prev:])
+    return merged
+
+
+def _positions(old: array, values: List[int]) -> List[int]:
+    positions = []
+    lo = 0
+    for value in values:
+        lo = bisect_left(old, value, lo)
+        positions.append(lo)
+    return positions
+
+
+class Match(NamedTuple):
+    simhash: int
+    key: int
+    cluster: int
+    distance: int
+
+
+class SimHashIndex:
+    # log append-only di disk (entry simhash/key/cluster); tabel band dibangun di memori
+    # saat load. Entry baru ditampung di _pending + dict per band, lalu saat flush
+    # batch terurut itu di-merge ke tiap tabel (tanpa sort ulang seluruh index).
+    # base: index lain yang hanya dibaca (index global untuk shard backtrack), log
+    # milik index ini hanya berisi entry yang ditambahkan sendiri
+    def __init__(self, path, max_distance: int = 3, flush_every: int = 100000, base=None):
+        if not 0 <= max_distance < BANDS:
+            raise ValueError(f"max_distance harus 0..{BANDS - 1}")
+        self.path = Path(path)
+        self.base = Path(base) if base else None
+        self.max_distance = max_distance
+        self.flush_every = int(flush_every) if flush_every else 0
+        self._pending: List[Tuple[int, int, int]] = []
+        self._pending_bands: List[dict] = [{} for _ in range(BANDS)]
+        self._hashes = array("Q")
+        self._keys = array("Q")
+        self._clusters = array("Q")
+        self._tables: List[array] = []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["SimHashIndex"]:
+        path = settings.get("NEAR_DUP_INDEX_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            max_distance=settings.getint("NEAR_DUP_MAX_DISTANCE", 3),
+            flush_every=settings.getint("NEAR_DUP_FLUSH_EVERY", 100000),
+            base=settings.get("NEAR_DUP_BASE_PATH"),
+        )
+
+    @staticmethod
+    def read_log(path) -> Iterator[Tuple[int, int, int]]:
+        path = Path(path)
+        if not path.exists():
+            return iter(())
+        data = path.read_bytes()
+        # abaikan entry parsial di ekor (crash di tengah append)
+        usable = len(data) - len(data) % _ENTRY.size
+        return _ENTRY.iter_unpack(data[:usable])
+
+    def _load(self):
+        entries = list(self.read_log(self.path))
+        if self.base is not None and self.base != self.path:
+            entries += self.read_log(self.base)
+        self._build(entries)
+
+    def _build(self, entries: List[Tuple[int, int, int]]):
+        # tabel 0 = simhash terurut + key/cluster paralel; tabel 1..3 = rotasi terurut
+        entries.sort()
+        self._hashes = array("Q", (e[0] for e in entries))
+        self._keys = array("Q", (e[1] for e in entries))
+        self._clusters = array("Q", (e[2] for e in entries))
+        self._tables = [self._hashes] + [
+            array("Q", sorted(_rotate(h, band) for h in self._hashes)) for band in range(1, BANDS)
+        ]
+
+    def _merge_pending(self):
+        batch = sorted(self._pending)
+        values = [e[0] for e in batch]
+        positions = _positions(self._hashes, values)
+        self._hashes = _splice(self._hashes, positions, values)
+        self._keys = _splice(self._keys, positions, [e[1] for e in batch])
+        self._clusters = _splice(self._clusters, positions, [e[2] for e in batch])
+        tables = [self._hashes]
+        for band, table in enumerate(self._tables[1:], 1):
+            rotated = sorted(_rotate(v, band) for v in values)
+            tables.append(_splice(table, _positions(table, rotated), rotated))
+        self._tables = tables
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._pending)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int]]:
+        yield from zip(self._hashes, self._keys, self._clusters)
+        yield from self._pending
+
+    def contains(self, value: int, key: int) -> bool:
+        i = bisect_left(self._hashes, value)
+        while i < len(self._hashes) and self._hashes[i] == value:
+            if self._keys[i] == key:
+                return True
+            i += 1
+        for h, k, _ in self._pending_bands[0].get(value >> (64 - _BAND_BITS), ()):
+            if h == value and k == key:
+                return True
+        return False
+
+    def _resolve(self, value: int, distance: int) -> Match:
+        i = bisect_left(self._hashes, value)
+        return Match(value, self._keys[i], self._clusters[i], distance)
+
+    def query(self, value: int) -> Optional[Match]:
+        # match terdekat dalam max_distance (None jika tidak ada)
+        best = None
+        for band, buckets in enumerate(self._pending_bands):
+            for h, key, cluster in buckets.get(_rotate(value, band) >> (64 - _BAND_BITS), ()):
+                d = hamming(h, value)
+                if d <= self.max_distance and (best is None or d < best.distance):
+                    best = Match(h, key, cluster, d)
+                    if d == 0:
+                        return best
+        for band, table in enumerate(self._tables):
+            rotated = _rotate(value, band)
+            prefix = rotated & ~_SUFFIX_MASK & _MASK
+            i = bisect_left(table, prefix)
+            n = len(table)
+            while i < n and table[i] & ~_SUFFIX_MASK & _MASK == prefix:
+                d = hamming(table[i], rotated)
+                if d <= self.max_distance and (best is None or d < best.distance):
+                    # rotasi balik -> simhash asli untuk ambil key/cluster dari tabel 0
+                    shift = band * _BAND_BITS
+                    original = ((table[i] >> shift) | (table[i] << (64 - shift))) & _MASK if shift else table[i]
+                    best = self._resolve(original, d)
+                    if d == 0:
+                        return best
+                i += 1
+        return best
+
+    def add(self, value: int, key: int, cluster: int):
+        entry = (value, key, cluster)
+        self._pending.append(entry)
+        for band, buckets in enumerate(self._pending_bands):
+            buckets.setdefault(_rotate(value, band) >> (64 - _BAND_BITS), []).append(entry)
+        if self.flush_every and len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def merge(self, entries: Iterable[Tuple[int, int, int]]):
+        # entry dari index lain (log shard backtrack) yang pasangan simhash/key-nya belum tercatat
+        for value, key, cluster in entries:
+            if not self.contains(value, key):
+                self.add(value, key, cluster)
+
+    def flush(self):
+        if not self._pending:
+            return
+        with self.path.open("ab") as fh:
+            fh.write(b"".join(_ENTRY.pack(*e) for e in self._pending))
+            fh.flush()
+            os.fsync(fh.fileno())
+        self._merge_pending()
+        self._pending.clear()
+        for buckets in self._pending_bands:
+            buckets.clear()
+        logger.debug("SimHashIndex %s flushed, %d entries", self.path, len(self._hashes))
+
+    def close(self):
+        self.flush()
@@ -0,0 +1,105 @@
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from parsel import Selector
+from scrapy.utils.defer import maybe_deferred_to_future
+from twisted.internet import defer
+
+from .metrics import StageTimer
+from .spiders.extractor import ExtractedArticle, extract_article
+from .spiders.helpers import parse_date
+
+logger = logging.getLogger(__name__)
+
+
+def gil_disabled() -> bool:
+    # build free-threaded (PEP 703) dengan GIL benar-benar mati
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled is not None and not is_enabled()
+
+
+def extract_job(body: bytes, encoding: str, page_links: bool) -> Tuple[ExtractedArticle, Optional[object], Dict[str, float]]:
+    # dijalankan di worker: parse HTML + extraction + cleaning + parse tanggal;
+    # hanya bytes masuk dan NamedTuple/datetime keluar (murah di-pickle). Waktu per
+    # tahap dikembalikan (STAGES di process worker tidak terlihat oleh parent)
+    timer = StageTimer()
+    with timer.time("extraction"):
+        root = Selector(text=body.decode(encoding or "utf-8", "replace"), type="html").root
+        extracted = extract_article(root, min_total_length=40, page_links=page_links, timer=timer)
+    pub_dt = None
+    if extracted.published_raw:
+        try:
+            with timer.time("date_parsing"):
+                pub_dt = parse_date(extracted.published_raw, tz="Asia/Jakarta", assume_utc_if_naive=True)
+        except Exception:
+            pub_dt = None
+    return extracted, pub_dt, dict(timer.totals)
+
+
+# pool extraction di luar reactor thread: process pool (spawn) atau thread pool
+# untuk build free-threaded. Jumlah job in-flight dibatasi max_pending; callback
+# yang melebihi batas menunggu slot (reactor tetap melayani I/O), sementara Scrapy
+# sendiri menahan download baru lewat batas ukuran response aktif di scraper.
+class ExtractionPool:
+    def __init__(self, workers: int, max_pending: int = 0, kind: str = "auto"):
+        if kind == "auto":
+            kind = "thread" if gil_disabled() else "process"
+        if kind not in ("process", "thread"):
+            raise ValueError(f"unknown extraction pool kind: {kind!r}")
+        self.kind = kind
+        self.workers = workers
+        if kind == "thread":
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extract")
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        self._slots = defer.DeferredSemaphore(max_pending or workers * 4)
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["ExtractionPool"]:
+        workers = settings.getint("EXTRACTION_POOL_WORKERS", 0)
+        if workers < 0:
+            workers = multiprocessing.cpu_count()
+        if not workers:
+            return None
+        return cls(
+            workers,
+            max_pending=settings.getint("EXTRACTION_POOL_MAX_PENDING", 0),
+            kind=settings.get("EXTRACTION_POOL_KIND", "auto"),
+        )
+
+    def _submit(self, *args) -> defer.Deferred:
+        from twisted.internet import reactor
+
+        d = defer.Deferred()
+        future = self._executor.submit(extract_job, *args)
+
+        def _done(f):
+            # close() membatalkan job yang masih antre; f.exception() akan raise
+            if f.cancelled():
+                reactor.callFromThread(d.errback, defer.CancelledError())
+                return
+            exc = f.exception()
+            if exc is not None:
+                reactor.callFromThread(d.errback, exc)
+            else:
+                reactor.callFromThread(d.callback, f.result())
+
+        future.add_done_callback(_done)
+        return d
+
+    async def extract(self, response, page_links: bool = True):
+        await maybe_deferred_to_future(self._slots.acquire())
+        try:
+            return await maybe_deferred_to_future(self._submit(response.body, response.encoding, page_links))
+        finally:
+            self._slots.release()
+
+    @property
+    def pending(self) -> int:
+        return self._slots.limit - self._slots.tokens
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,18 +1,111 @@
 import json
 import scrapy
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
+from . import signals as bisnis_signals
+from .dedup import StreamDeduper, link_key
+from .metrics import STAGES
+from .neardup import SimHashIndex, simhash
+from .sink import JsonlSink
+from .spiders.helpers import canonicalize_url
+
 class NormalizeAndDedupPipeline:
-    def __init__(self):
-        self.seen = set()
-        self.out_path = "data/outputs/bisnis_backtrack_2025-11-01_2025-11-15.jsonl.dedup.jsonl"
-        self._fh = open(self.out_path, "w", encoding="utf-8")
+    def __init__(self, out_path=None, batch_size=200, flush_interval=1.0, fsync_interval=5.0, append=False, crawler=None):
+        # dedup saat item mengalir (URL kanonik + hash isi): file output langsung final
+        self.deduper = StreamDeduper()
+        # OUTPUT_PATH boleh berisi %(cycle_start)s -> file baru per siklus daemon
+        self.out_path = out_path
+        # OUTPUT_APPEND: lanjutkan file yang ada (resume) alih-alih menimpa
+        self.append = append
+        self.sink = None
+        self.crawler = crawler
+        self._sink_options = {
+            "batch_size": batch_size,
+            "flush_interval": flush_interval,
+            "fsync_interval": fsync_interval,
+        }
 
     @classmethod
     def from_crawler(cls, crawler):
         # pipeline enabled via settings
-        return cls()
+        settings = crawler.settings
+        pipeline = cls(
+            out_path=settings.get("OUTPUT_PATH"),
+            batch_size=settings.getint("OUTPUT_BATCH_SIZE", 200),
+            flush_interval=settings.getfloat("OUTPUT_FLUSH_INTERVAL", 1.0),
+            fsync_interval=settings.getfloat("OUTPUT_FSYNC_INTERVAL", 5.0),
+            append=settings.getbool("OUTPUT_APPEND", False),
+            crawler=crawler,
+        )
+        crawler.signals.connect(pipeline._on_cycle_started, signal=bisnis_signals.cycle_started)
+        crawler.signals.connect(pipeline._on_cycle_finished, signal=bisnis_signals.cycle_finished)
+        crawler.signals.connect(pipeline._on_memory_pressure, signal=bisnis_signals.memory_pressure)
+        # record ditulis setelah semua pipeline (NearDuplicatePipeline berjalan sesudah
+        # dedup exact dan bisa menambah cluster_id / membuang item)
+        crawler.signals.connect(pipeline._on_item_scraped, signal=signals.item_scraped)
+        return pipeline
+
+    def _resolve_path(self, started_at: datetime) -> str:
+        safe_ts = started_at.isoformat().replace(":", "-")
+        return self.out_path % {"cycle_start": safe_ts}
+
+    def _output_opened(self, spider, path):
+        if self.crawler is not None:
+            self.crawler.signals.send_catch_log(bisnis_signals.output_opened, spider=spider, path=path)
+
+    def open_spider(self, spider):
+        if not self.out_path:
+            return
+        path = self._resolve_path(datetime.now(timezone.utc))
+        self.sink = JsonlSink(path, append=self.append, **self._sink_options)
+        if self.append and self.sink.records:
+            self._prime(spider, path)
+        self._output_opened(spider, path)
+
+    def _prime(self, spider, path):
+        # resume: artikel yang sudah ada di output tidak ditulis/di-download ulang
+        seen_store = getattr(spider, "seen_store", None)
+        with open(path, "rb") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                link = record.get("link")
+                if not link:
+                    continue
+                self.deduper.check_item(link, record.get("content") or "")
+                if seen_store is not None:
+                    seen_store.add_url(link)
+        spider.logger.info("Resume output %s: %d record sudah ada.", path, len(self.deduper))
+
+    def _on_cycle_started(self, spider, cycle, started_at):
+        # siklus pertama memakai file yang dibuka di open_spider
+        if self.sink is None or cycle <= 1 or "%(cycle_start)s" not in self.out_path:
+            return
+        path = self._resolve_path(started_at)
+        self.sink.rotate(path)
+        self._output_opened(spider, path)
+
+    def _on_cycle_finished(self, spider, cycle, started_at, finished_at):
+        # semua record siklus sudah di antrian sink (spider idle): fsync sebelum
+        # cycle_committed (last_run) dikirim
+        if self.sink is not None:
+            self.sink.checkpoint(wait=True)
+            self._release_seen(spider)
+
+    def _release_seen(self, spider):
+        # semua record yang sudah di-write kini durable -> key-nya boleh di-flush
+        seen_store = getattr(spider, "seen_store", None)
+        if seen_store is not None:
+            seen_store.release()
+
+    def _on_memory_pressure(self, spider, rss, active):
+        if active:
+            self.deduper.compact()
 
     def _domain(self, link):
         try:
@@ -21,28 +114,101 @@ class NormalizeAndDedupPipeline:
             return ""
 
     def process_item(self, item, spider):
+        with STAGES.time("pipeline"):
+            return self._process_item(item, spider)
+
+    def _process_item(self, item, spider):
         link = item.get("link") or ""
         if not link:
             # drop items without link
             raise scrapy.exceptions.DropItem("missing link")
-
-        if link in self.seen:
-            raise scrapy.exceptions.DropItem(f"duplicate link: {link}")
-        self.seen.add(link)
+        # link output selalu dalam bentuk kanonik (sama dengan key dedup)
+        link = item["link"] = canonicalize_url(link) or link
 
         # ensure fields exist and normalized minimally
         item["title"] = (item.get("title") or "").strip()
         item["content"] = (item.get("content") or "").strip()
-        item.setdefault("source", self._domain(link))
-        item.setdefault("scraped_at", datetime.now(timezone.utc).isoformat())
 
-        # write normalized JSONL
-        self._fh.write(json.dumps(dict(item), ensure_ascii=False) + "\n")
-        self._fh.flush()
+        duplicate = self.deduper.check_item(link, item["content"])
+        if duplicate is not None:
+            if self.crawler is not None:
+                self.crawler.stats.inc_value(f"bisnis/dedup/{duplicate}")
+            raise scrapy.exceptions.DropItem(f"duplicate {duplicate}: {link}")
         return item
 
+    def _on_item_scraped(self, item, response, spider):
+        if self.sink is None:
+            return
+        # source/scraped_at hanya di record output; ArticleItem tidak punya field ini
+        record = dict(item)
+        record.setdefault("source", self._domain(record["link"]))
+        record.setdefault("scraped_at", datetime.now(timezone.utc).isoformat())
+        # serialisasi + write per batch di writer thread sink
+        self.sink.write(record)
+        # tandai di seen store lintas run (dipakai spider sebelum menjadwalkan request);
+        # held sampai checkpoint sink, agar key di disk tidak mendahului record-nya
+        seen_store = getattr(spider, "seen_store", None)
+        if seen_store is not None:
+            seen_store.add_url(record["link"], held=True)
+
     def close_spider(self, spider):
-        try:
-            self._fh.close()
-        except Exception:
-            pass
+        if self.sink is not None:
+            self.sink.close()
+            self._release_seen(spider)
+
+
+class NearDuplicatePipeline:
+    # artikel yang sama (edit kecil) di subdomain/URL/id lain -> cluster_id yang sama
+    # (key artikel pertama di cluster); NEAR_DUP_DROP=True membuangnya
+    def __init__(self, index, drop=False, crawler=None):
+        self.index = index
+        self.drop = drop
+        self.crawler = crawler
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        settings = crawler.settings
+        if not settings.getbool("NEAR_DUP_ENABLED"):
+            raise NotConfigured
+        index = SimHashIndex.from_settings(settings)
+        if index is None:
+            raise NotConfigured
+        pipeline = cls(index, drop=settings.getbool("NEAR_DUP_DROP"), crawler=crawler)
+        crawler.signals.connect(pipeline._on_cycle_finished, signal=bisnis_signals.cycle_finished)
+        return pipeline
+
+    def _inc_stat(self, key):
+        if self.crawler is not None:
+            self.crawler.stats.inc_value(f"bisnis/near_dup/{key}")
+
+    def process_item(self, item, spider):
+        with STAGES.time("near_dup"):
+            return self._process_item(item)
+
+    def _process_item(self, item):
+        value = simhash(item.get("content"))
+        link = item.get("link")
+        if value is None or not link:
+            return item
+        key = link_key(link)
+        match = self.index.query(value)
+        if match is None:
+            # cluster baru
+            self.index.add(value, key, key)
+            item["cluster_id"] = key
+            return item
+        item["cluster_id"] = match.cluster
+        if match.key == key:
+            # artikel yang sama di-fetch ulang (refresh / resume)
+            return item
+        self._inc_stat("matched")
+        if self.drop:
+            raise scrapy.exceptions.DropItem(f"near duplicate (distance {match.distance}) of cluster {match.cluster}: {link}")
+        self.index.add(value, key, match.cluster)
+        return item
+
+    def _on_cycle_finished(self, spider, cycle, started_at, finished_at):
+        self.index.flush()
+
+    def close_spider(self, spider):
+        self.index.close()
@@ -0,0 +1,197 @@
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+# jadwal revisit per sumber (listing/indeks/feed per subdomain) untuk daemon mode standard.
+# Laju terbit per sumber (artikel baru per jam, EWMA) dipelajari dari id artikel yang
+# lebih besar dari id tertinggi yang pernah dilihat di sumber itu sendiri, sehingga
+# sumber yang saling tumpang tindih tidak "mencuri" artikel baru satu sama lain.
+# Interval = target_new / laju (dibatasi min/max); jika total request listing per jam
+# melebihi budget, semua interval diperbesar dengan faktor yang sama.
+class RevisitScheduler:
+    def __init__(
+        self,
+        path,
+        default_interval: float = 900.0,
+        min_interval: float = 120.0,
+        max_interval: float = 7200.0,
+        target_new: float = 3.0,
+        alpha: float = 0.3,
+        budget: float = 0.0,
+        min_gap: float = 30.0,
+    ):
+        self.path = Path(path)
+        self.default_interval = float(default_interval)
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max(max_interval, min_interval))
+        self.target_new = float(target_new)
+        self.alpha = float(alpha)
+        self.budget = float(budget)
+        self.min_gap = float(min_gap)
+        self.sources: Dict[str, dict] = {}
+        self.keys: List[str] = []
+        # sumber yang sedang dipoll di siklus berjalan
+        self._current: Dict[str, dict] = {}
+        self.load()
+
+    @classmethod
+    def from_settings(cls, settings, default_interval: float = 900.0) -> Optional["RevisitScheduler"]:
+        if not settings.getbool("REVISIT_ENABLED"):
+            return None
+        path = settings.get("REVISIT_STATE_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            default_interval=default_interval,
+            min_interval=settings.getfloat("REVISIT_MIN_INTERVAL", 120.0),
+            max_interval=settings.getfloat("REVISIT_MAX_INTERVAL", 7200.0),
+            target_new=settings.getfloat("REVISIT_TARGET_NEW", 3.0),
+            alpha=settings.getfloat("REVISIT_EWMA_ALPHA", 0.3),
+            budget=settings.getfloat("REVISIT_REQUEST_BUDGET", 0),
+            min_gap=settings.getfloat("REVISIT_MIN_CYCLE_GAP", 30.0),
+        )
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            self.sources = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            logger.warning("File state revisit %s tidak valid, diabaikan.", self.path)
+            self.sources = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.sources, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def register(self, keys: Iterable[str]):
+        # sumber yang dipakai run ini; state sumber lain tetap disimpan tetapi tidak dijadwalkan
+        self.keys = list(keys)
+        for key in self.keys:
+            self.sources.setdefault(key, {
+                "interval": self.default_interval,
+                "rate": None,           # artikel baru per jam (EWMA)
+                "cost": 1.0,            # request listing per poll (EWMA, termasuk paginasi)
+                "max_id": 0,
+                "last_poll": None,      # epoch detik
+                "next_due": 0.0,
+                "polls": 0,
+                "new_total": 0,
+            })
+
+    # jadwal
+    def budget_factor(self) -> float:
+        if not self.budget:
+            return 1.0
+        load = sum(self.sources[k]["cost"] * 3600.0 / self.sources[k]["interval"] for k in self.keys)
+        return max(1.0, load / self.budget)
+
+    def effective_interval(self, key: str) -> float:
+        return self.sources[key]["interval"] * self.budget_factor()
+
+    def due(self, now: Optional[float] = None) -> List[str]:
+        now = time.time() if now is None else now
+        return [k for k in self.keys if self.sources[k]["next_due"] <= now]
+
+    def next_cycle_delay(self, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        if not self.keys:
+            return self.default_interval
+        earliest = min(self.sources[k]["next_due"] for k in self.keys)
+        return max(self.min_gap, earliest - now)
+
+    def last_poll(self, key: str) -> Optional[datetime]:
+        ts = self.sources.get(key, {}).get("last_poll")
+        return datetime.fromtimestamp(ts, timezone.utc) if ts else None
+
+    def window_start(self, keys: Iterable[str]) -> Optional[datetime]:
+        # awal jendela tanggal untuk siklus: poll sebelumnya yang paling lama di antara sumber due
+        polls = [self.sources[k]["last_poll"] for k in keys if self.sources[k]["last_poll"]]
+        return datetime.fromtimestamp(min(polls), timezone.utc) if polls else None
+
+    # observasi
+    def start_poll(self, key: str, now: Optional[float] = None):
+        self._current[key] = {
+            "started": time.time() if now is None else now,
+            "baseline": self.sources[key]["max_id"],
+            "max_id": self.sources[key]["max_id"],
+            "new": 0,
+            "requests": 0,
+            "failed": 0,
+        }
+
+    def record(self, key: str, article_ids: Iterable[int] = (), failed: bool = False):
+        poll = self._current.get(key)
+        if poll is None:
+            return
+        poll["requests"] += 1
+        if failed:
+            poll["failed"] += 1
+            return
+        baseline = poll["baseline"]
+        for article_id in article_ids:
+            if article_id > baseline:
+                poll["new"] += 1
+            if article_id > poll["max_id"]:
+                poll["max_id"] = article_id
+
+    def finish(self):
+        # akhir siklus: update laju + jadwal semua sumber yang dipoll
+        for key, poll in self._current.items():
+            self._observe(key, poll)
+        self._current.clear()
+
+    def _observe(self, key: str, poll: dict):
+        source = self.sources[key]
+        started = poll["started"]
+        if not poll["requests"] or poll["failed"] >= poll["requests"]:
+            # semua request gagal: tidak ada observasi, coba lagi setelah interval biasa
+            source["next_due"] = started + self.effective_interval(key)
+            return
+        source["cost"] += self.alpha * (poll["requests"] - source["cost"])
+        prev = source["last_poll"]
+        # poll pertama hanya menetapkan baseline id (isi listing belum tentu baru)
+        if prev:
+            hours = max(started - prev, 1.0) / 3600.0
+            rate = poll["new"] / hours
+            source["rate"] = rate if source["rate"] is None else source["rate"] + self.alpha * (rate - source["rate"])
+            source["new_total"] += poll["new"]
+        source["max_id"] = poll["max_id"]
+        source["last_poll"] = started
+        source["polls"] += 1
+        source["interval"] = self._desired_interval(source)
+        source["next_due"] = started + self.effective_interval(key)
+
+    def _desired_interval(self, source: dict) -> float:
+        rate = source["rate"]
+        if rate is None:
+            interval = source["interval"]
+        elif rate <= 0:
+            # belum pernah ada artikel baru: mundur bertahap
+            interval = source["interval"] * 2
+        else:
+            interval = self.target_new / rate * 3600.0
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def snapshot(self) -> dict:
+        factor = self.budget_factor()
+        return {
+            key: {
+                "rate_per_hour": round(self.sources[key]["rate"] or 0.0, 3),
+                "interval_s": round(self.sources[key]["interval"] * factor, 1),
+                "polls": self.sources[key]["polls"],
+            }
+            for key in self.keys
+        }
+
+
+__all__ = ["RevisitScheduler"]
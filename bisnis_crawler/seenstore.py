@@ -0,0 +1,302 @@
+import hashlib
+import logging
+import mmap
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa lock antar process
+    fcntl = None
+
+from .spiders.helpers import classify_article_url
+
+logger = logging.getLogger(__name__)
+
+# lock yang sedang dipegang process ini: {path lock: [fd, depth]} (flock tidak reentrant
+# antar file descriptor, merge backtrack memanggil SeenStore.flush di dalam lock)
+_HELD_LOCKS = {}
+
+# key dengan bit tertinggi = hash URL (untuk link tanpa id numerik),
+# selain itu = id artikel dari path /read/<tanggal>/<channel>/<id>/
+_URL_HASH_FLAG = 1 << 63
+_KEY_MASK = (1 << 64) - 1
+
+# konstanta multiplicative hashing untuk bloom filter (ganjil, 64-bit)
+_BLOOM_MULTIPLIERS = (
+    0x9E3779B97F4A7C15,
+    0xC2B2AE3D27D4EB4F,
+    0x165667B19E3779F9,
+    0xD6E8FEB86659FD93,
+    0xFF51AFD7ED558CCD,
+    0xC4CEB9FE1A85EC53,
+)
+
+
+@contextmanager
+def state_lock(store_path):
+    # lock eksklusif <dir store>/.state.lock: daemon standard dan coordinator
+    # backtrack tidak menulis state bersama (seen store, dst.) bersamaan
+    if not store_path or fcntl is None:
+        yield
+        return
+    lock_path = str(Path(store_path).parent / ".state.lock")
+    held = _HELD_LOCKS.get(lock_path)
+    if held is not None:
+        held[1] += 1
+        try:
+            yield
+        finally:
+            held[1] -= 1
+        return
+    Path(lock_path).parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        _HELD_LOCKS[lock_path] = [fd, 1]
+        try:
+            yield
+        finally:
+            del _HELD_LOCKS[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def seen_key(url: str) -> int:
+    info = classify_article_url(url)
+    if info is not None:
+        return info.article_id
+    digest = hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") | _URL_HASH_FLAG
+
+
+class BloomFilter:
+    # bloom filter kecil di depan array; hanya untuk jawaban "pasti belum ada"
+    def __init__(self, bits: int, hashes: int = 4):
+        self.bits = max(64, int(bits))
+        self.hashes = max(1, min(int(hashes), len(_BLOOM_MULTIPLIERS)))
+        self._buf = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key: int):
+        for mult in _BLOOM_MULTIPLIERS[: self.hashes]:
+            yield (((key * mult) & _KEY_MASK) >> 20) % self.bits
+
+    def add(self, key: int):
+        buf = self._buf
+        for pos in self._positions(key):
+            buf[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: int) -> bool:
+        buf = self._buf
+        for pos in self._positions(key):
+            if not buf[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+
+# himpunan key 64-bit di memori: array uint64 terurut (8 byte per key) + set kecil
+# untuk key baru (set int Python ~70 byte/key). Merge saat set mencapai merge_every
+# atau 1/8 ukuran array (biaya merge teramortisasi O(1) per key)
+class KeySet:
+    def __init__(self, keys: Iterable[int] = (), merge_every: int = 4096):
+        self.merge_every = max(1, int(merge_every))
+        self._sorted = array("Q")
+        self._pending = set()
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return len(self._sorted) + len(self._pending)
+
+    def __contains__(self, key: int) -> bool:
+        if key in self._pending:
+            return True
+        arr = self._sorted
+        i = bisect_left(arr, key)
+        return i < len(arr) and arr[i] == key
+
+    def __iter__(self):
+        yield from self._sorted
+        yield from self._pending
+
+    def add(self, key: int) -> bool:
+        # True jika key baru
+        if key in self:
+            return False
+        self._pending.add(key)
+        if len(self._pending) >= max(self.merge_every, len(self._sorted) >> 3):
+            self.compact()
+        return True
+
+    def compact(self):
+        if not self._pending:
+            return
+        # potongan array lama disalin per slice (C), hanya key baru yang di-loop
+        old = self._sorted
+        merged = array("Q")
+        prev = 0
+        for key in sorted(self._pending):
+            i = bisect_left(old, key, prev)
+            merged.extend(old[prev:i])
+            merged.append(key)
+            prev = i
+        merged.extend(old[prev:])
+        self._sorted = merged
+        self._pending.clear()
+
+    @property
+    def nbytes(self) -> int:
+        return self._sorted.itemsize * len(self._sorted)
+
+
+# himpunan key artikel di disk: array uint64 terurut, di-mmap dan dicari
+# dengan bisect; key baru ditampung di memori lalu di-merge saat flush().
+# Key "held" sudah terlihat di membership tapi belum boleh ditulis ke disk
+# (record-nya belum di-fsync sink) sampai release()
+class SeenStore:
+    def __init__(self, path, bloom_bits: int = 0, bloom_hashes: int = 4, flush_every: int = 10000):
+        self.path = Path(path)
+        self.flush_every = int(flush_every) if flush_every else 0
+        self._pending = set()
+        self._held = set()
+        self._fh = None
+        self._mm = None
+        self._view = None
+        self.bloom = BloomFilter(bloom_bits, bloom_hashes) if bloom_bits else None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._map()
+        if self.bloom is not None:
+            for key in self._view:
+                self.bloom.add(key)
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["SeenStore"]:
+        path = settings.get("SEEN_STORE_PATH")
+        if not path:
+            return None
+        return cls(
+            path,
+            bloom_bits=settings.getint("SEEN_STORE_BLOOM_BITS", 0),
+            bloom_hashes=settings.getint("SEEN_STORE_BLOOM_HASHES", 4),
+            flush_every=settings.getint("SEEN_STORE_FLUSH_EVERY", 10000),
+        )
+
+    def _map(self):
+        self._unmap()
+        if self.path.exists() and self.path.stat().st_size >= 8:
+            self._fh = self.path.open("rb")
+            self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+            usable = len(self._mm) - len(self._mm) % 8
+            self._view = memoryview(self._mm)[:usable].cast("Q")
+        else:
+            self._view = memoryview(array("Q"))
+
+    def _unmap(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __len__(self) -> int:
+        return len(self._view) + len(self._pending) + len(self._held)
+
+    def __contains__(self, key: int) -> bool:
+        if key in self._pending or key in self._held:
+            return True
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        view = self._view
+        i = bisect_left(view, key)
+        return i < len(view) and view[i] == key
+
+    def __iter__(self):
+        yield from self._view
+        yield from self._pending
+        yield from self._held
+
+    def contains_url(self, url: str) -> bool:
+        return seen_key(url) in self
+
+    def add(self, key: int, held: bool = False):
+        if key in self:
+            return
+        if self.bloom is not None:
+            self.bloom.add(key)
+        if held:
+            self._held.add(key)
+            return
+        self._pending.add(key)
+        if self.flush_every and len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def add_url(self, url: str, held: bool = False):
+        self.add(seen_key(url), held=held)
+
+    def release(self):
+        # record untuk key held sudah durable: boleh ikut flush berikutnya
+        if not self._held:
+            return
+        self._pending |= self._held
+        self._held.clear()
+        if self.flush_every and len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def update(self, keys: Iterable[int]):
+        for key in keys:
+            if key not in self:
+                self._pending.add(key)
+                if self.bloom is not None:
+                    self.bloom.add(key)
+        if self.flush_every and len(self._pending) >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with state_lock(self.path):
+            self._flush_locked()
+
+    def _flush_locked(self):
+        # process lain bisa sudah mengganti file sejak di-map: map ulang agar key
+        # mereka ikut dipertahankan
+        known = len(self._view)
+        self._map()
+        view = self._view
+        if self.bloom is not None and len(view) != known:
+            for key in view:
+                self.bloom.add(key)
+        # merge array lama + key baru ke file sementara, lalu replace atomik;
+        # potongan array lama ditulis langsung dari mmap (tanpa loop per key)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with tmp.open("wb") as out:
+            prev = 0
+            for key in sorted(self._pending):
+                i = bisect_left(view, key, prev)
+                out.write(view[prev:i])
+                prev = i
+                if i < len(view) and view[i] == key:
+                    continue
+                out.write(key.to_bytes(8, sys.byteorder))
+            out.write(view[prev:])
+            out.flush()
+            os.fsync(out.fileno())
+        self._unmap()
+        os.replace(tmp, self.path)
+        self._pending.clear()
+        self._map()
+        logger.debug("SeenStore %s flushed, %d keys", self.path, len(self._view))
+
+    def close(self):
+        self.flush()
+        self._unmap()
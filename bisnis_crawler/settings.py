@@ -3,15 +3,129 @@ SPIDER_MODULES = ["bisnis_crawler.spiders"]
 NEWSPIDER_MODULE = "bisnis_crawler.spiders"
 
 ROBOTSTXT_OBEY = True
-CONCURRENT_REQUESTS = 8
+# total request paralel lintas subdomain; per subdomain diatur HostThrottleMiddleware
+CONCURRENT_REQUESTS = 32
+CONCURRENT_REQUESTS_PER_DOMAIN = 2
 DOWNLOAD_DELAY = 1.0            
-AUTOTHROTTLE_ENABLED = True
+# AutoThrottle global diganti throttle per subdomain (keduanya mengubah slot.delay)
+AUTOTHROTTLE_ENABLED = False
 AUTOTHROTTLE_START_DELAY = 1.0
 AUTOTHROTTLE_MAX_DELAY = 10.0
 
+# scheduler: ambil request dari slot (subdomain) dengan download aktif paling sedikit,
+# supaya satu host lambat tidak menahan antrian host lain
+SCHEDULER_PRIORITY_QUEUE = "scrapy.pqueues.DownloaderAwarePriorityQueue"
+
+# frontier dengan batas memori: request di atas FRONTIER_MEMORY_REQUESTS di-spill ke
+# disk queue (FRONTIER_SPILL_DIR/<pid>, dihapus saat spider ditutup; JOBDIR tetap
+# memakai antrian disk Scrapy); dupefilter menyimpan fingerprint sebagai uint64
+SCHEDULER = "bisnis_crawler.frontier.SpillScheduler"
+DUPEFILTER_CLASS = "bisnis_crawler.frontier.CompactDupeFilter"
+FRONTIER_MEMORY_REQUESTS = 10000    # 0 = tanpa batas (spill hanya saat memory pressure)
+FRONTIER_SPILL_DIR = "data/frontier"
+
+# fingerprint request berbasis id artikel / URL kanonik (dupefilter + JOBDIR + httpcache)
+REQUEST_FINGERPRINTER_CLASS = "bisnis_crawler.fingerprint.ArticleRequestFingerprinter"
+
+DOWNLOADER_MIDDLEWARES = {
+    "bisnis_crawler.throttle.HostThrottleMiddleware": 950,
+}
+HOST_THROTTLE_ENABLED = True
+HOST_THROTTLE_START_CONCURRENCY = 2
+HOST_THROTTLE_MAX_CONCURRENCY = 8
+HOST_THROTTLE_START_DELAY = 1.0
+HOST_THROTTLE_MIN_DELAY = 0.25
+HOST_THROTTLE_MAX_DELAY = 30.0
+HOST_THROTTLE_TARGET_LATENCY = 2.0      # detik; di atas ini delay host dinaikkan
+HOST_THROTTLE_MAX_ERROR_RATE = 0.05
+HOST_THROTTLE_EWMA_ALPHA = 0.2          # bobot sampel baru untuk rata-rata latency / error per host
+HOST_THROTTLE_DEBUG = False
+
+# cache HTTP conditional (ETag / Last-Modified) khusus listing mode standard
+HTTPCACHE_ENABLED = True
+HTTPCACHE_POLICY = "bisnis_crawler.httpcache.ListingCachePolicy"
+HTTPCACHE_DIR = "httpcache"          # di .scrapy/ project
+HTTPCACHE_EXPIRATION_SECS = 0
+HTTPCACHE_GZIP = True
+# digest link-set per listing (untuk listing tanpa ETag / Last-Modified)
+LISTING_DIGEST_PATH = "data/listing_digests.json"
+
+# request artikel didahulukan dari listing setelah frontier listing penuh
+LISTING_FRONTIER_LIMIT = 64
+ARTICLE_REQUEST_PRIORITY = 10
+
+# artikel multi-halaman: halaman lanjutan di-download paralel lalu digabung
+ARTICLE_MAX_PAGES = 20
+ARTICLE_PAGE_TIMEOUT = 30.0         # download_timeout per halaman lanjutan (1x retry)
+ARTICLE_ASSEMBLY_TIMEOUT = 60.0     # batas total sejak halaman 1; sisa halaman dianggap hilang
+ARTICLE_PARTIAL_POLICY = "emit"     # "emit": keluarkan dengan partial=True, "drop": buang
+
+# extraction + cleaning + parse tanggal di worker pool (bukan reactor thread)
+EXTRACTION_POOL_WORKERS = 0         # 0 = inline di reactor, -1 = jumlah CPU
+EXTRACTION_POOL_KIND = "auto"       # auto (thread jika build free-threaded) | process | thread
+EXTRACTION_POOL_MAX_PENDING = 0     # job in-flight maksimum (0 = 4 x workers)
+
+# metrics: histogram per tahap + latency per subdomain + stats Scrapy
+EXTENSIONS = {
+    "bisnis_crawler.metrics.MetricsExtension": 500,
+    "bisnis_crawler.memory.MemoryBudget": 510,
+}
+METRICS_ENABLED = True
+METRICS_PORT = 0                    # > 0: endpoint /metrics (Prometheus) & /summary (JSON)
+METRICS_HOST = "127.0.0.1"
+METRICS_SUMMARY_DIR = "data/metrics"  # ringkasan JSON per run (None untuk mematikan)
+
+# batas RSS (MB) untuk daemon jangka panjang: di atas batas frontier di-spill ke disk
+# dan struktur dedup/seen/dupefilter di-compact (0 = mati)
+MEMORY_BUDGET_MB = 0
+MEMORY_BUDGET_CHECK_INTERVAL = 10.0     # detik
+MEMORY_BUDGET_RELEASE_RATIO = 0.85      # pressure selesai di bawah budget x ratio
+
 # pipelines 
 ITEM_PIPELINES = {
-    "business_crawler.pipelines.NormalizeAndDedupPipeline": 300,
+    "bisnis_crawler.pipelines.NormalizeAndDedupPipeline": 300,
+    "bisnis_crawler.pipelines.NearDuplicatePipeline": 350,
 }
 
+# near-duplicate lintas subdomain/run (SimHash + LSH band)
+NEAR_DUP_ENABLED = True
+NEAR_DUP_INDEX_PATH = "data/near_dup.bin"
+NEAR_DUP_MAX_DISTANCE = 3       # jarak Hamming maksimum (0..3) dari 64 bit
+NEAR_DUP_DROP = False           # False: hanya tag cluster_id, True: buang near-duplicate
+NEAR_DUP_FLUSH_EVERY = 100000   # entry baru sebelum di-merge ke tabel band
+NEAR_DUP_BASE_PATH = None       # index read-only tambahan (index global untuk shard backtrack)
+
+# output JSONL tunggal (di-set runner); %(cycle_start)s -> file baru per siklus daemon
+OUTPUT_PATH = None
+OUTPUT_BATCH_SIZE = 200         # item per write
+OUTPUT_FLUSH_INTERVAL = 1.0     # detik, flush batch parsial
+OUTPUT_FSYNC_INTERVAL = 5.0     # detik, fsync + checkpoint <path>.ckpt
+OUTPUT_APPEND = False           # True: lanjutkan file yang ada (resume, dipotong ke checkpoint)
+
+# store terkompresi per tanggal terbit (diisi oleh scripts/compact.py)
+OUTPUT_STORE_PATH = "data/store"
+OUTPUT_STORE_BLOCK_RECORDS = 256        # record per gzip member
+OUTPUT_STORE_BLOCK_BYTES = 262144
+OUTPUT_STORE_SEGMENT_BYTES = 67108864   # segment baru setelah 64 MB
+
+# seen store lintas run (id artikel, array uint64 terurut + mmap)
+SEEN_STORE_PATH = "data/seen_articles.u64"
+SEEN_STORE_BLOOM_BITS = 0       # > 0 untuk mengaktifkan bloom filter di depan store
+SEEN_STORE_BLOOM_HASHES = 4
+SEEN_STORE_FLUSH_EVERY = 10000   # key yang record-nya sudah di-checkpoint sink
+
+# high-water mark id artikel per subdomain (early-stop paginasi mode standard)
+HIGH_WATER_MARK_PATH = "data/high_water_marks.json"
+
+# daemon mode standard: interval poll per sumber (homepage, indeks per subdomain,
+# sitemap/RSS) dipelajari dari laju artikel baru (EWMA), bukan satu interval tetap
+REVISIT_ENABLED = False             # scripts/standard.py mengaktifkan (STANDARD_REVISIT)
+REVISIT_STATE_PATH = "data/revisit.json"
+REVISIT_MIN_INTERVAL = 120.0        # detik
+REVISIT_MAX_INTERVAL = 7200.0
+REVISIT_TARGET_NEW = 3.0            # artikel baru yang diharapkan per poll
+REVISIT_EWMA_ALPHA = 0.3
+REVISIT_REQUEST_BUDGET = 600        # request listing per jam untuk semua sumber (0 = tanpa batas)
+REVISIT_MIN_CYCLE_GAP = 30.0        # jarak minimum antar siklus (detik)
+
 LOG_LEVEL = "INFO"
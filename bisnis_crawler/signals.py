@@ -0,0 +1,23 @@
+# custom signals untuk mode daemon (lihat BisnisSpider.daemon_interval)
+
+# dikirim saat satu siklus crawl inkremental dimulai
+# args: spider, cycle, started_at (datetime UTC)
+cycle_started = object()
+
+# dikirim saat scheduler kosong dan siklus selesai
+# args: spider, cycle, started_at, finished_at (datetime UTC)
+cycle_finished = object()
+
+# dikirim setelah semua handler cycle_finished selesai: output siklus sudah di-fsync
+# (checkpoint sink), seen store & high-water mark tersimpan -> aman mencatat progres
+# (last_run); args sama dengan cycle_finished
+cycle_committed = object()
+
+# dikirim pipeline saat file output baru dibuka (awal run / rotasi per siklus)
+# args: spider, path
+output_opened = object()
+
+# dikirim MemoryBudget saat RSS melewati MEMORY_BUDGET_MB (active=True) dan saat
+# kembali di bawah batas (active=False); penerima spill frontier / compact struktur
+# args: spider, rss (byte), active
+memory_pressure = object()
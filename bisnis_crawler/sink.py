@@ -0,0 +1,194 @@
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+_ROTATE = object()
+_CHECKPOINT = object()
+_CLOSE = object()
+
+
+# output JSONL dengan writer thread: reactor hanya memasukkan dict ke queue,
+# serialisasi + write dilakukan per batch di thread terpisah. Flush berdasarkan
+# ukuran batch / interval waktu; fsync periodik mencatat checkpoint
+# (<path>.ckpt: offset byte yang sudah durable) untuk resume setelah crash.
+class JsonlSink:
+    def __init__(
+        self,
+        path,
+        batch_size: int = 200,
+        flush_interval: float = 1.0,
+        fsync_interval: float = 5.0,
+        append: bool = False,
+        max_queue: int = 10000,
+    ):
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.fsync_interval = float(fsync_interval)
+        self.path: Optional[Path] = None
+        self.records = 0
+        self.synced_offset = 0
+        self._fh = None
+        self._error: Optional[BaseException] = None
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._open(Path(path), append)
+        self._thread = threading.Thread(target=self._run, name="jsonl-sink", daemon=True)
+        self._thread.start()
+
+    # API untuk reactor thread
+    def write(self, record: dict):
+        self._raise_if_failed()
+        self._queue.put(record)
+
+    def rotate(self, path, append: bool = False):
+        self._raise_if_failed()
+        self._queue.put((_ROTATE, Path(path), append))
+
+    def checkpoint(self, wait: bool = True):
+        # paksa flush + fsync; blocking sampai selesai jika wait=True
+        done = threading.Event()
+        self._queue.put((_CHECKPOINT, done))
+        if wait:
+            done.wait()
+        self._raise_if_failed()
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put((_CLOSE,))
+            self._thread.join()
+        self._raise_if_failed()
+
+    @staticmethod
+    def checkpoint_path(path) -> Path:
+        return Path(f"{path}.ckpt")
+
+    @classmethod
+    def read_checkpoint(cls, path) -> Optional[dict]:
+        ckpt = cls.checkpoint_path(path)
+        if not ckpt.exists():
+            return None
+        try:
+            return json.loads(ckpt.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+
+    # writer thread
+    def _raise_if_failed(self):
+        if self._error is not None:
+            raise RuntimeError(f"output sink failed: {self._error!r}") from self._error
+
+    def _open(self, path: Path, append: bool):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if append and path.exists():
+            # resume: data sampai offset checkpoint pasti durable; setelahnya hanya
+            # byte sisa setelah newline terakhir (write terpotong) yang dibuang.
+            # Baris lengkap yang rusak di tengah dilewati, bukan memotong sisa file
+            ckpt = self.read_checkpoint(path)
+            size = path.stat().st_size
+            if ckpt and ckpt["offset"] <= size:
+                offset, records = ckpt["offset"], ckpt["records"]
+            else:
+                offset, records = 0, 0
+            self._fh = path.open("r+b")
+            self._fh.seek(offset)
+            skipped = 0
+            for line in self._fh:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    json.loads(line)
+                except ValueError:
+                    skipped += 1
+                    continue
+                records += 1
+            if skipped:
+                logger.warning("Output %s: %d baris rusak dilewati saat resume.", path, skipped)
+            self._fh.truncate(offset)
+            self._fh.seek(offset)
+            self.records = records
+        else:
+            self._fh = path.open("wb")
+            self.records = 0
+        self.path = path
+        self.synced_offset = self._fh.tell()
+
+    def _flush(self, batch: list):
+        if not batch:
+            return
+        data = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in batch).encode("utf-8")
+        self._fh.write(data)
+        self._fh.flush()
+        self.records += len(batch)
+        batch.clear()
+
+    def _sync(self):
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self.synced_offset = self._fh.tell()
+        ckpt = self.checkpoint_path(self.path)
+        tmp = Path(f"{ckpt}.tmp")
+        tmp.write_text(json.dumps({"offset": self.synced_offset, "records": self.records}), encoding="utf-8")
+        tmp.replace(ckpt)
+
+    def _close_file(self):
+        if self._fh is not None:
+            self._sync()
+            self._fh.close()
+            self._fh = None
+
+    def _run(self):
+        batch = []
+        last_flush = last_sync = time.monotonic()
+        try:
+            while True:
+                now = time.monotonic()
+                timeout = None
+                if batch:
+                    timeout = max(0.0, self.flush_interval - (now - last_flush))
+                elif self.fsync_interval and self._fh.tell() != self.synced_offset:
+                    timeout = max(0.0, self.fsync_interval - (now - last_sync))
+                try:
+                    msg = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    msg = None
+                if isinstance(msg, dict):
+                    batch.append(msg)
+                elif msg is not None:
+                    self._flush(batch)
+                    kind = msg[0]
+                    if kind is _ROTATE:
+                        self._close_file()
+                        self._open(msg[1], msg[2])
+                    elif kind is _CHECKPOINT:
+                        self._sync()
+                        last_sync = time.monotonic()
+                        msg[1].set()
+                    elif kind is _CLOSE:
+                        self._close_file()
+                        return
+                now = time.monotonic()
+                if len(batch) >= self.batch_size or (batch and now - last_flush >= self.flush_interval):
+                    self._flush(batch)
+                    last_flush = now
+                if self.fsync_interval and now - last_sync >= self.fsync_interval and self._fh.tell() != self.synced_offset:
+                    self._sync()
+                    last_sync = now
+        except BaseException as e:
+            # dilaporkan ke reactor thread lewat _raise_if_failed
+            logger.exception("Output sink writer thread gagal")
+            self._error = e
+            # lepaskan checkpoint() yang sedang menunggu
+            while True:
+                try:
+                    msg = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(msg, tuple) and msg[0] is _CHECKPOINT:
+                    msg[1].set()
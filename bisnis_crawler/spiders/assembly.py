@@ -0,0 +1,47 @@
+import time
+from typing import Dict, Iterable, Optional
+
+
+# artikel multi-halaman yang sedang dirakit: halaman 1 sudah di-parse, halaman
+# lanjutan di-download paralel; selesai saat semua halaman tiba / gagal / timeout
+class ArticleAssembly:
+    __slots__ = ("link", "request_url", "title", "published_at", "info", "parts", "pending", "failed", "started")
+
+    def __init__(self, link: str, request_url: str, title: str, content: str,
+                 published_at: Optional[str], info, pages: Iterable[int]):
+        self.link = link
+        self.request_url = request_url
+        self.title = title
+        self.published_at = published_at
+        self.info = info
+        self.parts: Dict[int, str] = {1: content}
+        self.pending = set(pages)
+        self.failed = set()
+        self.started = time.monotonic()
+
+    @property
+    def pages(self) -> int:
+        return len(self.parts) + len(self.pending) + len(self.failed)
+
+    def add(self, page: int, content: str):
+        self.pending.discard(page)
+        self.parts[page] = content
+
+    def fail(self, page: int):
+        if page in self.pending:
+            self.pending.discard(page)
+            self.failed.add(page)
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.pending or self.failed)
+
+    def expired(self, timeout: float) -> bool:
+        return bool(timeout) and time.monotonic() - self.started > timeout
+
+    def content(self) -> str:
+        return " ".join(self.parts[p] for p in sorted(self.parts) if self.parts[p])
@@ -1,12 +1,29 @@
 import scrapy
-from datetime import datetime, time
+from scrapy import signals
+from scrapy.exceptions import DontCloseSpider
+from twisted.internet.task import LoopingCall
+from datetime import datetime, time, timedelta, timezone
 from ..items import ArticleItem
-from .helpers import parse_date_to_iso, clean_paragraphs, clean_text
+from ..metrics import STAGES
+from .. import signals as bisnis_signals
+from ..httpcache import ListingDigests, link_set_digest
+from ..offload import ExtractionPool
+from ..revisit import RevisitScheduler
+from ..seenstore import SeenStore
+from ..watermarks import HighWaterMarks
+from .assembly import ArticleAssembly
+from .helpers import parse_date, article_page_number, canonicalize_url, classify_article_url
+from .extractor import extract_article
+from .feeds import iter_feed_entries
 import logging
+import re
 from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+_DATE_ONLY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_WIB = timezone(timedelta(hours=7))
+
 
 class BisnisSpider(scrapy.Spider):
     name = "bisnis"
@@ -30,64 +47,443 @@ class BisnisSpider(scrapy.Spider):
     ]
     start_urls = ["https://www.bisnis.com/"]
 
+    # host yang punya halaman indeks harian (dipakai mode backtrack)
+    index_hosts = [
+        "www.bisnis.com",
+        "ekonomi.bisnis.com",
+        "finansial.bisnis.com",
+        "market.bisnis.com",
+        "kabar24.bisnis.com",
+        "teknologi.bisnis.com",
+        "lifestyle.bisnis.com",
+        "bola.bisnis.com",
+        "hijau.bisnis.com",
+        "koran.bisnis.com",
+        "sumatra.bisnis.com",
+        "bandung.bisnis.com",
+        "semarang.bisnis.com",
+        "surabaya.bisnis.com",
+        "bali.bisnis.com",
+    ]
+    index_url_template = "https://{host}/index?c=0&d={date}"
+
+    # sitemap / RSS per subdomain (discovery="feeds" atau "both")
+    feed_url_templates = [
+        "https://{host}/sitemap/news.xml",
+        "https://{host}/rss",
+    ]
+
     custom_settings = {
         # per-spider override jika perlu
     }
 
-    def __init__(self, start_date=None, end_date=None, max_articles=None, *args, **kwargs):
+    def __init__(self, start_date=None, end_date=None, max_articles=None, mode="standard",
+                 daemon_interval=None, discovery="html", refresh=False, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        # parse start_date (ke Asia/Jakarta)
+        # mode: "standard" (mulai dari homepage) atau "backtrack" (indeks harian per subdomain)
+        self.mode = (mode or "standard").lower()
+        if self.mode not in ("standard", "backtrack"):
+            raise ValueError(f"unknown mode: {mode!r}")
+
+        # discovery: "html" (listing/indeks), "feeds" (sitemap + RSS) atau "both"
+        self.discovery = (discovery or "html").lower()
+        if self.discovery not in ("html", "feeds", "both"):
+            raise ValueError(f"unknown discovery: {discovery!r}")
+
+        # refresh: abaikan seen store / cache listing, ambil ulang artikel yang sudah tersimpan
+        self.refresh = str(refresh).lower() in ("1", "true", "yes")
+
+        # parse start_date (ke Asia/Jakarta; seperti sebelumnya tanggal tanpa zona
+        # dianggap UTC) -- aware datetimes dipakai langsung untuk perbandingan
         try:
-            self.start_date = (
-                parse_date_to_iso(start_date, tz="Asia/Jakarta", assume_utc_if_naive=True)
+            self._start_dt = (
+                parse_date(start_date, tz="Asia/Jakarta", assume_utc_if_naive=True)
                 if start_date
                 else None
             )
         except Exception:
             logger.warning("Gagal parse start_date=%r, mengabaikan filter start_date.", start_date)
-            self.start_date = None
+            self._start_dt = None
 
-        # parse end_date -> treat as end of day (23:59:59) in Asia/Jakarta
+        # parse end_date; tanggal saja -> akhir hari (23:59:59) in Asia/Jakarta
         try:
             if end_date:
-                # normalize end_date to end of day
-                # appending time ensures inclusive range
-                end_iso = parse_date_to_iso(f"{end_date} 23:59:59", tz="Asia/Jakarta", assume_utc_if_naive=True)
-                self.end_date = end_iso
+                if isinstance(end_date, str) and _DATE_ONLY_RE.match(end_date.strip()):
+                    # appending time ensures inclusive range
+                    end_date = f"{end_date.strip()} 23:59:59"
+                self._end_dt = parse_date(end_date, tz="Asia/Jakarta", assume_utc_if_naive=True)
             else:
-                self.end_date = None
+                self._end_dt = None
         except Exception:
             logger.warning("Gagal parse end_date=%r, mengabaikan filter end_date.", end_date)
-            self.end_date = None
+            self._end_dt = None
+
+        self.start_date = self._start_dt.isoformat() if self._start_dt else None
+        self.end_date = self._end_dt.isoformat() if self._end_dt else None
 
         self.max_articles = int(max_articles) if max_articles else None
         self.collected = 0
 
-        # prepare datetime objects for comparisons (aware datetimes expected)
-        try:
-            self._start_dt = datetime.fromisoformat(self.start_date) if self.start_date else None
-        except Exception:
-            self._start_dt = None
-        try:
-            self._end_dt = datetime.fromisoformat(self.end_date) if self.end_date else None
-        except Exception:
-            self._end_dt = None
+        # daemon: spider tidak ditutup saat idle, siklus berikutnya dijadwalkan
+        # setelah daemon_interval detik dengan engine/downloader yang sama
+        self.daemon_interval = float(daemon_interval) if daemon_interval else None
+        if self.daemon_interval and self.mode != "standard":
+            raise ValueError("daemon_interval hanya untuk mode standard")
+        self.cycle = 0
+        self._cycle_started_at = None
+        self._next_cycle = None
+        self._listing_seen = set()
+        self.seen_store = None
+        self.watermarks = None
+        self.listing_digests = None
+        # resume (JOBDIR): indeks (host|tanggal) yang paginasinya selesai dan artikel
+        # yang masih di-download; disimpan di spider.state (di-pickle saat spider ditutup)
+        self._done_index = set()
+        self._inflight = None
+        # listing/feed yang masih di scheduler/downloader; di atas LISTING_FRONTIER_LIMIT
+        # request artikel diberi prioritas lebih tinggi supaya frontier dikuras dulu
+        self._listings_pending = 0
+        self.listing_frontier_limit = 64
+        self.article_priority = 10
+        # artikel multi-halaman yang menunggu halaman lanjutan (key: id artikel)
+        self._assemblies = {}
+        self.article_max_pages = 20
+        self.article_page_timeout = 30.0
+        self.article_assembly_timeout = 60.0
+        self.article_partial_policy = "emit"
+        # sweep berkala: assembly yang halaman lanjutannya tidak pernah tiba tetap keluar
+        self._assembly_sweep = None
+        self._assembly_sweep_pending = False
+        self.extraction_pool = None
+        # daemon: jadwal revisit adaptif per sumber (REVISIT_ENABLED); None = semua
+        # sumber dipoll setiap daemon_interval
+        self.revisit = None
+    @classmethod
+    def from_crawler(cls, crawler, *args, **kwargs):
+        spider = super().from_crawler(crawler, *args, **kwargs)
+        spider.seen_store = SeenStore.from_settings(crawler.settings)
+        spider.watermarks = HighWaterMarks.from_settings(crawler.settings)
+        if spider.mode == "standard" and not spider.refresh:
+            spider.listing_digests = ListingDigests.from_settings(crawler.settings)
+        spider.listing_frontier_limit = crawler.settings.getint("LISTING_FRONTIER_LIMIT", 64)
+        spider.article_priority = crawler.settings.getint("ARTICLE_REQUEST_PRIORITY", 10)
+        spider.article_max_pages = crawler.settings.getint("ARTICLE_MAX_PAGES", 20)
+        spider.article_page_timeout = crawler.settings.getfloat("ARTICLE_PAGE_TIMEOUT", 30.0)
+        spider.article_assembly_timeout = crawler.settings.getfloat("ARTICLE_ASSEMBLY_TIMEOUT", 60.0)
+        spider.article_partial_policy = crawler.settings.get("ARTICLE_PARTIAL_POLICY", "emit")
+        spider.extraction_pool = ExtractionPool.from_settings(crawler.settings)
+        if spider.daemon_interval:
+            spider.revisit = RevisitScheduler.from_settings(crawler.settings, default_interval=spider.daemon_interval)
+            if spider.revisit is not None:
+                spider.revisit.register(spider._revisit_sources())
+        crawler.signals.connect(spider._close_stores, signal=signals.spider_closed)
+        crawler.signals.connect(spider._on_request_dropped, signal=signals.request_dropped)
+        crawler.signals.connect(spider._on_request_reached_downloader, signal=signals.request_reached_downloader)
+        crawler.signals.connect(spider._on_memory_pressure, signal=bisnis_signals.memory_pressure)
+        if spider.article_assembly_timeout > 0:
+            crawler.signals.connect(spider._start_assembly_sweep, signal=signals.spider_opened)
+        if spider.daemon_interval:
+            crawler.signals.connect(spider._on_spider_idle, signal=signals.spider_idle)
+            crawler.signals.connect(spider._on_spider_closed, signal=signals.spider_closed)
+        return spider
+
+    async def start(self):
+        # Scrapy >= 2.13 memakai start(); start_requests() tetap untuk versi lama
+        for request in self.start_requests():
+            yield request
+
+    def start_requests(self):
+        if self.daemon_interval:
+            self._begin_cycle()
+        yield from self._resume_requests()
+        yield from self._seed_requests()
+
+    def _resume_requests(self):
+        # spider.state hanya ada jika JOBDIR di-set (extension SpiderState)
+        state = getattr(self, "state", None)
+        if state is None:
+            return
+        self._done_index = state.setdefault("done_index", set())
+        self._inflight = state.setdefault("inflight_articles", {})
+        if self._done_index or self._inflight:
+            logger.info(
+                "Resume: %d indeks selesai, %d artikel in-flight dari run sebelumnya.",
+                len(self._done_index), len(self._inflight),
+            )
+        # request yang sedang di-download saat run sebelumnya berhenti tidak ikut
+        # tersimpan di antrian JOBDIR -> jadwalkan ulang (dupefilter sudah mencatatnya)
+        for url in list(self._inflight):
+            self._inflight.pop(url)
+            info = classify_article_url(url)
+            if info is not None and self._should_fetch(url, info):
+                yield self._article_request(url, info, dont_filter=True)
+
+    def _seed_requests(self):
+        if self.revisit is not None:
+            yield from self._revisit_requests()
+            return
+        if self.discovery in ("feeds", "both"):
+            yield from self._feed_requests()
+            if self.discovery == "feeds":
+                return
+        if self.mode == "backtrack":
+            if self._start_dt and self._end_dt:
+                yield from self._index_requests()
+                return
+            logger.warning("Mode backtrack butuh start_date dan end_date, fallback ke homepage.")
+        for url in self.start_urls:
+            yield self._listing_request(url, dont_filter=True)
+
+    # daemon cycles
+    def _begin_cycle(self):
+        self.cycle += 1
+        self._cycle_started_at = datetime.now(timezone.utc)
+        self._listing_seen.clear()
+        self.crawler.signals.send_catch_log(
+            bisnis_signals.cycle_started,
+            spider=self,
+            cycle=self.cycle,
+            started_at=self._cycle_started_at,
+        )
+
+    def _start_next_cycle(self):
+        # window baru dimulai dari awal siklus sebelumnya; tanpa batas akhir
+        self._start_dt = self._cycle_started_at
+        self._end_dt = None
+        self._begin_cycle()
+        for request in self._seed_requests():
+            self.crawler.engine.crawl(request)
+
+    def _on_spider_idle(self, spider):
+        if spider is not self:
+            return
+        if self._assemblies:
+            # idle = tidak ada request tersisa; halaman lanjutan yang hilang (request
+            # di-drop) tidak akan tiba lagi
+            logger.warning("%d artikel multi-halaman tidak lengkap dibuang.", len(self._assemblies))
+            self._inc_stat("article_pages/lost", len(self._assemblies))
+            self._assemblies.clear()
+        if self._next_cycle is None or not self._next_cycle.active():
+            from twisted.internet import reactor
+
+            cycle_args = {
+                "spider": self,
+                "cycle": self.cycle,
+                "started_at": self._cycle_started_at,
+                "finished_at": datetime.now(timezone.utc),
+            }
+            self.crawler.signals.send_catch_log(bisnis_signals.cycle_finished, **cycle_args)
+            if self.seen_store is not None:
+                self.seen_store.flush()
+            if self.watermarks is not None:
+                self.watermarks.save()
+            if self.listing_digests is not None:
+                self.listing_digests.save()
+            self.crawler.signals.send_catch_log(bisnis_signals.cycle_committed, **cycle_args)
+            delay = self.daemon_interval
+            if self.revisit is not None:
+                self.revisit.finish()
+                self.revisit.save()
+                delay = self.revisit.next_cycle_delay()
+                logger.debug("Jadwal revisit: %s", self.revisit.snapshot())
+            logger.info("Siklus %s selesai, siklus berikutnya dalam %ss.", self.cycle, round(delay))
+            self._next_cycle = reactor.callLater(delay, self._start_next_cycle)
+        raise DontCloseSpider
+
+    def _on_memory_pressure(self, spider, rss, active):
+        # key seen store baru (set di memori) di-merge ke file mmap
+        if spider is self and active and self.seen_store is not None:
+            self.seen_store.flush()
+
+    def _on_spider_closed(self, spider, reason):
+        if spider is self and self._next_cycle is not None and self._next_cycle.active():
+            self._next_cycle.cancel()
+
+    def _close_stores(self, spider, reason):
+        if spider is not self:
+            return
+        if self._assembly_sweep is not None and self._assembly_sweep.running:
+            self._assembly_sweep.stop()
+        if self.extraction_pool is not None:
+            self.extraction_pool.close()
+        if self.seen_store is not None:
+            self.seen_store.close()
+        if self.watermarks is not None:
+            self.watermarks.save()
+        if self.listing_digests is not None:
+            self.listing_digests.save()
+        if self.revisit is not None:
+            self.revisit.save()
+
+    def _revisit_sources(self):
+        # html: homepage + indeks harian per subdomain (www sudah diwakili homepage),
+        # feeds: sitemap/RSS per subdomain
+        keys = []
+        if self.discovery in ("html", "both"):
+            keys.append("home")
+            keys += [f"index:{host}" for host in self.index_hosts if host != "www.bisnis.com"]
+        if self.discovery in ("feeds", "both"):
+            keys += [f"feed:{host}" for host in self.index_hosts]
+        return keys
+
+    def _revisit_requests(self):
+        # hanya sumber yang sudah jatuh tempo; jendela tanggal mundur ke poll sebelumnya
+        # yang paling lama supaya artikel sumber yang jarang dipoll tidak terlewat
+        due = self.revisit.due()
+        start = self.revisit.window_start(due)
+        if start is not None and (self._start_dt is None or start < self._start_dt):
+            self._start_dt = start
+        self._inc_stat("revisit/polls", len(due))
+        self._inc_stat("revisit/not_due", len(self.revisit.keys) - len(due))
+        for key in due:
+            self.revisit.start_poll(key)
+            yield from self._source_requests(key)
+
+    def _source_requests(self, key: str):
+        kind, _, host = key.partition(":")
+        if kind == "home":
+            for url in self.start_urls:
+                yield self._listing_request(url, dont_filter=True, meta={"revisit_source": key})
+        elif kind == "index":
+            # indeks hari ini (WIB); kemarin juga jika poll terakhir sebelum pergantian hari
+            today = datetime.now(_WIB).date()
+            days = [today]
+            last = self.revisit.last_poll(key)
+            if last is not None and last.astimezone(_WIB).date() < today:
+                days.insert(0, today - timedelta(days=1))
+            for day in days:
+                url = self.index_url_template.format(host=host, date=day.isoformat())
+                yield self._listing_request(url, dont_filter=True, meta={"revisit_source": key})
+        elif kind == "feed":
+            for template in self.feed_url_templates:
+                yield self._listing_request(
+                    template.format(host=host),
+                    callback=self.parse_feed,
+                    dont_filter=True,
+                    meta={"feed_host": host, "revisit_source": key},
+                )
+
+    def _revisit_record(self, request, article_ids=(), failed: bool = False):
+        if self.revisit is not None and request is not None:
+            key = request.meta.get("revisit_source")
+            if key:
+                self.revisit.record(key, article_ids, failed=failed)
+
+    def _index_requests(self):
+        # satu halaman indeks per (tanggal, subdomain); pagination diikuti oleh parse()
+        day = self._start_dt.date()
+        last_day = self._end_dt.date()
+        while day <= last_day:
+            for host in self.index_hosts:
+                if f"{host}|{day.isoformat()}" in self._done_index:
+                    self._inc_stat("skip/index_done")
+                    continue
+                url = self.index_url_template.format(host=host, date=day.isoformat())
+                yield self._listing_request(url, meta={"index_date": day.isoformat()})
+            day += timedelta(days=1)
+
+    def _feed_requests(self):
+        # feed dipoll ulang setiap siklus daemon -> dont_filter
+        for host in self.index_hosts:
+            for template in self.feed_url_templates:
+                yield self._listing_request(
+                    template.format(host=host),
+                    callback=self.parse_feed,
+                    dont_filter=True,
+                    meta={"feed_host": host},
+                )
+
+    def parse_feed(self, response):
+        self._listing_done(response.request)
+        source = response.meta.get("revisit_source")
+        article_ids = []
+        for entry in iter_feed_entries(response.body):
+            url = canonicalize_url(response.urljoin(entry.url))
+            if url is None:
+                continue
+            entry_dt = None
+            if entry.published_raw:
+                try:
+                    entry_dt = parse_date(entry.published_raw, tz="Asia/Jakarta", assume_utc_if_naive=True)
+                except ValueError:
+                    entry_dt = None
+            if entry.is_sitemap:
+                # sitemap anak: ikuti hanya jika lastmod tidak lebih lama dari start_date
+                if entry_dt is None or not self._start_dt or entry_dt >= self._start_dt:
+                    meta = {"revisit_source": source} if source else None
+                    yield self._listing_request(url, callback=self.parse_feed, dont_filter=bool(self.daemon_interval), meta=meta)
+                continue
+            if entry_dt is not None and not self._dt_in_range(entry_dt):
+                self._inc_stat("skip/feed_out_of_range")
+                continue
+            info = classify_article_url(url)
+            if info is None:
+                self._inc_stat("skip/not_article_url")
+                continue
+            article_ids.append(info.article_id)
+            if self._should_fetch(url, info):
+                yield self._article_request(url, info)
+        self._revisit_record(response.request, article_ids)
 
     def parse(self, response):
-        # collect article links (heuristic)
-        links = response.css("a[href*='/read/']::attr(href)").getall()
-        # also try article listing blocks
-        links += response.css("article a::attr(href)").getall()
-        for href in links:
+        self._observe_download(response)
+        self._listing_done(response.request)
+        not_modified = "cached" in response.flags
+        if not_modified:
+            # 304 Not Modified (atau error server) -> dilayani dari cache: tidak dipaginasi,
+            # tapi link di body cache yang belum pernah diambil tetap dijadwalkan
+            self._inc_stat("listing/not_modified")
+        # link extraction + filter diukur sebagai satu tahap "listing"
+        with STAGES.time("listing"):
+            requests = list(self._parse_listing(response, not_modified))
+        yield from requests
+
+    def _parse_listing(self, response, not_modified: bool = False):
+        # collect article links (heuristic) + article listing blocks; kedua selector
+        # sering menunjuk link yang sama -> satu per id artikel (urutan dipertahankan)
+        hrefs = response.css("a[href*='/read/']::attr(href)").getall()
+        hrefs += response.css("article a::attr(href)").getall()
+        links = {}
+        for href in hrefs:
             if not href:
                 continue
-            url = response.urljoin(href)
+            url = canonicalize_url(response.urljoin(href))
             # basic domain check to avoid leaving site
-            p = urlparse(url)
-            if "bisnis.com" not in p.netloc:
+            if url is None or "bisnis.com" not in urlparse(url).netloc:
+                continue
+            # filter di level URL sebelum request dijadwalkan
+            info = classify_article_url(url)
+            if info is None:
+                self._inc_stat("skip/not_article_url")
+                continue
+            if info.article_id in links:
+                self._inc_stat("skip/duplicate_link")
                 continue
-            yield response.follow(url, callback=self.parse_article)
+            links[info.article_id] = (url, info)
+        if not_modified:
+            self._revisit_record(response.request)
+            unchanged = True
+        else:
+            self._revisit_record(response.request, links.keys())
+            # listing tanpa validator HTTP: link-set sama dengan fetch sebelumnya
+            unchanged = self.listing_digests is not None and not self.listing_digests.changed(
+                response.url, link_set_digest(url for url, _ in links.values())
+            )
+            if unchanged:
+                self._inc_stat("listing/unchanged")
+        # incremental: listing yang hanya berisi id lama tidak perlu dipaginasi lagi
+        page_articles = 0
+        page_new = 0
+        for url, info in links.values():
+            page_articles += 1
+            if not self._is_known_article(info):
+                page_new += 1
+            if self._should_fetch(url, info):
+                yield self._article_request(url, info)
+        if unchanged:
+            # listing sama dengan fetch sebelumnya: halaman berikutnya juga tidak berubah
+            return
 
         # pagination (several patterns)
         next_page = (
@@ -95,8 +491,122 @@ class BisnisSpider(scrapy.Spider):
             or response.css(".pagination a[rel='next']::attr(href)").get()
             or response.css(".paging a.next::attr(href)").get()
         )
+        if next_page and self.mode == "standard" and page_articles and not page_new:
+            logger.debug("Early stop paginasi %s: semua id artikel sudah dikenal.", response.url)
+            self._inc_stat("listing/early_stop")
+            next_page = None
         if next_page:
-            yield response.follow(next_page, callback=self.parse)
+            if self.daemon_interval:
+                # dupefilter hidup sepanjang daemon; listing di-dedup per siklus saja
+                next_url = response.urljoin(next_page)
+                if next_url not in self._listing_seen:
+                    self._listing_seen.add(next_url)
+                    # halaman berikutnya dihitung ke sumber revisit yang sama
+                    source = response.meta.get("revisit_source")
+                    meta = {"revisit_source": source} if source else None
+                    yield self._listing_request(next_url, dont_filter=True, meta=meta)
+            else:
+                # index_date ikut ke halaman berikutnya (penanda indeks selesai untuk resume)
+                meta = {"index_date": response.meta["index_date"]} if "index_date" in response.meta else None
+                yield self._listing_request(response.urljoin(next_page), meta=meta)
+        elif "index_date" in response.meta:
+            self._done_index.add(f"{urlparse(response.url).netloc}|{response.meta['index_date']}")
+
+    def _listing_request(self, url: str, callback=None, **kwargs):
+        self._listings_pending += 1
+        meta = kwargs.pop("meta", None) or {}
+        meta["listing"] = True
+        if self.mode != "standard" or self.refresh:
+            # cache conditional hanya untuk polling standard; backtrack/refresh selalu parse ulang
+            meta["dont_cache"] = True
+        return scrapy.Request(
+            url, callback=callback or self.parse, errback=self._listing_failed, meta=meta, **kwargs
+        )
+
+    def _listing_done(self, request):
+        if request is not None and request.meta.get("listing"):
+            # request dari antrian JOBDIR run sebelumnya tidak terhitung -> jangan negatif
+            self._listings_pending = max(0, self._listings_pending - 1)
+
+    def _listing_failed(self, failure):
+        self._listing_done(failure.request)
+        self._revisit_record(failure.request, failed=True)
+        logger.debug("Gagal download listing %s: %s", failure.request.url, failure.value)
+
+    def _on_request_dropped(self, request, spider):
+        # ditolak dupefilter: tidak akan pernah sampai ke callback
+        if spider is self:
+            self._listing_done(request)
+
+    def _article_request(self, url: str, info, dont_filter: bool = False):
+        # request artikel sengaja tanpa meta (dict meta baru dibuat saat diakses):
+        # frontier besar tetap ringkas, info URL dihitung ulang dari URL saat response tiba
+        priority = self.article_priority if self._listings_pending >= self.listing_frontier_limit else 0
+        return scrapy.Request(
+            url,
+            callback=self.parse_article_offloaded if self.extraction_pool is not None else self.parse_article,
+            errback=self._article_failed,
+            dont_filter=dont_filter,
+            priority=priority,
+        )
+
+    def _on_request_reached_downloader(self, request, spider):
+        # in-flight = sudah keluar dari antrian scheduler (tidak ikut tersimpan di antrian
+        # JOBDIR) tetapi belum selesai; request yang masih antre di-resume dari JOBDIR
+        if spider is self and self._inflight is not None and request.errback == self._article_failed:
+            self._inflight[request.url] = None
+
+    def _article_failed(self, failure):
+        if self._inflight is not None:
+            self._inflight.pop(failure.request.url, None)
+            for url in failure.request.meta.get("redirect_urls", ()):
+                self._inflight.pop(url, None)
+        logger.debug("Gagal download artikel %s: %s", failure.request.url, failure.value)
+
+    def _observe_download(self, response):
+        latency = response.meta.get("download_latency")
+        if latency is not None:
+            STAGES.observe("download", latency, urlparse(response.url).hostname)
+
+    def _inc_stat(self, key: str, count: int = 1):
+        crawler = getattr(self, "crawler", None)
+        if crawler is not None:
+            crawler.stats.inc_value(f"bisnis/{key}", count)
+
+    def _should_fetch(self, url: str, info) -> bool:
+        # filter level URL yang dipakai semua sumber discovery
+        if self._is_non_text_url(url):
+            self._inc_stat("skip/non_text_url")
+            return False
+        if not self._url_date_in_range(info.date):
+            self._inc_stat("skip/url_out_of_range")
+            return False
+        if not self.refresh and self.seen_store is not None and info.article_id in self.seen_store:
+            self._inc_stat("skip/seen")
+            return False
+        return True
+
+    def _dt_in_range(self, dt) -> bool:
+        if self._start_dt and dt < self._start_dt:
+            return False
+        if self._end_dt and dt > self._end_dt:
+            return False
+        return True
+
+    def _url_date_in_range(self, day) -> bool:
+        # tanggal di URL = tanggal terbit (WIB), cukup dibandingkan per hari
+        if self._start_dt and day < self._start_dt.date():
+            return False
+        if self._end_dt and day > self._end_dt.date():
+            return False
+        return True
+
+    def _is_known_article(self, info) -> bool:
+        if self.refresh:
+            return False
+        if self.watermarks is not None and self.watermarks.is_known(info.host, info.article_id):
+            return True
+        return self.seen_store is not None and info.article_id in self.seen_store
 
     def _is_non_text_url(self, url: str) -> bool:
         # skip known non-article paths or subdomains
@@ -110,84 +620,215 @@ class BisnisSpider(scrapy.Spider):
         return False
 
     def parse_article(self, response):
-        link = response.url
-
-        if self._is_non_text_url(link):
-            logger.debug("Skip non-text URL: %s", link)
+        link, request_url = self._article_received(response)
+        if link is None:
             return
 
-        # title
-        title = (
-            response.css("h1::text").get()
-            or response.css("meta[property='og:title']::attr(content)").get()
-            or response.css("meta[name='twitter:title']::attr(content)").get()
-            or ""
-        )
+        # satu pass: JSON-LD / meta dulu, lalu paragraf & tanggal dalam satu walk;
+        # title dan content sudah dibersihkan di extractor
+        with STAGES.time("extraction"):
+            extracted = extract_article(response.selector.root, min_total_length=40, page_links=True)
 
-        # paragraphs: try to get paragraph nodes, but also fallback to container string()
-        paragraphs = response.css("article p, div.article-content p, div.detail_text p, div[itemprop='articleBody'] p, .article-body p").xpath("string(.)").getall()
-        # clean and join
-        content = clean_paragraphs(paragraphs, min_total_length=40)
-
-        # fallback: container text if paragraphs empty
-        if not content:
-            container_text = (
-                response.css("div.article-content, div.detail_text, article, .article-body")
-                .xpath("string(.)")
-                .get()
-            )
-            content = clean_text(container_text)
-
-        # extract date from common places
-        date_sel = (
-            response.css("meta[property='article:published_time']::attr(content)").get()
-            or response.css("meta[name='pubdate']::attr(content)").get()
-            or response.css("time::attr(datetime)").get()
-            or response.xpath("//*[contains(@class,'date') or contains(@class,'time')]/text()").get()
-        )
-
-        published_at = None
-        if date_sel:
+        pub_dt = None
+        if extracted.published_raw:
             try:
-                published_at = parse_date_to_iso(date_sel, tz="Asia/Jakarta", assume_utc_if_naive=True)
+                with STAGES.time("date_parsing"):
+                    pub_dt = parse_date(extracted.published_raw, tz="Asia/Jakarta", assume_utc_if_naive=True)
             except Exception as e:
-                logger.debug("Gagal parse tanggal %r pada %s: %s", date_sel, link, e)
-                published_at = None
+                logger.debug("Gagal parse tanggal %r pada %s: %s", extracted.published_raw, link, e)
+                pub_dt = None
+
+        yield from self._handle_article(response, link, request_url, extracted, pub_dt)
+
+    async def parse_article_offloaded(self, response):
+        # EXTRACTION_POOL_WORKERS > 0: parse HTML, extraction, cleaning dan parse tanggal
+        # di worker pool; reactor thread hanya menunggu hasilnya
+        link, request_url = self._article_received(response)
+        if link is None:
+            return []
+        extracted, pub_dt, timings = await self.extraction_pool.extract(response)
+        for stage, seconds in timings.items():
+            STAGES.observe(stage, seconds)
+        return list(self._handle_article(response, link, request_url, extracted, pub_dt))
+
+    def _article_received(self, response):
+        link = canonicalize_url(response.url) or response.url
+        request_url = response.request.url if response.request else link
+        self._observe_download(response)
+        if self._inflight is not None:
+            self._inflight.pop(request_url, None)
+            for url in response.meta.get("redirect_urls", ()):
+                self._inflight.pop(url, None)
+
+        if self._is_non_text_url(link):
+            logger.debug("Skip non-text URL: %s", link)
+            self._inc_stat("skip/non_text_url")
+            return None, None
+        return link, request_url
 
+    def _handle_article(self, response, link, request_url, extracted, pub_dt):
         # if date filter active and no published_at -> skip
-        if (self._start_dt or self._end_dt) and not published_at:
+        if (self._start_dt or self._end_dt) and not pub_dt:
             logger.debug("Skip %s karena tidak punya published_at saat filter tanggal aktif.", link)
+            self._inc_stat("skip/no_date")
             return
 
-        # compare dates (both sides should be aware datetimes)
-        if published_at:
-            try:
-                pub_dt = datetime.fromisoformat(published_at)
-                if self._start_dt and pub_dt < self._start_dt:
-                    logger.debug("Skip %s karena pub_dt < start_date", link)
-                    return
-                if self._end_dt and pub_dt > self._end_dt:
-                    logger.debug("Skip %s karena pub_dt > end_date", link)
-                    return
-            except Exception as e:
-                logger.debug("Error saat membandingkan tanggal untuk %s: %s", link, e)
-                return
+        # compare dates (both sides are aware datetimes)
+        if pub_dt and not self._dt_in_range(pub_dt):
+            logger.debug("Skip %s karena pub_dt di luar rentang tanggal", link)
+            self._inc_stat("skip/date_out_of_range")
+            return
+        published_at = pub_dt.isoformat() if pub_dt else None
+
+        info = classify_article_url(request_url) or classify_article_url(link)
+        pages = self._article_pages(response, info, extracted.page_links)
+        if pages:
+            # artikel multi-halaman: halaman lanjutan di-download paralel, item
+            # dikeluarkan setelah semua bagian tiba (parse_article_page)
+            yield from self._start_assembly(link, request_url, extracted, published_at, info, pages)
+            return
 
+        yield from self._emit_article(link, extracted.title, extracted.content, published_at, info)
+
+    def _emit_article(self, link, title, content, published_at, info, pages=None, partial=False):
         # if content still short, skip
         if not content or len(content) < 40:
             logger.debug("Skip %s karena content too short (%s).", link, len(content) if content else 0)
+            self._inc_stat("skip/content_too_short")
             return
 
         item = ArticleItem(
             link=link,
-            title=clean_text(title),
-            content=clean_text(content),
+            title=title,
+            content=content,
             published_at=published_at,
         )
+        if pages:
+            item["pages"] = pages
+            if partial:
+                item["partial"] = True
 
         yield item
 
+        if self.watermarks is not None and info is not None:
+            self.watermarks.update(info.host, info.article_id, published_at)
+
         self.collected += 1
         if self.max_articles and self.collected >= self.max_articles:
             logger.info("Reached max_articles (%s), stopping.", self.max_articles)
             raise scrapy.exceptions.CloseSpider("max_articles_reached")
+
+    # multi-page articles
+    def _article_pages(self, response, info, hrefs) -> dict:
+        # {nomor halaman: url} untuk halaman 2..N artikel yang sama (id sama)
+        if info is None or not hrefs or response.meta.get("article_part") is not None:
+            return {}
+        pages = {}
+        for href in hrefs:
+            url = response.urljoin(href)
+            page = article_page_number(url)
+            if page is None or page < 2 or page > self.article_max_pages or page in pages:
+                continue
+            part = classify_article_url(url)
+            if part is not None and part.article_id == info.article_id:
+                pages[page] = url
+        return pages
+
+    def _start_assembly(self, link, request_url, extracted, published_at, info, pages):
+        self._assemblies[info.article_id] = ArticleAssembly(
+            link, request_url, extracted.title, extracted.content, published_at, info, pages
+        )
+        # artikel belum selesai: tetap tercatat in-flight untuk resume
+        if self._inflight is not None:
+            self._inflight[request_url] = None
+        self._inc_stat("article_pages/multipage")
+        for page, url in sorted(pages.items()):
+            # fingerprint halaman = id artikel (sama dengan halaman 1) -> dont_filter
+            yield scrapy.Request(
+                url,
+                callback=self.parse_article_page,
+                errback=self._article_page_failed,
+                dont_filter=True,
+                priority=self.article_priority + 1,
+                meta={
+                    "article_part": info.article_id,
+                    "article_page": page,
+                    "download_timeout": self.article_page_timeout,
+                    "max_retry_times": 1,
+                },
+            )
+
+    def parse_article_page(self, response):
+        self._observe_download(response)
+        key = response.meta["article_part"]
+        assembly = self._assemblies.get(key)
+        if assembly is None:
+            # tiba setelah artikel dikeluarkan (timeout)
+            self._inc_stat("article_pages/late")
+            return
+        with STAGES.time("extraction"):
+            extracted = extract_article(response.selector.root, min_total_length=0)
+        assembly.add(response.meta["article_page"], extracted.content)
+        yield from self._finish_assembly(key, assembly)
+
+    def _article_page_failed(self, failure):
+        meta = failure.request.meta
+        logger.debug("Gagal download halaman artikel %s: %s", failure.request.url, failure.value)
+        self._inc_stat("article_pages/failed")
+        assembly = self._assemblies.get(meta.get("article_part"))
+        if assembly is None:
+            return
+        assembly.fail(meta["article_page"])
+        yield from self._finish_assembly(meta["article_part"], assembly)
+
+    def _start_assembly_sweep(self, spider):
+        if spider is not self:
+            return
+        self._assembly_sweep = LoopingCall(self._sweep_assemblies)
+        self._assembly_sweep.start(max(1.0, self.article_assembly_timeout / 4), now=False)
+
+    def _sweep_assemblies(self):
+        # timeout biasanya dicek saat halaman tiba; jika halaman lanjutan tidak pernah
+        # tiba, item hanya bisa dikeluarkan lewat callback -> request data: lokal
+        # (tanpa network) yang callback-nya menutup assembly kedaluwarsa
+        if self._assembly_sweep_pending or not any(
+            a.expired(self.article_assembly_timeout) for a in self._assemblies.values()
+        ):
+            return
+        self._assembly_sweep_pending = True
+        self.crawler.engine.crawl(scrapy.Request(
+            "data:,",
+            callback=self._expire_assemblies,
+            errback=self._assembly_sweep_failed,
+            dont_filter=True,
+            priority=self.article_priority + 2,
+        ))
+
+    def _expire_assemblies(self, response):
+        self._assembly_sweep_pending = False
+        for key, assembly in list(self._assemblies.items()):
+            if assembly.expired(self.article_assembly_timeout):
+                yield from self._finish_assembly(key, assembly)
+
+    def _assembly_sweep_failed(self, failure):
+        self._assembly_sweep_pending = False
+        logger.debug("Sweep assembly gagal: %s", failure.value)
+
+    def _finish_assembly(self, key, assembly):
+        if not assembly.done and not assembly.expired(self.article_assembly_timeout):
+            return
+        self._assemblies.pop(key, None)
+        if self._inflight is not None:
+            self._inflight.pop(assembly.request_url, None)
+        if not assembly.done:
+            self._inc_stat("article_pages/timeout")
+        if assembly.partial:
+            if self.article_partial_policy == "drop":
+                logger.debug("Drop artikel %s: %d halaman tidak lengkap.", assembly.link, assembly.pages)
+                self._inc_stat("article_pages/dropped")
+                return
+            self._inc_stat("article_pages/partial")
+        yield from self._emit_article(
+            assembly.link, assembly.title, assembly.content(), assembly.published_at, assembly.info,
+            pages=assembly.pages, partial=assembly.partial,
+        )
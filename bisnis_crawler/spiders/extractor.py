@@ -0,0 +1,162 @@
+import json
+import logging
+from typing import NamedTuple, Optional, Tuple
+
+from lxml import etree
+
+from ..metrics import STAGES
+from .helpers import clean_paragraphs, clean_text
+
+logger = logging.getLogger(__name__)
+
+_NEWS_TYPES = {"NewsArticle", "Article", "ReportageNewsArticle", "AnalysisNewsArticle", "OpinionNewsArticle"}
+
+_META_KEYS = {
+    "og:title": "og_title",
+    "twitter:title": "twitter_title",
+    "article:published_time": "published_time",
+    "pubdate": "pubdate",
+}
+
+
+# satu walk pohon di C (lxml iter dengan filter tag); loop Python hanya
+# menyentuh elemen kandidat, paragraf diambil dari container terluar
+_WALK_TAGS = ("meta", "script", "h1", "time", "article", "div", "section")
+# page_links=True: anchor ikut walk yang sama (tanpa scan //a kedua)
+_WALK_TAGS_LINKS = _WALK_TAGS + ("a",)
+_DATE_CLASS_TEXT_XPATH = etree.XPath(
+    "(//*[contains(@class,'date') or contains(@class,'time')]/text())[1]"
+)
+# link halaman lanjutan artikel (?page=N / ?p=N); di-filter lagi oleh spider
+_PAGE_HREF_MARKERS = ("page=", "p=")
+
+
+class ExtractedArticle(NamedTuple):
+    title: str           # sudah dibersihkan
+    content: str         # sudah dibersihkan (sekali)
+    published_raw: Optional[str]
+    page_links: Tuple[str, ...] = ()    # href mentah blok paginasi (belum di-filter)
+
+
+def _first_text(el) -> Optional[str]:
+    # setara dengan "el::text" pertama (node teks langsung)
+    if el.text:
+        return el.text
+    for child in el:
+        if child.tail:
+            return child.tail
+    return None
+
+
+def _iter_ld_objects(data):
+    if isinstance(data, list):
+        for obj in data:
+            yield from _iter_ld_objects(obj)
+    elif isinstance(data, dict):
+        yield data
+        if "@graph" in data:
+            yield from _iter_ld_objects(data["@graph"])
+
+
+def _news_ld(script_el) -> Optional[dict]:
+    raw = script_el.text
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    for obj in _iter_ld_objects(data):
+        types = obj.get("@type")
+        if isinstance(types, str):
+            types = [types]
+        if types and _NEWS_TYPES.intersection(types):
+            return obj
+    return None
+
+
+def _is_container(el) -> bool:
+    tag = el.tag
+    if tag == "article":
+        return True
+    classes = (el.get("class") or "").split()
+    if "article-body" in classes:
+        return True
+    if tag != "div":
+        return False
+    return "article-content" in classes or "detail_text" in classes or el.get("itemprop") == "articleBody"
+
+
+def extract_article(root, min_total_length: int = 40, page_links: bool = False, timer=None) -> ExtractedArticle:
+    # timer: StageTimer untuk tahap cleaning (default STAGES global; worker pool memakai timer lokal)
+    timer = STAGES if timer is None else timer
+    ld = None
+    meta = {}
+    h1_text = None
+    time_attr = None
+    containers = []
+    links = []
+
+    for el in root.iter(*(_WALK_TAGS_LINKS if page_links else _WALK_TAGS)):
+        tag = el.tag
+        if tag == "a":
+            href = el.get("href")
+            if href and any(marker in href for marker in _PAGE_HREF_MARKERS):
+                links.append(href)
+        elif tag == "meta":
+            key = _META_KEYS.get(el.get("property") or el.get("name"))
+            if key and key not in meta:
+                meta[key] = el.get("content")
+        elif tag == "script":
+            if ld is None and el.get("type") == "application/ld+json":
+                ld = _news_ld(el)
+        elif tag == "h1":
+            if h1_text is None:
+                h1_text = _first_text(el)
+        elif tag == "time":
+            if time_attr is None:
+                time_attr = el.get("datetime")
+        elif _is_container(el):
+            # container bersarang sudah tercakup oleh container terluarnya
+            if not containers or containers[-1] not in el.iterancestors():
+                containers.append(el)
+
+    # urutan dokumen, tanpa duplikat (setara union selector CSS lama)
+    paragraphs = ["".join(p.itertext()) for c in containers for p in c.iter("p")]
+    container = containers[0] if containers else None
+
+    ld = ld or {}
+    headline = ld.get("headline")
+    title = (
+        (headline if isinstance(headline, str) else None)
+        or h1_text
+        or meta.get("og_title")
+        or meta.get("twitter_title")
+        or ""
+    )
+
+    with timer.time("cleaning"):
+        content = clean_paragraphs(paragraphs, min_total_length=min_total_length)
+        if not content:
+            body = ld.get("articleBody")
+            if isinstance(body, str) and body:
+                content = clean_text(body)
+            elif container is not None:
+                content = clean_text("".join(container.itertext()))
+        title = clean_text(title)
+
+    ld_date = ld.get("datePublished")
+    published_raw = (
+        (ld_date if isinstance(ld_date, str) else None)
+        or meta.get("published_time")
+        or meta.get("pubdate")
+        or time_attr
+    )
+    if not published_raw:
+        found = _DATE_CLASS_TEXT_XPATH(root)
+        published_raw = str(found[0]) if found else None
+
+    return ExtractedArticle(title=title, content=content, published_raw=published_raw, page_links=tuple(links))
+
+
+__all__ = ["ExtractedArticle", "extract_article"]
@@ -0,0 +1,77 @@
+import io
+import logging
+from typing import Iterator, NamedTuple, Optional
+
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+
+class FeedEntry(NamedTuple):
+    url: str
+    published_raw: Optional[str]
+    is_sitemap: bool  # True = entri <sitemapindex>, berisi sitemap lain
+
+
+_ENTRY_TAGS = ("url", "sitemap", "item", "entry")
+
+
+def _local(tag) -> str:
+    # "{namespace}loc" -> "loc"
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_feed_entries(body: bytes) -> Iterator[FeedEntry]:
+    # parse sitemap (urlset / sitemapindex / Google News), RSS 2.0 dan Atom secara
+    # streaming: elemen dibuang setelah diproses sehingga memori tetap kecil
+    context = etree.iterparse(
+        io.BytesIO(body),
+        events=("start", "end"),
+        recover=True,
+        huge_tree=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+    url = None
+    published = None
+    try:
+        for event, el in context:
+            name = _local(el.tag)
+            if event == "start":
+                if name in _ENTRY_TAGS:
+                    url = None
+                    published = None
+                continue
+            if name == "loc":
+                # <loc> pertama saja (image:loc dsb. diabaikan)
+                url = url or (el.text or "").strip() or None
+            elif name == "link":
+                # RSS: <link>url</link>; Atom: <link href="..." rel="alternate"/>
+                href = el.get("href")
+                if href and el.get("rel", "alternate") == "alternate":
+                    url = url or href.strip()
+                elif el.text and el.text.strip():
+                    url = url or el.text.strip()
+            elif name in ("publication_date", "pubDate", "published"):
+                published = (el.text or "").strip() or published
+            elif name in ("lastmod", "updated", "date"):
+                # lastmod kalah prioritas dari tanggal terbit eksplisit
+                published = published or (el.text or "").strip() or None
+            elif name in _ENTRY_TAGS:
+                if url:
+                    yield FeedEntry(url=url, published_raw=published, is_sitemap=(name == "sitemap"))
+                url = None
+                published = None
+                el.clear()
+                # buang sibling yang sudah diproses
+                parent = el.getparent()
+                if parent is not None:
+                    while el.getprevious() is not None:
+                        del parent[0]
+    except etree.XMLSyntaxError as e:
+        logger.debug("Feed tidak valid: %s", e)
+
+
+__all__ = ["FeedEntry", "iter_feed_entries"]
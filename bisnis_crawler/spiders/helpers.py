@@ -1,8 +1,11 @@
 from dateutil import parser as dateparser
-from datetime import datetime, timezone, timedelta
+from datetime import datetime, date, timezone, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 import logging
 import re
-from typing import Optional, Iterable, List
+from typing import Optional, Iterable, List, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 try:
     from zoneinfo import ZoneInfo
@@ -12,10 +15,8 @@ except Exception:
 logger = logging.getLogger(__name__)
 
 # regex patterns
-_MULTI_WS_RE = re.compile(r"\s+")
-_LEAD_TRAIL_PUNCT_RE = re.compile(
-    r'^[\s\-\–\—\:\;\"\'\(\)\[\]\,\.«»“”‘’\u200e\u200f]+|[\s\-\–\—\:\;\"\'\(\)\[\]\,\.«»“”‘’\u200e\u200f]+$'
-)
+# karakter yang di-trim di awal/akhir teks (selain whitespace)
+_PUNCT_STRIP_CHARS = " -–—:;\"'()[],.«»“”‘’\u200e\u200f"
 _BACA_JUGA_RE = re.compile(
     r'\b(baca\s+juga|baca:?\s+selengkapnya|baca\s+selengkapnya|baca\s+juga:?)\b',
     flags=re.IGNORECASE,
@@ -24,6 +25,12 @@ _DATALAYER_RE = re.compile(r'window\.dataLayer\s*=\s*window\.dataLayer\s*\|\|\s*
 _JSON_FRAGMENT_RE = re.compile(r'\{.*?"content_description".*?\}', flags=re.DOTALL)
 _HTML_TAGS_RE = re.compile(r'<(?:script|style)[\s\S]*?</(?:script|style)>', flags=re.IGNORECASE)
 
+# article url: /read/<yyyymmdd>/<channel>/<article_id>/<slug>
+_ARTICLE_PATH_RE = re.compile(r'/read/(\d{8})/(\d+)/(\d+)(?:/|$)')
+_ARTICLE_SLUG_RE = re.compile(r'/read/\d{8}/\d+/\d+/([^/?#]+)')
+# query tracking yang tidak mengubah isi halaman
+_TRACKING_PARAMS = {"fbclid", "gclid", "dclid", "msclkid", "_ga", "ref", "src"}
+
 # date parsing
 # fallback_map for some common IANA names to fixed offsets (hours)
 _FALLBACK_TZ_MAP = {
@@ -34,6 +41,40 @@ _FALLBACK_TZ_MAP = {
     "Asia/Makassar": timezone(timedelta(hours=8))
 }
 
+# format tanggal Bisnis: "Sabtu, 15 November 2025 | 13:47", "15 Des 2025 13:47 WIB"
+_ID_MONTHS = {
+    "januari": 1, "jan": 1,
+    "februari": 2, "feb": 2, "pebruari": 2,
+    "maret": 3, "mar": 3,
+    "april": 4, "apr": 4,
+    "mei": 5,
+    "juni": 6, "jun": 6,
+    "juli": 7, "jul": 7,
+    "agustus": 8, "agu": 8, "agt": 8, "ags": 8, "aug": 8,
+    "september": 9, "sep": 9, "sept": 9,
+    "oktober": 10, "okt": 10, "oct": 10,
+    "november": 11, "nov": 11, "nop": 11,
+    "desember": 12, "des": 12, "dec": 12,
+}
+_ID_TZ = {
+    "WIB": timezone(timedelta(hours=7)),
+    "WITA": timezone(timedelta(hours=8)),
+    "WIT": timezone(timedelta(hours=9)),
+}
+_ID_DATE_RE = re.compile(
+    r'^\s*(?:(?:senin|selasa|rabu|kamis|jumat|jum\'at|sabtu|minggu|ahad)\s*,?\s*)?'
+    r'(\d{1,2})\s+([a-z]+)\.?\s+(\d{4})'
+    r'(?:\s*[|,\-]?\s*(?:pukul\s+)?(\d{1,2})[:.](\d{2})(?:[:.](\d{2}))?)?'
+    r'\s*(WIB|WITA|WIT)?\s*$',
+    flags=re.IGNORECASE,
+)
+_RFC2822_RE = re.compile(
+    r'^\s*(?:[A-Za-z]{3},\s*)?\d{1,2}\s+[A-Za-z]{3}\s+\d{4}\s+\d{2}:\d{2}(?::\d{2})?'
+    r'\s+(?:[+-]\d{4}|GMT|UTC?)\s*$'
+)
+
+
+@lru_cache(maxsize=32)
 def _resolve_target_tz(tz_name: str):
     if not tz_name:
         return timezone.utc
@@ -54,28 +95,67 @@ def _resolve_target_tz(tz_name: str):
         return timezone(timedelta(hours=hours, minutes=mins))
     return timezone.utc
 
-def parse_date_to_iso(date_str, tz: str = "UTC", assume_utc_if_naive: bool = True) -> str:
-    if not date_str:
-        raise ValueError("date_str is empty or None")
 
-    if isinstance(date_str, datetime):
-        dt = date_str
-    else:
+def _parse_date_fast(text: str) -> Optional[datetime]:
+    # ISO-8601 (meta article:published_time, JSON-LD, last_run.txt)
+    iso = text.strip()
+    if iso.endswith("Z"):
+        iso = iso[:-1] + "+00:00"
+    try:
+        return datetime.fromisoformat(iso)
+    except ValueError:
+        pass
+    # format tanggal Indonesia di halaman Bisnis
+    m = _ID_DATE_RE.match(text)
+    if m:
+        month = _ID_MONTHS.get(m.group(2).lower())
+        if month:
+            try:
+                return datetime(
+                    int(m.group(3)), month, int(m.group(1)),
+                    int(m.group(4) or 0), int(m.group(5) or 0), int(m.group(6) or 0),
+                    tzinfo=_ID_TZ.get((m.group(7) or "").upper()),
+                )
+            except ValueError:
+                return None
+    # RFC 2822 (pubDate RSS): "Sat, 15 Nov 2025 18:32:47 +0700"; hanya bentuk ketat,
+    # parsedate_to_datetime mengabaikan AM/PM ("1:47 PM" -> 01:47)
+    if _RFC2822_RE.match(text):
         try:
-            dt = dateparser.parse(str(date_str), fuzzy=True)
-        except Exception as e:
-            raise ValueError(f"unable to parse date_str: {date_str!r}") from e
+            return parsedate_to_datetime(text)
+        except (TypeError, ValueError, IndexError):
+            pass
+    return None
+
 
+@lru_cache(maxsize=4096)
+def _parse_date_cached(text: str, tz: str, assume_utc_if_naive: bool) -> Optional[datetime]:
+    # hanya format eksplisit (tahun selalu ada di string) yang di-cache
+    dt = _parse_date_fast(text)
+    return _to_target_tz(dt, tz, assume_utc_if_naive) if dt is not None else None
+
+
+def _parse_date_fuzzy(text: str, tz: str, assume_utc_if_naive: bool) -> datetime:
+    # fallback: dateutil fuzzy (lambat, hanya untuk format tak dikenal); tidak di-cache
+    # karena bagian yang hilang (mis. tahun) diisi dari tanggal hari ini
+    try:
+        dt = dateparser.parse(text, fuzzy=True)
+    except Exception as e:
+        raise ValueError(f"unable to parse date_str: {text!r}") from e
     if dt is None:
-        raise ValueError(f"unable to parse date_str: {date_str!r}")
+        raise ValueError(f"unable to parse date_str: {text!r}")
+    return _to_target_tz(dt, tz, assume_utc_if_naive)
+
 
+def _to_target_tz(dt: datetime, tz: str, assume_utc_if_naive: bool) -> datetime:
+    target = _resolve_target_tz(tz)
     if dt.tzinfo is None:
         if assume_utc_if_naive:
             dt = dt.replace(tzinfo=timezone.utc)
         else:
-            dt = dt.replace(tzinfo=timezone.utc)
+            # naive dianggap waktu lokal zona target
+            dt = dt.replace(tzinfo=target)
 
-    target = _resolve_target_tz(tz)
     try:
         dt = dt.astimezone(target)
     except Exception:
@@ -83,41 +163,148 @@ def parse_date_to_iso(date_str, tz: str = "UTC", assume_utc_if_naive: bool = Tru
         ts = dt.timestamp()
         offset_dt = datetime.fromtimestamp(ts, tz=target)
         dt = offset_dt
-    return dt.isoformat()
+    return dt
+
+
+def parse_date(date_str, tz: str = "UTC", assume_utc_if_naive: bool = True) -> datetime:
+    # aware datetime di zona tz; string format eksplisit yang sama di-cache (datetime immutable)
+    if not date_str:
+        raise ValueError("date_str is empty or None")
+    if isinstance(date_str, datetime):
+        return _to_target_tz(date_str, tz, assume_utc_if_naive)
+    text = str(date_str)
+    dt = _parse_date_cached(text, tz, bool(assume_utc_if_naive))
+    return dt if dt is not None else _parse_date_fuzzy(text, tz, assume_utc_if_naive)
+
+
+def parse_date_to_iso(date_str, tz: str = "UTC", assume_utc_if_naive: bool = True) -> str:
+    return parse_date(date_str, tz=tz, assume_utc_if_naive=assume_utc_if_naive).isoformat()
 
 # cleaning utilities
-def clean_text(text: Optional[str]) -> str:
-    if not text:
-        return ""
-    s = str(text)
+def _has_noise(s: str) -> bool:
+    # penanda literal yang wajib ada agar salah satu regex noise bisa match
+    return "<" in s or "dataLayer" in s or '"content_description"' in s
+
+
+def _remove_noise(s: str) -> str:
     s = _HTML_TAGS_RE.sub("", s)
     s = _DATALAYER_RE.sub("", s)
     s = _JSON_FRAGMENT_RE.sub("", s)
-    s = s.strip()
-    s = _BACA_JUGA_RE.sub("", s)
-    s = _MULTI_WS_RE.sub(" ", s)
-    s = _LEAD_TRAIL_PUNCT_RE.sub("", s)
-    s = _MULTI_WS_RE.sub(" ", s).strip()
     return s
 
+
+def _clean_one(s: str, check_noise: bool = True) -> str:
+    if check_noise and _has_noise(s):
+        s = _remove_noise(s)
+    s = _BACA_JUGA_RE.sub("", s)
+    # split/join == collapse \s+ + strip; setelah itu satu-satunya whitespace
+    # adalah spasi, jadi trim tanda baca cukup dengan str.strip
+    return " ".join(s.split()).strip(_PUNCT_STRIP_CHARS)
+
+
+def clean_text(text: Optional[str]) -> str:
+    if not text:
+        return ""
+    return _clean_one(str(text))
+
 # paragraphs cleaning
 def clean_paragraphs(paragraphs: Iterable[str], min_total_length: int = 40) -> str:
     if not paragraphs:
         return ""
+    parts = [str(p) for p in paragraphs if p]
+    # cek noise sekali untuk seluruh artikel; umumnya tidak ada sama sekali
+    check_noise = _has_noise("\x00".join(parts))
     cleaned_parts: List[str] = []
-    for p in paragraphs:
-        if not p:
-            continue
-        cp = clean_text(p)
-        if not cp:
-            continue
+    for p in parts:
+        cp = _clean_one(p, check_noise)
         if len(cp) < 8:
             continue
         cleaned_parts.append(cp)
-    content = " ".join(cleaned_parts).strip()
-    content = _MULTI_WS_RE.sub(" ", content)
+    content = " ".join(cleaned_parts)
     if len(content) < min_total_length:
         return ""
     return content
 
-__all__ = ["parse_date_to_iso", "clean_text", "clean_paragraphs"]
+# url classification
+class ArticleUrl(NamedTuple):
+    host: str
+    date: date
+    channel: int
+    article_id: int
+
+
+def classify_article_url(url: Optional[str]) -> Optional[ArticleUrl]:
+    # ambil tanggal, channel dan id artikel dari path tanpa perlu fetch halaman
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url)
+    except ValueError:
+        return None
+    m = _ARTICLE_PATH_RE.search(parsed.path)
+    if not m:
+        return None
+    try:
+        day = datetime.strptime(m.group(1), "%Y%m%d").date()
+    except ValueError:
+        return None
+    return ArticleUrl(
+        host=(parsed.hostname or "").lower(),
+        date=day,
+        channel=int(m.group(2)),
+        article_id=int(m.group(3)),
+    )
+
+
+def article_page_number(url: Optional[str]) -> Optional[int]:
+    # nomor halaman artikel multi-halaman (?page=N / ?p=N); None jika bukan URL halaman
+    if not url:
+        return None
+    try:
+        query = parse_qsl(urlparse(url).query)
+    except ValueError:
+        return None
+    for key, value in query:
+        if key in ("page", "p") and value.isdigit():
+            return int(value)
+    return None
+
+
+def _canonical_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    # bisnis.com tanpa subdomain dilayani di www
+    return "www.bisnis.com" if host == "bisnis.com" else host
+
+
+def canonicalize_url(url: Optional[str]) -> Optional[str]:
+    # bentuk tunggal untuk URL yang sama: https, host tanpa www (kecuali bisnis.com),
+    # tanpa fragment & query tracking. URL artikel -> /read/<tgl>/<channel>/<id>/<slug>
+    # tanpa query sama sekali (?page=, ?utm_...); identitasnya = id artikel
+    if not url:
+        return None
+    try:
+        parsed = urlparse(url.strip())
+    except ValueError:
+        return None
+    if parsed.scheme and parsed.scheme.lower() not in ("http", "https"):
+        return None
+    if not parsed.hostname:
+        return None
+    host = _canonical_host(parsed.hostname)
+    m = _ARTICLE_PATH_RE.search(parsed.path)
+    if m:
+        slug = _ARTICLE_SLUG_RE.search(parsed.path)
+        path = f"/read/{m.group(1)}/{m.group(2)}/{m.group(3)}"
+        if slug:
+            path += f"/{slug.group(1)}"
+        return f"https://{host}{path}"
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not (k.lower().startswith("utm_") or k.lower() in _TRACKING_PARAMS)
+    ])
+    return urlunparse(("https", host, parsed.path or "/", "", query, ""))
+
+
+__all__ = ["parse_date", "parse_date_to_iso", "clean_text", "clean_paragraphs", "ArticleUrl", "classify_article_url", "canonicalize_url", "article_page_number"]
@@ -0,0 +1,371 @@
+import gzip
+import json
+import logging
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from datetime import timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .dedup import line_link, link_key
+from .spiders.helpers import classify_article_url
+
+logger = logging.getLogger(__name__)
+
+# store output terkompresi, dipartisi per tanggal terbit:
+#   <root>/<YYYY-MM-DD>/seg-000001.jsonl.gz   gzip member per blok (bisa di-zcat utuh)
+#   <root>/<YYYY-MM-DD>/index.bin             entry fixed-width per artikel
+#   <root>/<YYYY-MM-DD>/index.range           key min/max partisi + jumlah entry index
+# entry index: key (id artikel / hash URL), nomor segment, offset + panjang member
+# gzip, nomor baris di dalam member -> baca satu artikel = decompress satu blok.
+# Lookup per key: partisi yang rentang key-nya tidak mencakup key dilewati tanpa
+# membaca index; index partisi lain diurutkan per key di memori lalu di-bisect.
+
+_INDEX_ENTRY = struct.Struct("<QIQII")
+_RANGE = struct.Struct("<QQQ")  # key min, key max, jumlah entry index.bin saat ditulis
+INDEX_FILE = "index.bin"
+RANGE_FILE = "index.range"
+REPACK_INDEX_FILE = "index.repack"
+UNKNOWN_PARTITION = "unknown"
+
+_DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_SEGMENT_RE = re.compile(r"^seg-(\d+)\.jsonl\.gz$")
+_PUBLISHED_VALUE_RE = re.compile(rb'"published_at"\s*:\s*"(\d{4}-\d{2}-\d{2})')
+
+
+class IndexEntry(NamedTuple):
+    key: int
+    segment: int
+    offset: int
+    length: int
+    line: int
+
+
+def _segment_name(segment: int) -> str:
+    return f"seg-{segment:06d}.jsonl.gz"
+
+
+def read_index(part_dir, name: str = INDEX_FILE) -> List[IndexEntry]:
+    path = Path(part_dir) / name
+    if not path.exists():
+        return []
+    data = path.read_bytes()
+    # abaikan entry parsial di ekor (writer crash di tengah append)
+    usable = len(data) - len(data) % _INDEX_ENTRY.size
+    return [IndexEntry(*e) for e in _INDEX_ENTRY.iter_unpack(data[:usable])]
+
+
+def read_range(part_dir) -> Optional[Tuple[int, int]]:
+    # None jika tidak ada / basi (index.bin sudah bertambah sejak range ditulis)
+    part_dir = Path(part_dir)
+    try:
+        lo, hi, count = _RANGE.unpack((part_dir / RANGE_FILE).read_bytes())
+        size = (part_dir / INDEX_FILE).stat().st_size
+    except (OSError, struct.error):
+        return None
+    return (lo, hi) if count == size // _INDEX_ENTRY.size else None
+
+
+def _fsync_dir(path: Path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def line_partition(line: bytes) -> str:
+    m = _PUBLISHED_VALUE_RE.search(line)
+    return m.group(1).decode("ascii") if m else UNKNOWN_PARTITION
+
+
+def line_key(line: bytes) -> Optional[int]:
+    link = line_link(line)
+    return link_key(link) if link is not None else None
+
+
+class _PartitionWriter:
+    def __init__(self, part_dir: Path, block_records: int, block_bytes: int, segment_bytes: int, level: int,
+                 index_file: str = INDEX_FILE, first_segment: int = 1):
+        self.dir = part_dir
+        self.index_file = index_file
+        self.block_records = block_records
+        self.block_bytes = block_bytes
+        self.segment_bytes = segment_bytes
+        self.level = level
+        part_dir.mkdir(parents=True, exist_ok=True)
+        entries = read_index(part_dir, index_file)
+        self.keys = {e.key for e in entries}
+        self.entries = len(entries)
+        self.segment = max((e.segment for e in entries), default=first_segment)
+        self._pending: List[Tuple[int, bytes]] = []
+        self._pending_bytes = 0
+
+    def add(self, key: int, line: bytes) -> bool:
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self._pending.append((key, line))
+        self._pending_bytes += len(line)
+        if len(self._pending) >= self.block_records or self._pending_bytes >= self.block_bytes:
+            self.flush()
+        return True
+
+    def flush(self):
+        if not self._pending:
+            return
+        seg_path = self.dir / _segment_name(self.segment)
+        if seg_path.exists() and seg_path.stat().st_size >= self.segment_bytes:
+            self.segment += 1
+            seg_path = self.dir / _segment_name(self.segment)
+        member = gzip.compress(b"".join(line for _, line in self._pending), self.level, mtime=0)
+        with seg_path.open("ab") as fh:
+            offset = fh.tell()
+            fh.write(member)
+            fh.flush()
+            os.fsync(fh.fileno())
+        # index ditulis setelah data durable: reader tidak pernah melihat offset ke data yang belum ada
+        entries = b"".join(
+            _INDEX_ENTRY.pack(key, self.segment, offset, len(member), i)
+            for i, (key, _) in enumerate(self._pending)
+        )
+        with (self.dir / self.index_file).open("ab") as fh:
+            fh.write(entries)
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.entries += len(self._pending)
+        self._pending.clear()
+        self._pending_bytes = 0
+        if self.index_file == INDEX_FILE:
+            self.write_range()
+
+    def write_range(self):
+        # hanya petunjuk untuk lookup (divalidasi dengan jumlah entry), tanpa fsync
+        if not self.keys:
+            return
+        tmp = self.dir / f"{RANGE_FILE}.tmp"
+        tmp.write_bytes(_RANGE.pack(min(self.keys), max(self.keys), self.entries))
+        tmp.replace(self.dir / RANGE_FILE)
+
+
+class OutputStore:
+    def __init__(
+        self,
+        root,
+        block_records: int = 256,
+        block_bytes: int = 256 * 1024,
+        segment_bytes: int = 64 * 1024 * 1024,
+        level: int = 6,
+    ):
+        self.root = Path(root)
+        self.block_records = block_records
+        self.block_bytes = block_bytes
+        self.segment_bytes = segment_bytes
+        self.level = level
+        self._writers: Dict[str, _PartitionWriter] = {}
+        # index per partisi terurut per key: day -> (stamp index.bin, keys, entries)
+        self._sorted: Dict[str, Tuple[tuple, array, List[IndexEntry]]] = {}
+
+    @classmethod
+    def from_settings(cls, settings, root=None):
+        return cls(
+            root or settings.get("OUTPUT_STORE_PATH", "data/store"),
+            block_records=settings.getint("OUTPUT_STORE_BLOCK_RECORDS", 256),
+            block_bytes=settings.getint("OUTPUT_STORE_BLOCK_BYTES", 256 * 1024),
+            segment_bytes=settings.getint("OUTPUT_STORE_SEGMENT_BYTES", 64 * 1024 * 1024),
+        )
+
+    # write
+    def _writer(self, day: str) -> _PartitionWriter:
+        writer = self._writers.get(day)
+        if writer is None:
+            writer = _PartitionWriter(
+                self.root / day, self.block_records, self.block_bytes, self.segment_bytes, self.level
+            )
+            self._writers[day] = writer
+        return writer
+
+    def add_line(self, line: bytes) -> bool:
+        # baris JSONL mentah; hanya link & published_at yang dibaca
+        line = line.strip()
+        if not line:
+            return False
+        key = line_key(line)
+        if key is None:
+            return False
+        return self._writer(line_partition(line)).add(key, line + b"\n")
+
+    def add(self, record: dict) -> bool:
+        return self.add_line(json.dumps(record, ensure_ascii=False).encode("utf-8"))
+
+    def flush(self):
+        for writer in self._writers.values():
+            writer.flush()
+
+    def close(self):
+        self.flush()
+        self._writers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # read
+    def partitions(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        if not self.root.exists():
+            return []
+        days = sorted(p.name for p in self.root.iterdir() if p.is_dir() and _DAY_RE.match(p.name))
+        return [d for d in days if (start is None or d >= start) and (end is None or d <= end)]
+
+    def _read_member(self, part_dir: Path, segment: int, offset: int, length: int) -> List[bytes]:
+        with (part_dir / _segment_name(segment)).open("rb") as fh:
+            fh.seek(offset)
+            return gzip.decompress(fh.read(length)).splitlines()
+
+    def _iter_partition(self, day: str) -> Iterator[bytes]:
+        part_dir = self.root / day
+        done = set()
+        for e in read_index(part_dir):
+            member = (e.segment, e.offset)
+            if member in done:
+                continue
+            done.add(member)
+            yield from self._read_member(part_dir, e.segment, e.offset, e.length)
+
+    def iter_lines(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[bytes]:
+        # range read: hanya partisi dalam rentang yang di-decompress, blok demi blok
+        for day in self.partitions(start, end):
+            yield from self._iter_partition(day)
+
+    def iter_records(self, start: Optional[str] = None, end: Optional[str] = None) -> Iterator[dict]:
+        for line in self.iter_lines(start, end):
+            yield json.loads(line)
+
+    def _candidate_days(self, url: Optional[str], day: Optional[str]) -> List[str]:
+        if day:
+            return [day]
+        info = classify_article_url(url) if url else None
+        if info is None:
+            return self.partitions() + [UNKNOWN_PARTITION]
+        # tanggal di URL = tanggal terbit (WIB); tetangga untuk jaga-jaga
+        near = [(info.date + timedelta(days=k)).isoformat() for k in (0, -1, 1)]
+        return near + [d for d in self.partitions() if d not in near] + [UNKNOWN_PARTITION]
+
+    def _sorted_index(self, day: str) -> Optional[Tuple[array, List[IndexEntry]]]:
+        try:
+            st = (self.root / day / INDEX_FILE).stat()
+        except OSError:
+            return None
+        stamp = (st.st_ino, st.st_size)
+        cached = self._sorted.get(day)
+        if cached is None or cached[0] != stamp:
+            entries = sorted(read_index(self.root / day))
+            cached = self._sorted[day] = (stamp, array("Q", (e.key for e in entries)), entries)
+        return cached[1], cached[2]
+
+    def _lookup(self, day: str, key: int) -> Optional[IndexEntry]:
+        span = read_range(self.root / day)
+        if span is not None and not span[0] <= key <= span[1]:
+            return None
+        index = self._sorted_index(day)
+        if index is None:
+            return None
+        keys, entries = index
+        i = bisect_left(keys, key)
+        return entries[i] if i < len(keys) and keys[i] == key else None
+
+    def locate(self, url_or_key, day: Optional[str] = None) -> Optional[Tuple[str, IndexEntry]]:
+        url = url_or_key if isinstance(url_or_key, str) else None
+        key = link_key(url) if url is not None else int(url_or_key)
+        for d in self._candidate_days(url, day):
+            e = self._lookup(d, key)
+            if e is not None:
+                return d, e
+        return None
+
+    def get_line(self, url_or_key, day: Optional[str] = None) -> Optional[bytes]:
+        found = self.locate(url_or_key, day)
+        if found is None:
+            return None
+        d, e = found
+        return self._read_member(self.root / d, e.segment, e.offset, e.length)[e.line]
+
+    def get(self, url_or_key, day: Optional[str] = None) -> Optional[dict]:
+        line = self.get_line(url_or_key, day)
+        return json.loads(line) if line is not None else None
+
+    # maintenance
+    def repack(self, day: str) -> bool:
+        # partisi dengan banyak blok kecil (ditulis per siklus daemon) -> blok penuh
+        part_dir = self.root / day
+        entries = read_index(part_dir)
+        members = {(e.segment, e.offset) for e in entries}
+        if len(members) <= 1 or len(entries) / len(members) >= self.block_records / 4:
+            return False
+        writer = self._writers.pop(day, None)
+        if writer is not None:
+            writer.flush()
+        self._sorted.pop(day, None)
+        # sisa repack yang crash (segment tanpa index) dibuang dulu
+        live = {e.segment for e in entries}
+        self._remove_segments(part_dir, lambda n: n not in live)
+        (part_dir / REPACK_INDEX_FILE).unlink(missing_ok=True)
+        # segment baru bernomor setelah segment lama, index baru di file terpisah;
+        # satu rename index menukar isi partisi secara atomik (crash sebelum rename =
+        # partisi lama utuh, sesudahnya = partisi baru utuh + segment lama tak terpakai)
+        first = max(live) + 1
+        writer = _PartitionWriter(
+            part_dir, self.block_records, self.block_bytes, self.segment_bytes, self.level,
+            index_file=REPACK_INDEX_FILE, first_segment=first,
+        )
+        for line in self._iter_partition(day):
+            writer.add(line_key(line), line + b"\n")
+        writer.flush()
+        os.replace(part_dir / REPACK_INDEX_FILE, part_dir / INDEX_FILE)
+        _fsync_dir(part_dir)
+        writer.write_range()
+        self._remove_segments(part_dir, lambda n: n < first)
+        return True
+
+    def _remove_segments(self, part_dir: Path, predicate):
+        for path in part_dir.iterdir():
+            m = _SEGMENT_RE.match(path.name)
+            if m and predicate(int(m.group(1))):
+                path.unlink()
+
+
+def compact_files(
+    store: OutputStore,
+    files: Iterable[Path],
+    remove: bool = True,
+    repack: bool = True,
+) -> Dict[str, int]:
+    # gabungkan file JSONL (output per siklus / per rentang) ke partisi harian
+    stats = {"files": 0, "added": 0, "duplicates": 0}
+    touched = set()
+    for path in files:
+        with path.open("rb") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                touched.add(line_partition(line))
+                if store.add_line(line):
+                    stats["added"] += 1
+                else:
+                    stats["duplicates"] += 1
+        # data harus durable di store sebelum sumber dihapus
+        store.flush()
+        stats["files"] += 1
+        if remove:
+            path.unlink()
+            Path(f"{path}.ckpt").unlink(missing_ok=True)
+        logger.info("Compacted %s", path)
+    if repack:
+        stats["repacked"] = sum(1 for day in sorted(touched) if store.repack(day))
+    return stats
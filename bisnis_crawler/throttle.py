@@ -0,0 +1,146 @@
+import logging
+import time
+from typing import Dict, Optional
+
+from scrapy.exceptions import NotConfigured
+from scrapy.utils.httpobj import urlparse_cached
+
+logger = logging.getLogger(__name__)
+
+# status yang berarti "terlalu cepat" dari sisi server
+_BACKOFF_STATUSES = {429, 503}
+
+
+class _HostBudget:
+    __slots__ = ("concurrency", "delay", "latency", "error_rate", "successes", "backoff_until")
+
+    def __init__(self, concurrency: int, delay: float):
+        self.concurrency = concurrency
+        self.delay = delay
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.successes = 0
+        self.backoff_until = 0.0
+
+
+# budget concurrency + delay per subdomain (slot downloader Scrapy = hostname).
+# AIMD: naik pelan selama latency host di bawah target dan error rate rendah,
+# turun setengah saat 429/503/timeout. Satu host yang lambat hanya memperlambat
+# slot-nya sendiri; total dibatasi CONCURRENT_REQUESTS.
+class HostThrottleMiddleware:
+    def __init__(self, crawler):
+        settings = crawler.settings
+        if not settings.getbool("HOST_THROTTLE_ENABLED"):
+            raise NotConfigured
+        self.crawler = crawler
+        self.start_concurrency = settings.getint("HOST_THROTTLE_START_CONCURRENCY", 2)
+        self.max_concurrency = settings.getint("HOST_THROTTLE_MAX_CONCURRENCY", 8)
+        self.start_delay = settings.getfloat("HOST_THROTTLE_START_DELAY", 1.0)
+        self.min_delay = settings.getfloat("HOST_THROTTLE_MIN_DELAY", 0.25)
+        self.max_delay = settings.getfloat("HOST_THROTTLE_MAX_DELAY", 30.0)
+        self.target_latency = settings.getfloat("HOST_THROTTLE_TARGET_LATENCY", 2.0)
+        self.max_error_rate = settings.getfloat("HOST_THROTTLE_MAX_ERROR_RATE", 0.05)
+        self.alpha = settings.getfloat("HOST_THROTTLE_EWMA_ALPHA", 0.2)
+        self.debug = settings.getbool("HOST_THROTTLE_DEBUG")
+        self.budgets: Dict[str, _HostBudget] = {}
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    def _slot(self, request):
+        # download_slot baru di-set downloader setelah process_request; sebelum itu
+        # key slot default Scrapy = hostname
+        key = request.meta.get("download_slot") or urlparse_cached(request).hostname
+        engine = self.crawler.engine
+        if not key or engine is None:
+            return None, None
+        return key, engine.downloader.slots.get(key)
+
+    def _budget(self, key: str) -> _HostBudget:
+        budget = self.budgets.get(key)
+        if budget is None:
+            budget = self.budgets[key] = _HostBudget(self.start_concurrency, self.start_delay)
+        return budget
+
+    def _apply(self, key: str, slot, budget: _HostBudget, reason: str):
+        if slot.concurrency == budget.concurrency and slot.delay == budget.delay:
+            return
+        slot.concurrency = budget.concurrency
+        slot.delay = budget.delay
+        self.crawler.stats.max_value(f"bisnis/throttle/{key}/max_concurrency", budget.concurrency)
+        if self.debug:
+            logger.info(
+                "throttle %s (%s): conc=%d delay=%.2fs latency=%s err=%.2f",
+                key, reason, budget.concurrency, budget.delay,
+                f"{budget.latency:.2f}s" if budget.latency is not None else "-", budget.error_rate,
+            )
+
+    def process_request(self, request, spider=None):
+        # slot baru dibuat Scrapy dengan CONCURRENT_REQUESTS_PER_DOMAIN / DOWNLOAD_DELAY;
+        # budget host dipasang begitu slot-nya ada
+        key, slot = self._slot(request)
+        if slot is not None:
+            self._apply(key, slot, self._budget(key), "init")
+        return None
+
+    def process_response(self, request, response, spider=None):
+        key, slot = self._slot(request)
+        if slot is None:
+            return response
+        budget = self._budget(key)
+        if response.status in _BACKOFF_STATUSES:
+            self._back_off(budget, response.headers.get(b"Retry-After"))
+            self._apply(key, slot, budget, str(response.status))
+            return response
+        self._observe(budget, error=response.status >= 500)
+        latency = request.meta.get("download_latency")
+        if latency is not None and response.status < 400:
+            budget.latency = latency if budget.latency is None else (
+                self.alpha * latency + (1 - self.alpha) * budget.latency
+            )
+        self._adapt(budget)
+        self._apply(key, slot, budget, "adapt")
+        return response
+
+    def process_exception(self, request, exception, spider=None):
+        # timeout / connection reset: perlakukan seperti sinyal overload
+        key, slot = self._slot(request)
+        if slot is not None:
+            budget = self._budget(key)
+            self._observe(budget, error=True)
+            self._back_off(budget, None)
+            self._apply(key, slot, budget, type(exception).__name__)
+        return None
+
+    def _observe(self, budget: _HostBudget, error: bool):
+        budget.error_rate = self.alpha * (1.0 if error else 0.0) + (1 - self.alpha) * budget.error_rate
+        budget.successes = 0 if error else budget.successes + 1
+
+    def _back_off(self, budget: _HostBudget, retry_after):
+        delay = budget.delay * 2
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        budget.concurrency = max(1, budget.concurrency // 2)
+        budget.delay = min(self.max_delay, max(self.min_delay, delay))
+        budget.successes = 0
+        budget.backoff_until = time.monotonic() + budget.delay * 4
+
+    def _adapt(self, budget: _HostBudget):
+        if budget.latency is None or time.monotonic() < budget.backoff_until:
+            return
+        if budget.latency > self.target_latency or budget.error_rate > self.max_error_rate:
+            # host melambat: kurangi laju tanpa menunggu 429
+            budget.delay = min(self.max_delay, budget.delay * 1.25)
+            budget.successes = 0
+            return
+        # additive increase setiap `concurrency` response sukses berturut-turut
+        if budget.successes >= budget.concurrency:
+            budget.successes = 0
+            if budget.delay > self.min_delay:
+                budget.delay = max(self.min_delay, budget.delay * 0.8)
+            elif budget.concurrency < self.max_concurrency:
+                budget.concurrency += 1
@@ -0,0 +1,69 @@
+import json
+import logging
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+# high-water mark per subdomain: id artikel & waktu terbit tertinggi yang pernah
+# disimpan; dipakai mode standard untuk berhenti paginasi lebih awal.
+# is_known() memakai snapshot saat load/save terakhir, supaya artikel yang baru
+# diambil di siklus berjalan tidak membuat halaman listing berikutnya dianggap lama
+class HighWaterMarks:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.marks = {}
+        self._baseline = {}
+        self._dirty = False
+        self.load()
+
+    @classmethod
+    def from_settings(cls, settings) -> Optional["HighWaterMarks"]:
+        path = settings.get("HIGH_WATER_MARK_PATH")
+        return cls(path) if path else None
+
+    def load(self):
+        if not self.path.exists():
+            return
+        try:
+            self.marks = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            logger.warning("File high-water mark %s tidak valid, diabaikan.", self.path)
+            self.marks = {}
+        self._snapshot()
+
+    def _snapshot(self):
+        self._baseline = {host: mark["max_id"] for host, mark in self.marks.items()}
+
+    def save(self):
+        self._snapshot()
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.marks, indent=1, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+        self._dirty = False
+
+    def max_id(self, host: str) -> int:
+        mark = self.marks.get(host)
+        return mark["max_id"] if mark else 0
+
+    def update(self, host: str, article_id: int, published_at: Optional[str] = None):
+        mark = self.marks.setdefault(host, {"max_id": 0, "max_published_at": None})
+        if article_id > mark["max_id"]:
+            mark["max_id"] = article_id
+            self._dirty = True
+        # string ISO dengan offset yang sama (+07:00) bisa dibandingkan langsung
+        if published_at and (not mark["max_published_at"] or published_at > mark["max_published_at"]):
+            mark["max_published_at"] = published_at
+            self._dirty = True
+
+    def merge(self, other: "HighWaterMarks"):
+        # gabung mark dari run lain (mis. shard backtrack paralel)
+        for host, mark in other.marks.items():
+            self.update(host, mark["max_id"], mark["max_published_at"])
+
+    def is_known(self, host: str, article_id: int) -> bool:
+        return article_id <= self._baseline.get(host, 0)
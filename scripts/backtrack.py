@@ -1,44 +1,284 @@
 import sys
 import os
-from datetime import datetime
+import json
+import shutil
+import multiprocessing
+from multiprocessing.connection import wait
+from datetime import date, timedelta
+from pathlib import Path
 from scrapy.crawler import CrawlerProcess
 from scrapy.utils.project import get_project_settings
 
 # import spider class (sesuaikan nama modul jika berbeda)
 from bisnis_crawler.spiders.bisnis_spider import BisnisSpider
+from bisnis_crawler.dedup import dedupe_files
+from bisnis_crawler.neardup import SimHashIndex
+from bisnis_crawler.seenstore import SeenStore, state_lock
+from bisnis_crawler.watermarks import HighWaterMarks
+
+# sumber discovery: html (indeks harian) | feeds (sitemap + RSS) | both
+DISCOVERY = os.environ.get("BISNIS_DISCOVERY", "html")
+# backtrack paralel: jumlah worker process & ukuran shard (hari)
+DEFAULT_WORKERS = int(os.environ.get("BACKTRACK_WORKERS", "1"))
+DEFAULT_SHARD_DAYS = int(os.environ.get("BACKTRACK_SHARD_DAYS", "1"))
+SHARD_RETRIES = 1
+SHARDS_DIR = Path("data/outputs/shards")
+# JOBDIR Scrapy (antrian request, dupefilter, spider.state) per output; ada = resume
+JOBS_DIR = Path("data/jobs")
+# finish_reason: ditutup oleh spider sendiri = selesai; dihentikan dari luar = bisa di-resume
+DONE_REASONS = ("finished", "max_articles_reached")
+RESUMABLE_REASONS = ("shutdown", "cancelled")
 
 def ensure_dirs():
     os.makedirs("data/outputs", exist_ok=True)
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python scripts/backtrack.py <start_date> <end_date> [max_articles]")
-        sys.exit(1)
-    start = sys.argv[1]
-    end = sys.argv[2]
-    max_a = sys.argv[3] if len(sys.argv) > 3 else None
 
-    ensure_dirs()
-    outfile = f"data/outputs/bisnis_backtrack_{start}_{end}.jsonl"
+def job_settings(jobdir: Path) -> dict:
+    # run yang terhenti dilanjutkan: frontier + dupefilter dari JOBDIR, output di-append
+    # dari checkpoint sink (bukan ditimpa)
+    resume = jobdir.exists()
+    if resume and not (jobdir / "spider.state").exists():
+        # spider.state & metadata antrian hanya ditulis saat stop normal; setelah
+        # kill -9 dupefilter lebih maju dari antrian -> frontier dibangun ulang.
+        # Artikel yang sudah ada di output tetap tidak di-download ulang.
+        print(f"{jobdir} is from an unclean stop, rebuilding the request frontier.")
+        shutil.rmtree(jobdir)
+    return {"JOBDIR": str(jobdir), "OUTPUT_APPEND": resume}
+
 
+def run_single(start, end, outfile, max_a=None, refresh=False) -> bool:
     settings = get_project_settings()
-    # override feed export to target file (jsonlines)
-    settings.set("FEEDS", {
-        outfile: {"format": "jsonlines", "encoding": "utf-8", "overwrite": True}
-    })
+    # satu output sink (pipeline) ke target file (jsonlines)
+    settings.set("OUTPUT_PATH", outfile)
+    jobdir = JOBS_DIR / Path(outfile).stem
+    job = job_settings(jobdir)
+    if job["OUTPUT_APPEND"]:
+        print("Resuming previous run from", jobdir)
+    settings.setdict(job, priority="cmdline")
     # optional: reduce log verbosity
     # settings.set("LOG_LEVEL", "INFO")
 
     process = CrawlerProcess(settings)
-    spider_args = {"start_date": start, "end_date": end}
+    spider_args = {"start_date": start, "end_date": end, "mode": "backtrack", "discovery": DISCOVERY, "refresh": refresh}
     if max_a:
         spider_args["max_articles"] = max_a
 
     # schedule the spider
-    process.crawl(BisnisSpider, **spider_args)
+    crawler = process.create_crawler(BisnisSpider)
+    process.crawl(crawler, **spider_args)
 
     print("Starting spider (programmatic) ...")
     process.start()  # this will block until the crawl is finished
+    reason = crawler.stats.get_value("finish_reason")
+    if reason in RESUMABLE_REASONS:
+        print(f"Crawl stopped ({reason}). Re-run the same command to resume from {jobdir}.")
+        return False
+    # selesai sendiri (termasuk batas max_articles) atau gagal permanen: JOBDIR tidak dipakai lagi
+    shutil.rmtree(jobdir, ignore_errors=True)
+    if reason not in DONE_REASONS:
+        print(f"Crawl failed ({reason}).")
+        return False
+    return True
+
+
+# sharded backtrack: rentang dipecah per N hari, tiap shard dijalankan di
+# process baru (reactor sendiri, output segment sendiri). Coordinator mencatat
+# status shard di manifest.json, lalu merge + dedup segment ke file akhir.
+# Shard yang gagal diulang; run berikutnya dengan argumen sama melanjutkan.
+
+def make_shards(start: str, end: str, shard_days: int) -> list:
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    shards = []
+    day = first
+    while day <= last:
+        shard_end = min(day + timedelta(days=shard_days - 1), last)
+        shards.append({
+            "id": f"{day.isoformat()}_{shard_end.isoformat()}",
+            "start": day.isoformat(),
+            "end": shard_end.isoformat(),
+            "status": "pending",
+            "attempts": 0,
+            "items": 0,
+        })
+        day = shard_end + timedelta(days=1)
+    return shards
+
+
+def load_manifest(shard_dir: Path, start: str, end: str, shard_days: int) -> dict:
+    path = shard_dir / "manifest.json"
+    if path.exists():
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        if manifest["shard_days"] != shard_days:
+            print(f"Resuming with existing shard size ({manifest['shard_days']} days) from {path}")
+        return manifest
+    return {"start": start, "end": end, "shard_days": shard_days, "shards": make_shards(start, end, shard_days)}
+
+
+def save_manifest(shard_dir: Path, manifest: dict):
+    path = shard_dir / "manifest.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    tmp.replace(path)
+
+
+def shard_paths(shard_dir: Path, shard: dict) -> dict:
+    # seen store, index near-dup & high-water mark per shard (di-merge coordinator setelah shard selesai),
+    # log per shard supaya output worker tidak bercampur; murni, tanpa menyentuh disk
+    sid = shard["id"]
+    return {
+        "OUTPUT_PATH": str(shard_dir / f"{sid}.jsonl"),
+        "SEEN_STORE_PATH": str(shard_dir / f"{sid}.seen.u64"),
+        "NEAR_DUP_INDEX_PATH": str(shard_dir / f"{sid}.neardup.bin"),
+        "HIGH_WATER_MARK_PATH": str(shard_dir / f"{sid}.hwm.json"),
+        "LOG_FILE": str(shard_dir / f"{sid}.log"),
+    }
+
+
+def shard_settings(shard_dir: Path, shard: dict) -> dict:
+    # shard yang gagal dilanjutkan dari JOBDIR-nya sendiri (job_settings membersihkan
+    # JOBDIR yang berhenti tidak bersih -> hanya dipanggil saat worker di-start)
+    return {**shard_paths(shard_dir, shard), **job_settings(shard_dir / f"{shard['id']}.job")}
+
+
+def run_shard(shard: dict, overrides: dict, result_path: str, refresh: bool = False):
+    # entry point worker process (spawn): satu shard, satu reactor
+    settings = get_project_settings()
+    settings.setdict(overrides, priority="cmdline")
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(BisnisSpider)
+    process.crawl(
+        crawler, start_date=shard["start"], end_date=shard["end"], mode="backtrack", discovery=DISCOVERY, refresh=refresh
+    )
+    process.start()
+    stats = crawler.stats.get_stats()
+    result = {
+        "finish_reason": stats.get("finish_reason"),
+        "items": stats.get("item_scraped_count", 0),
+        "errors": stats.get("log_count/ERROR", 0),
+    }
+    Path(result_path).write_text(json.dumps(result), encoding="utf-8")
+
+
+def _start_worker(ctx, shard_dir: Path, shard: dict, refresh: bool = False):
+    settings = get_project_settings()
+    overrides = shard_settings(shard_dir, shard)
+    # shard mulai dari salinan seen store global (skip artikel dari run sebelumnya);
+    # shard yang di-resume memakai salinan miliknya sendiri
+    src = Path(settings.get("SEEN_STORE_PATH") or "")
+    if src.name and src.exists() and not Path(overrides["SEEN_STORE_PATH"]).exists():
+        shutil.copyfile(src, overrides["SEEN_STORE_PATH"])
+    # index near-dup global dibaca langsung (tanpa salinan); log shard hanya berisi
+    # entry baru dari shard itu sehingga merge tidak memproses ulang index global
+    overrides["NEAR_DUP_BASE_PATH"] = settings.get("NEAR_DUP_INDEX_PATH")
+    result_path = shard_dir / f"{shard['id']}.result.json"
+    result_path.unlink(missing_ok=True)
+    proc = ctx.Process(target=run_shard, args=(shard, overrides, str(result_path), refresh), name=f"shard-{shard['id']}")
+    proc.start()
+    return proc, result_path
+
+
+def _merge_shard_state(shard_dir: Path, shard: dict):
+    # hanya coordinator yang menulis seen store & high-water mark global
+    settings = get_project_settings()
+    paths = shard_paths(shard_dir, shard)
+    # lock yang sama dengan SeenStore.flush di daemon standard (state dir bersama)
+    with state_lock(settings.get("SEEN_STORE_PATH")):
+        seen = SeenStore.from_settings(settings)
+        if seen is not None and Path(paths["SEEN_STORE_PATH"]).exists():
+            shard_seen = SeenStore(paths["SEEN_STORE_PATH"])
+            seen.update(shard_seen)
+            shard_seen.close()
+            seen.close()
+        near_dup = SimHashIndex.from_settings(settings)
+        if near_dup is not None and Path(paths["NEAR_DUP_INDEX_PATH"]).exists():
+            near_dup.merge(SimHashIndex.read_log(paths["NEAR_DUP_INDEX_PATH"]))
+            near_dup.close()
+        marks = HighWaterMarks.from_settings(settings)
+        if marks is not None:
+            marks.merge(HighWaterMarks(paths["HIGH_WATER_MARK_PATH"]))
+            marks.save()
+
+
+def run_sharded(start, end, outfile, workers: int, shard_days: int, refresh: bool = False) -> bool:
+    shard_dir = SHARDS_DIR / Path(outfile).stem
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(shard_dir, start, end, shard_days)
+    shards = manifest["shards"]
+    ctx = multiprocessing.get_context("spawn")
+
+    for attempt in range(SHARD_RETRIES + 1):
+        pending = [s for s in shards if s["status"] != "done"]
+        if not pending:
+            break
+        print(f"Running {len(pending)} shard(s) on {workers} worker(s) (attempt {attempt + 1}) ...")
+        running = {}
+        while pending or running:
+            while pending and len(running) < workers:
+                shard = pending.pop(0)
+                shard["status"] = "running"
+                shard["attempts"] += 1
+                proc, result_path = _start_worker(ctx, shard_dir, shard, refresh)
+                running[proc.sentinel] = (proc, shard, result_path)
+                save_manifest(shard_dir, manifest)
+            for sentinel in wait(list(running)):
+                proc, shard, result_path = running.pop(sentinel)
+                proc.join()
+                result = json.loads(result_path.read_text(encoding="utf-8")) if result_path.exists() else {}
+                ok = proc.exitcode == 0 and result.get("finish_reason") == "finished"
+                if ok:
+                    _merge_shard_state(shard_dir, shard)
+                shard["status"] = "done" if ok else "failed"
+                shard["items"] = result.get("items", 0)
+                shard["error"] = None if ok else (result.get("finish_reason") or f"exit code {proc.exitcode}")
+                save_manifest(shard_dir, manifest)
+                print(f"Shard {shard['id']}: {shard['status']} ({shard['items']} items)")
+
+    failed = [s["id"] for s in shards if s["status"] != "done"]
+    if failed:
+        print(f"{len(failed)} shard(s) failed: {', '.join(failed)}. Re-run the same command to resume.")
+        return False
+
+    segments = [shard_dir / f"{s['id']}.jsonl" for s in sorted(shards, key=lambda s: s["start"])]
+    kept, dropped = dedupe_files([p for p in segments if p.exists()], outfile)
+    print(f"Merged {len(segments)} shard segment(s): {kept} articles, {dropped} cross-shard duplicates removed")
+    shutil.rmtree(shard_dir)
+    return True
+
+
+def main():
+    argv = sys.argv[1:]
+    workers, shard_days = DEFAULT_WORKERS, DEFAULT_SHARD_DAYS
+    if "--workers" in argv:
+        i = argv.index("--workers")
+        workers = int(argv[i + 1]) if argv[i + 1] != "auto" else (os.cpu_count() or 1)
+        del argv[i:i + 2]
+    if "--shard-days" in argv:
+        i = argv.index("--shard-days")
+        shard_days = max(1, int(argv[i + 1]))
+        del argv[i:i + 2]
+    # --refresh: ambil ulang artikel walaupun sudah ada di seen store
+    refresh = "--refresh" in argv
+    if refresh:
+        argv.remove("--refresh")
+    if len(argv) < 2:
+        print("Usage: python scripts/backtrack.py <start_date> <end_date> [max_articles] [--workers N|auto] [--shard-days D] [--refresh]")
+        sys.exit(1)
+    start = argv[0]
+    end = argv[1]
+    max_a = argv[2] if len(argv) > 2 else None
+
+    ensure_dirs()
+    outfile = f"data/outputs/bisnis_backtrack_{start}_{end}.jsonl"
+
+    if workers > 1 and max_a:
+        # batas artikel global tidak bisa dibagi rata antar shard
+        print("max_articles given, running in a single process.")
+        workers = 1
+    if workers > 1:
+        if not run_sharded(start, end, outfile, workers, shard_days, refresh):
+            sys.exit(1)
+    elif not run_single(start, end, outfile, max_a, refresh):
+        sys.exit(1)
     print("Crawl finished. Output saved to:", outfile)
 
 if __name__ == "__main__":
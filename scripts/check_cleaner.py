@@ -0,0 +1,39 @@
+import sys
+import json
+import time
+from pathlib import Path
+
+from bisnis_crawler.spiders.helpers import clean_text, clean_paragraphs
+
+# golden corpus: input paragraf/judul dari data/outputs/*.jsonl (+ noise) beserta
+# output cleaner lama; cleaner baru harus byte-identical
+GOLDEN_FILE = Path("data/golden/clean_text.jsonl")
+
+
+def main(path: Path = GOLDEN_FILE) -> int:
+    mismatches = 0
+    cases = 0
+    elapsed = 0.0
+    with path.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            case = json.loads(line)
+            t0 = time.perf_counter()
+            if case["kind"] == "paragraphs":
+                got = clean_paragraphs(case["input"], min_total_length=40)
+                each = [clean_text(p) for p in case["input"]]
+            else:
+                got = clean_text(case["input"])
+                each = None
+            elapsed += time.perf_counter() - t0
+            cases += 1
+            if got != case["expected"] or (each is not None and each != case["expected_each"]):
+                mismatches += 1
+                print("MISMATCH:", case["kind"], case["link"])
+    print(f"{cases} cases, {mismatches} mismatches, cleaning time {elapsed * 1000:.1f} ms")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(Path(sys.argv[1]) if len(sys.argv) > 1 else GOLDEN_FILE))
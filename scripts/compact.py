@@ -0,0 +1,62 @@
+import sys
+import time
+from pathlib import Path
+
+from scrapy.utils.project import get_project_settings
+
+from bisnis_crawler.consumer import unconsumed_files
+from bisnis_crawler.store import OutputStore, compact_files
+
+# gabungkan file JSONL di data/outputs ke store terkompresi per tanggal terbit:
+# python -m scripts.compact [--keep] [--min-age 300] [--all]
+#   --keep     jangan hapus file sumber setelah masuk store
+#   --min-age  lewati file yang diubah < N detik lalu (masih ditulis)
+#   --all      ikutkan juga file yang ditunjuk latest.jsonl
+#   --ignore-consumers  gabungkan juga file yang belum habis dibaca consumer (scripts.follow)
+OUT_DIR = Path("data/outputs")
+LATEST_SYMLINK = OUT_DIR / "latest.jsonl"
+DEFAULT_MIN_AGE = 300
+
+
+def compactable_files(out_dir: Path = OUT_DIR, min_age: float = DEFAULT_MIN_AGE, include_latest: bool = False, exclude=(),
+                      respect_consumers: bool = True):
+    skip = {Path(p).resolve() for p in exclude}
+    if respect_consumers:
+        skip.update(p.resolve() for p in unconsumed_files(out_dir))
+    if not include_latest and LATEST_SYMLINK.is_symlink():
+        skip.add(LATEST_SYMLINK.resolve())
+    now = time.time()
+    files = []
+    for path in sorted(out_dir.glob("bisnis_*.jsonl")):
+        if path.is_symlink() or path.resolve() in skip:
+            continue
+        if now - path.stat().st_mtime < min_age:
+            continue
+        files.append(path)
+    return files
+
+
+def compact_outputs(min_age: float = DEFAULT_MIN_AGE, remove: bool = True, include_latest: bool = False, exclude=(),
+                    respect_consumers: bool = True):
+    settings = get_project_settings()
+    files = compactable_files(min_age=min_age, include_latest=include_latest, exclude=exclude,
+                              respect_consumers=respect_consumers)
+    if not files:
+        return {"files": 0, "added": 0, "duplicates": 0}
+    with OutputStore.from_settings(settings) as store:
+        return compact_files(store, files, remove=remove)
+
+
+def main(argv):
+    min_age = DEFAULT_MIN_AGE
+    if "--min-age" in argv:
+        min_age = float(argv[argv.index("--min-age") + 1])
+    t0 = time.perf_counter()
+    stats = compact_outputs(min_age=min_age, remove="--keep" not in argv, include_latest="--all" in argv,
+                            respect_consumers="--ignore-consumers" not in argv)
+    print(f"Compaction done in {time.perf_counter() - t0:.2f}s: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
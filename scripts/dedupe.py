@@ -0,0 +1,32 @@
+import sys
+import time
+from pathlib import Path
+
+from bisnis_crawler.dedup import dedupe_file
+
+# dedup ulang file JSONL lama (output baru sudah di-dedup saat crawl):
+# python -m scripts.dedupe data/outputs/bisnis_standard_*.jsonl
+# python -m scripts.dedupe input.jsonl --out output.jsonl
+
+
+def main(argv):
+    out = None
+    if "--out" in argv:
+        i = argv.index("--out")
+        out = argv[i + 1]
+        argv = argv[:i] + argv[i + 2:]
+    if not argv or (out and len(argv) > 1):
+        print("Usage: python -m scripts.dedupe <file.jsonl> [...] [--out output.jsonl]")
+        return 1
+    for name in argv:
+        path = Path(name)
+        if path.is_symlink():
+            continue
+        t0 = time.perf_counter()
+        kept, dropped = dedupe_file(path, out)
+        print(f"{path}: {kept} kept, {dropped} duplicates removed ({time.perf_counter() - t0:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
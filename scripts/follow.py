@@ -0,0 +1,44 @@
+import json
+import sys
+
+from bisnis_crawler.consumer import OutputConsumer, list_consumers
+
+# stream artikel baru dari data/outputs (JSONL ke stdout) dengan offset per consumer:
+# python -m scripts.follow <name>                 ikuti terus (Ctrl+C untuk berhenti)
+# python -m scripts.follow <name> --once          ambil yang belum terbaca lalu keluar
+# python -m scripts.follow <name> --from-latest   consumer baru mulai dari akhir file
+# python -m scripts.follow --list                 daftar consumer + lag (byte)
+
+
+def print_consumers():
+    for state in list_consumers():
+        consumer = OutputConsumer(state["name"])
+        lag = consumer.lag()
+        print(f"{state['name']}: updated {state['updated_at']}, {len(lag)} file(s), {sum(lag.values())} byte(s) behind")
+    return 0
+
+
+def main(argv):
+    if "--list" in argv:
+        return print_consumers()
+    args = [a for a in argv if not a.startswith("--")]
+    if not args:
+        print("Usage: python -m scripts.follow <name> [--once] [--from-latest] | --list")
+        return 1
+    consumer = OutputConsumer(args[0], start="latest" if "--from-latest" in argv else "earliest")
+    out = sys.stdout
+    try:
+        for record in consumer.follow(idle_timeout=0 if "--once" in argv else None):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            # flush sebelum record berikutnya diminta: batch baru di-commit setelah
+            # semua record-nya sampai ke pembaca (at-least-once)
+            out.flush()
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+    finally:
+        consumer.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
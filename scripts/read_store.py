@@ -0,0 +1,37 @@
+import sys
+
+from scrapy.utils.project import get_project_settings
+
+from bisnis_crawler.store import OutputStore
+
+# baca store terkompresi (JSONL ke stdout):
+# python -m scripts.read_store 2025-11-14 [2025-11-15]     semua artikel dalam rentang tanggal terbit
+# python -m scripts.read_store --get <url|id>               satu artikel via index
+
+
+def main(argv):
+    store = OutputStore.from_settings(get_project_settings())
+    out = sys.stdout.buffer
+    if argv and argv[0] == "--get":
+        if len(argv) < 2:
+            print("Usage: python -m scripts.read_store --get <url|id>")
+            return 1
+        target = int(argv[1]) if argv[1].isdigit() else argv[1]
+        line = store.get_line(target)
+        if line is None:
+            print("Not found", file=sys.stderr)
+            return 1
+        out.write(line + b"\n")
+        return 0
+    if not argv:
+        print("Usage: python -m scripts.read_store <start_date> [end_date] | --get <url|id>")
+        return 1
+    start = argv[0]
+    end = argv[1] if len(argv) > 1 else start
+    for line in store.iter_lines(start, end):
+        out.write(line + b"\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
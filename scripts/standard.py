@@ -1,10 +1,7 @@
 import os
 import sys
-import time
-import json
-import signal
 import shutil
-import tempfile
+import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
@@ -12,7 +9,9 @@ from typing import Optional
 from scrapy.crawler import CrawlerProcess
 from scrapy.utils.project import get_project_settings
 
+from bisnis_crawler import signals as bisnis_signals
 from bisnis_crawler.spiders.bisnis_spider import BisnisSpider
+from scripts.compact import compact_outputs
 
 # configuration
 LAST_RUN_FILE = Path("data/last_run.txt")
@@ -21,21 +20,21 @@ LOCK_FILE = Path("data/standard.lock")
 LATEST_SYMLINK = OUT_DIR / "latest.jsonl"
 
 DEFAULT_INTERVAL = int(os.environ.get("STANDARD_INTERVAL", "900"))  # seconds
-RETRY_ON_ERROR = 1  # how many retries for a failed crawl
-DEDUPE_OUTPUT = True  # produce a .dedup.jsonl version
-
-# graceful shutdown flag
-_should_stop = False
+DISCOVERY = os.environ.get("BISNIS_DISCOVERY", "html")  # html | feeds | both
+# daemon: gabungkan file per siklus ke store terkompresi setiap N siklus (0 = mati)
+COMPACT_EVERY = int(os.environ.get("STANDARD_COMPACT_EVERY", "4"))
+# endpoint metrics lokal (http://127.0.0.1:<port>/metrics); 0 = mati
+METRICS_PORT = int(os.environ.get("STANDARD_METRICS_PORT", "9410"))
+# batas RSS daemon (MB): frontier di-spill ke disk & struktur di-compact; 0 = mati
+MEMORY_BUDGET_MB = int(os.environ.get("STANDARD_MEMORY_BUDGET_MB", "0"))
+# daemon: interval poll adaptif per sumber (STANDARD_INTERVAL = interval awal); 0 = interval tetap
+REVISIT = os.environ.get("STANDARD_REVISIT", "1") not in ("0", "false", "no")
 
+# file output siklus yang sedang ditulis (tidak boleh ikut di-compact)
+_current_output = {"path": None, "compacting": False}
 
-def sigterm_handler(signum, frame):
-    global _should_stop
-    print(f"Received signal {signum}, will stop after current run.")
-    _should_stop = True
-
-
-signal.signal(signal.SIGINT, sigterm_handler)
-signal.signal(signal.SIGTERM, sigterm_handler)
+# SIGINT/SIGTERM ditangani oleh Scrapy (CrawlerProcess.start): graceful stop
+# pada sinyal pertama, force stop pada sinyal kedua
 
 
 def now_utc_iso() -> str:
@@ -72,15 +71,43 @@ def make_outfile_name(ts_iso: str) -> Path:
     return OUT_DIR / f"bisnis_standard_{safe_ts}.jsonl"
 
 
-def acquire_lock() -> bool:
+def pid_alive(pid: int) -> bool:
     try:
-        # create the lock file exclusively
-        fd = os.open(str(LOCK_FILE), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
-        os.write(fd, str(os.getpid()).encode())
-        os.close(fd)
-        return True
-    except FileExistsError:
+        os.kill(pid, 0)
+    except ProcessLookupError:
         return False
+    except PermissionError:
+        return True
+    return True
+
+
+def lock_is_stale() -> bool:
+    # lock dari proses yang mati tanpa release (crash / kill -9)
+    try:
+        txt = LOCK_FILE.read_text(encoding="utf-8").strip()
+        age = time.time() - LOCK_FILE.stat().st_mtime
+    except FileNotFoundError:
+        return True
+    if not txt.isdigit():
+        # lock kosong: proses mati di antara create dan write pid
+        return age > 60
+    return not pid_alive(int(txt))
+
+
+def acquire_lock() -> bool:
+    for _ in range(2):
+        try:
+            # create the lock file exclusively
+            fd = os.open(str(LOCK_FILE), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            os.write(fd, str(os.getpid()).encode())
+            os.close(fd)
+            return True
+        except FileExistsError:
+            if not lock_is_stale():
+                return False
+            print(f"Removing stale lock {LOCK_FILE}")
+            LOCK_FILE.unlink(missing_ok=True)
+    return False
 
 
 def release_lock():
@@ -90,137 +117,139 @@ def release_lock():
         pass
 
 
-def run_crawl(start_iso: str, end_iso: str, outfile: Path, settings_extra: Optional[dict] = None) -> None:
+def run_crawl(start_iso: str, end_iso: str, outfile: Path, settings_extra: Optional[dict] = None, refresh: bool = False) -> None:
     settings = get_project_settings()
-    feeds = {
-        str(outfile): {"format": "jsonlines", "encoding": "utf-8", "overwrite": True}
-    }
+    settings.set("OUTPUT_PATH", str(outfile))
+    settings.set("METRICS_PORT", METRICS_PORT)
+    settings.set("MEMORY_BUDGET_MB", MEMORY_BUDGET_MB)
     if settings_extra:
-        feeds.update(settings_extra.get("FEEDS", {}))
-    settings.set("FEEDS", feeds)
+        settings.setdict(settings_extra)
     process = CrawlerProcess(settings)
-    process.crawl(BisnisSpider, start_date=start_iso, end_date=end_iso)
+    process.crawl(BisnisSpider, start_date=start_iso, end_date=end_iso, discovery=DISCOVERY, refresh=refresh)
     process.start()  # blocking; will run until finished
 
 
-def dedupe_jsonl(infile: Path, outfile: Path, key: str = "link") -> int:
-    seen = set()
-    written = 0
-    with infile.open("r", encoding="utf-8") as inf, \
-            tempfile.NamedTemporaryFile("w", dir=str(outfile.parent), delete=False, encoding="utf-8") as tmpf:
-        tmpname = Path(tmpf.name)
-        for line in inf:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                obj = json.loads(line)
-            except Exception:
-                # skip invalid lines
-                continue
-            k = obj.get(key)
-            if not k:
-                # if no key, still write (but try to avoid duplicates by full-line)
-                k = line
-            if k in seen:
-                continue
-            seen.add(k)
-            tmpf.write(json.dumps(obj, ensure_ascii=False) + "\n")
-            written += 1
-    tmpname.replace(outfile)
-    return written
-
-
-def atomic_move(src: Path, dest: Path):
-    dest_tmp = dest.with_suffix(".tmp")
-    shutil.move(str(src), str(dest_tmp))
-    dest_tmp.replace(dest)
+def run_daemon(start_iso: str, interval: int) -> None:
+    # satu reactor + satu crawler untuk seluruh umur proses; siklus berikutnya
+    # dijadwalkan oleh spider sendiri (connection pool, DNS/robots cache dan
+    # dupefilter tetap hidup antar siklus). Output dirotasi per siklus oleh pipeline.
+    settings = get_project_settings()
+    settings.set("OUTPUT_PATH", str(OUT_DIR / "bisnis_standard_%(cycle_start)s.jsonl"))
+    settings.set("METRICS_PORT", METRICS_PORT)
+    settings.set("MEMORY_BUDGET_MB", MEMORY_BUDGET_MB)
+    settings.set("REVISIT_ENABLED", REVISIT)
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(BisnisSpider)
+    crawler.signals.connect(on_cycle_started, signal=bisnis_signals.cycle_started)
+    crawler.signals.connect(on_cycle_committed, signal=bisnis_signals.cycle_committed)
+    crawler.signals.connect(on_output_opened, signal=bisnis_signals.output_opened)
+    process.crawl(crawler, start_date=start_iso, daemon_interval=interval, discovery=DISCOVERY)
+    process.start()  # blocking sampai SIGINT/SIGTERM
+
+
+def on_cycle_started(spider, cycle, started_at):
+    print(f"Cycle {cycle} started at {started_at.isoformat()}")
+
+
+def on_output_opened(spider, path):
+    print("Writing output to", path)
+    _current_output["path"] = path
+    update_latest_symlink(Path(path))
+
+
+def on_cycle_committed(spider, cycle, started_at, finished_at):
+    # output siklus sudah di-fsync; siklus berikutnya mengambil artikel sejak awal siklus ini
+    write_last_run(started_at.isoformat())
+    took = (finished_at - started_at).total_seconds()
+    print(f"Cycle {cycle} complete in {took:.1f}s, last_run -> {started_at.isoformat()}")
+    if COMPACT_EVERY and cycle % COMPACT_EVERY == 0 and not _current_output["compacting"]:
+        schedule_compaction()
+
+
+def schedule_compaction():
+    # compaction (gzip + fsync) di thread pool reactor, bukan di reactor thread
+    from twisted.internet import threads
+
+    _current_output["compacting"] = True
+    exclude = [_current_output["path"]] if _current_output["path"] else []
+    d = threads.deferToThread(compact_outputs, min_age=0, exclude=exclude)
+
+    def _done(result):
+        _current_output["compacting"] = False
+        if isinstance(result, dict):
+            print("Compaction:", result)
+        else:
+            print("Compaction failed:", result.getErrorMessage())
+
+    d.addBoth(_done)
+
+
+def update_latest_symlink(outfile: Path):
     try:
-        # update symlink to latest
-        if LATEST_SYMLINK.exists() or LATEST_SYMLINK.is_symlink():
-            LATEST_SYMLINK.unlink()
-        LATEST_SYMLINK.symlink_to(dest.name)
+        # try to update a 'latest' symlink or copy on systems without symlinks
+        if LATEST_SYMLINK.is_symlink() or not LATEST_SYMLINK.exists():
+            if LATEST_SYMLINK.exists() or LATEST_SYMLINK.is_symlink():
+                LATEST_SYMLINK.unlink()
+            LATEST_SYMLINK.symlink_to(outfile.name)
     except Exception:
-        # ignore symlink errors on Windows or filesystems without symlink support
-        pass
+        # fallback copy for environments without symlink permission (Windows)
+        try:
+            shutil.copy2(outfile, OUT_DIR / "bisnis_standard_latest.jsonl")
+        except Exception:
+            pass
 
 
-def main(interval: int):
+def main_daemon(interval: int):
     ensure_dirs()
-    print("Standard crawler starting. Interval:", interval, "seconds")
-    while not _should_stop:
-        if not acquire_lock():
-            print("Another instance seems to be running (lock present). Waiting and retrying in 10s.")
-            time.sleep(10)
-            continue
-        try:
-            last = read_last_run()
-            now = now_utc_iso()
-            outfile = make_outfile_name(now)
-            print(f"Running crawler: {last} -> {now} -> {outfile}")
-            success = False
-            attempt = 0
-            while attempt <= RETRY_ON_ERROR and not success:
-                attempt += 1
-                try:
-                    run_crawl(last, now, outfile)
-                    success = True
-                except Exception as e:
-                    print(f"Crawl attempt {attempt} failed:", e)
-                    if attempt <= RETRY_ON_ERROR:
-                        wait = 5 + attempt * 5
-                        print(f"Retrying in {wait}s ...")
-                        time.sleep(wait)
-            if success:
-                # optional dedupe
-                if DEDUPE_OUTPUT:
-                    dedup_path = outfile.with_suffix(".dedup.jsonl")
-                    print("Deduping output ->", dedup_path)
-                    try:
-                        written = dedupe_jsonl(outfile, dedup_path)
-                        # replace original with dedup
-                        dedup_path.replace(outfile)
-                        print(f"Dedup complete. Unique written: {written}")
-                    except Exception as e:
-                        print("Dedup failed:", e)
-                # atomic move / symlink update (outfile already in OUT_DIR, but ensure safe)
-                # here we just ensure file is visible and update last_run
-                write_last_run(now)
-                print("Run complete, output:", outfile)
-                try:
-                    # try to update a 'latest' symlink or copy on systems without symlinks
-                    if LATEST_SYMLINK.is_symlink() or not LATEST_SYMLINK.exists():
-                        if LATEST_SYMLINK.exists():
-                            LATEST_SYMLINK.unlink()
-                        LATEST_SYMLINK.symlink_to(outfile.name)
-                except Exception:
-                    # fallback copy for environments without symlink permission (Windows)
-                    try:
-                        shutil.copy2(outfile, OUT_DIR / "bisnis_standard_latest.jsonl")
-                    except Exception:
-                        pass
-            else:
-                print("All attempts failed for this run.")
-        finally:
-            release_lock()
-
-        # sleep until next iteration unless stopping
-        if _should_stop:
-            print("Stopping as requested.")
-            break
-        print("Sleeping for", interval, "seconds ... (press Ctrl-C to stop)")
-        slept = 0
-        while slept < interval and not _should_stop:
-            sleep_chunk = min(5, interval - slept)
-            time.sleep(sleep_chunk)
-            slept += sleep_chunk
-
+    if not acquire_lock():
+        print("Another instance seems to be running (lock present), exiting.")
+        return
+    try:
+        last = read_last_run()
+        print(f"Standard daemon starting. Interval: {interval} seconds, since: {last}")
+        run_daemon(last, interval)
+    finally:
+        release_lock()
     print("Standard crawler exited.")
 
 
+def main_once(refresh: bool = False):
+    # satu kali crawl lalu keluar (reactor tidak bisa di-start ulang dalam satu proses)
+    ensure_dirs()
+    if not acquire_lock():
+        print("Another instance seems to be running (lock present), exiting.")
+        return
+    try:
+        last = read_last_run()
+        now = now_utc_iso()
+        outfile = make_outfile_name(now)
+        print(f"Running crawler: {last} -> {now} -> {outfile}")
+        try:
+            run_crawl(last, now, outfile, refresh=refresh)
+        except Exception as e:
+            print("Crawl failed:", e)
+            return
+        write_last_run(now)
+        print("Run complete, output:", outfile)
+        update_latest_symlink(outfile)
+    finally:
+        release_lock()
+
+
+def main(interval: int, once: bool = False, refresh: bool = False):
+    if once:
+        # --refresh: ambil ulang artikel yang sudah tersimpan & abaikan cache listing
+        main_once(refresh=refresh)
+    else:
+        if refresh:
+            print("--refresh is only supported together with --once, ignoring.")
+        main_daemon(interval)
+
+
 if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
     try:
-        interval_arg = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_INTERVAL
+        interval_arg = int(args[0]) if args else DEFAULT_INTERVAL
     except Exception:
         interval_arg = DEFAULT_INTERVAL
-    main(interval_arg)
+    main(interval_arg, once="--once" in sys.argv[1:], refresh="--refresh" in sys.argv[1:])
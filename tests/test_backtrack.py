@@ -0,0 +1,74 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SETTINGS = '''
+from bisnis_crawler.settings import *
+
+DOWNLOAD_HANDLERS = {
+    "http": "benchmarks.replay.ReplayDownloadHandler",
+    "https": "benchmarks.replay.ReplayDownloadHandler",
+}
+DOWNLOAD_DELAY = 0
+HOST_THROTTLE_ENABLED = False
+HTTPCACHE_ENABLED = False
+TELNETCONSOLE_ENABLED = False
+METRICS_ENABLED = False
+LOG_LEVEL = "WARNING"
+SEEN_STORE_PATH = "data/seen.u64"
+NEAR_DUP_INDEX_PATH = "data/near_dup.bin"
+'''
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("mock site tidak siap")
+
+
+def test_max_articles_is_a_clean_finish(tmp_path):
+    # scripts/backtrack.py apa adanya (path relatif ke cwd) terhadap mock site lokal
+    (tmp_path / "bench_settings.py").write_text(SETTINGS, encoding="utf-8")
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_site", str(port), "200", "0"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_port(port)
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.pathsep.join([str(ROOT), str(tmp_path)]),
+            SCRAPY_SETTINGS_MODULE="bench_settings",
+            BENCH_MOCK_ADDRESS=f"127.0.0.1:{port}",
+            BACKTRACK_WORKERS="1",
+        )
+        result = subprocess.run(
+            [sys.executable, str(ROOT / "scripts" / "backtrack.py"), "2025-11-09", "2025-11-15", "20"],
+            cwd=tmp_path, env=env, capture_output=True, text=True, timeout=300,
+        )
+    finally:
+        server.terminate()
+        server.wait()
+    assert result.returncode == 0, result.stdout + result.stderr
+    assert "resume" not in result.stdout
+    assert not (tmp_path / "data" / "jobs" / "bisnis_backtrack_2025-11-09_2025-11-15").exists()
+    output = tmp_path / "data" / "outputs" / "bisnis_backtrack_2025-11-09_2025-11-15.jsonl"
+    # request yang sudah in-flight saat limit tercapai tetap ditulis
+    assert len(output.read_text(encoding="utf-8").splitlines()) >= 20
@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from bisnis_crawler.spiders.helpers import clean_paragraphs, clean_text
+
+# golden corpus yang sama dengan scripts/check_cleaner.py: output harus byte-identical
+GOLDEN_FILE = Path(__file__).resolve().parent.parent / "data" / "golden" / "clean_text.jsonl"
+CASES = [json.loads(line) for line in GOLDEN_FILE.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("case", CASES, ids=[f"{i}-{case['kind']}" for i, case in enumerate(CASES)])
+def test_golden_corpus(case):
+    if case["kind"] == "paragraphs":
+        assert clean_paragraphs(case["input"], min_total_length=40) == case["expected"]
+        assert [clean_text(p) for p in case["input"]] == case["expected_each"]
+    else:
+        assert clean_text(case["input"]) == case["expected"]
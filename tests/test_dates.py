@@ -0,0 +1,31 @@
+import pytest
+
+from bisnis_crawler.spiders.helpers import parse_date
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2025-11-15T13:47:00+07:00", "2025-11-15T13:47:00+07:00"),
+    ("2025-11-15T06:47:00Z", "2025-11-15T13:47:00+07:00"),
+    ("Sabtu, 15 November 2025 | 13:47 WIB", "2025-11-15T13:47:00+07:00"),
+    ("15 Nov 2025 13.47 WIB", "2025-11-15T13:47:00+07:00"),
+    ("Sat, 15 Nov 2025 13:47:00 +0700", "2025-11-15T13:47:00+07:00"),
+    ("Sat, 15 Nov 2025 06:47:00 GMT", "2025-11-15T13:47:00+07:00"),
+    # AM/PM: bukan RFC 2822, lewat dateutil (tanpa zona = UTC)
+    ("Nov 15, 2025 1:47 PM", "2025-11-15T20:47:00+07:00"),
+    ("Saturday, November 15, 2025 1:47 PM", "2025-11-15T20:47:00+07:00"),
+    ("Sat, 15 Nov 2025 1:47 PM", "2025-11-15T20:47:00+07:00"),
+    ("Sat, 15 Nov 2025 1:47 AM", "2025-11-15T08:47:00+07:00"),
+])
+def test_parse_date(text, expected):
+    assert parse_date(text, tz="Asia/Jakarta").isoformat() == expected
+
+
+def test_naive_date_in_target_zone():
+    assert parse_date("2025-11-15 13:47", tz="Asia/Jakarta", assume_utc_if_naive=False).isoformat() == (
+        "2025-11-15T13:47:00+07:00"
+    )
+
+
+def test_unparseable_date():
+    with pytest.raises(ValueError):
+        parse_date("bukan tanggal", tz="Asia/Jakarta")
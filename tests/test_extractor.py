@@ -0,0 +1,17 @@
+from lxml import html
+
+from bisnis_crawler.spiders.extractor import extract_article
+
+PAGE = """<html><head><meta property="og:title" content="Judul"></head><body>
+<a href="/read/20251114/10/1928839/lain">lain</a>
+<article><h1>Judul Artikel</h1><p>Paragraf pertama yang cukup panjang untuk lolos batas minimum.</p></article>
+<div class="pagination"><a href="?page=2">2</a><a href="?p=3">3</a><a href="#top">atas</a></div>
+</body></html>"""
+
+
+def test_page_links_collected_in_walk():
+    root = html.fromstring(PAGE)
+    extracted = extract_article(root, page_links=True)
+    assert extracted.title == "Judul Artikel"
+    assert extracted.page_links == ("?page=2", "?p=3")
+    assert extract_article(root).page_links == ()
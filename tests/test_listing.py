@@ -0,0 +1,43 @@
+from scrapy.http import HtmlResponse, Request
+from scrapy.utils.test import get_crawler
+
+from bisnis_crawler.spiders.bisnis_spider import BisnisSpider
+
+LISTING = "https://ekonomi.bisnis.com/index?page=1"
+SEEN = "https://ekonomi.bisnis.com/read/20251114/10/1928839/lama"
+NEW = "https://ekonomi.bisnis.com/read/20251114/10/1928840/baru"
+BODY = f"""<html><body>
+<article><a href="{SEEN}">lama</a></article>
+<article><a href="{NEW}">baru</a></article>
+<div class="pagination"><a rel="next" href="/index?page=2">next</a></div>
+</body></html>""".encode()
+
+
+def _spider(tmp_path):
+    crawler = get_crawler(BisnisSpider, {
+        "SEEN_STORE_PATH": str(tmp_path / "seen.u64"),
+        "NEAR_DUP_INDEX_PATH": str(tmp_path / "near_dup.bin"),
+        "LISTING_DIGEST_PATH": str(tmp_path / "listing_digests.json"),
+        "HIGH_WATER_MARK_PATH": str(tmp_path / "watermarks.json"),
+        "EXTRACTION_POOL_WORKERS": 0,
+    })
+    spider = BisnisSpider.from_crawler(crawler, start_date="2025-11-01", end_date="2025-11-30")
+    spider.seen_store.add_url(SEEN)
+    return spider
+
+
+def _parse(spider, flags=None):
+    response = HtmlResponse(LISTING, body=BODY, flags=flags, request=Request(LISTING, meta={"listing": True}))
+    return [request.url for request in spider.parse(response)]
+
+
+def test_not_modified_listing_still_schedules_unseen_articles(tmp_path):
+    spider = _spider(tmp_path)
+    # body dari cache (304): artikel baru tetap diambil, paginasi tidak
+    assert _parse(spider, flags=["cached"]) == [NEW]
+
+
+def test_unchanged_digest_skips_pagination_only(tmp_path):
+    spider = _spider(tmp_path)
+    assert _parse(spider) == [NEW, "https://ekonomi.bisnis.com/index?page=2"]
+    assert _parse(spider) == [NEW]
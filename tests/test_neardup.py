@@ -0,0 +1,64 @@
+import random
+
+from bisnis_crawler.neardup import SimHashIndex, hamming, simhash
+
+
+def _tables(index):
+    return [list(t) for t in index._tables], list(index._keys), list(index._clusters)
+
+
+def test_flush_merges_pending_into_sorted_tables(tmp_path):
+    rng = random.Random(7)
+    index = SimHashIndex(tmp_path / "nd.bin", flush_every=0)
+    entries = [(rng.getrandbits(64), i, i) for i in range(3000)]
+    for n, (value, key, cluster) in enumerate(entries):
+        index.add(value, key, cluster)
+        if n % 700 == 0:
+            index.flush()
+    index.flush()
+    # hasil merge bertahap sama dengan tabel yang dibangun ulang dari log
+    assert _tables(index) == _tables(SimHashIndex(tmp_path / "nd.bin"))
+    assert all(list(t) == sorted(t) for t in index._tables)
+
+
+def test_query_before_and_after_flush(tmp_path):
+    index = SimHashIndex(tmp_path / "nd.bin", flush_every=0)
+    value = random.Random(1).getrandbits(64)
+    index.add(value, 11, 11)
+    near = value ^ 0b101  # jarak 2
+    assert index.query(near).key == 11
+    index.flush()
+    match = index.query(near)
+    assert (match.key, match.distance) == (11, 2)
+    assert index.query(value ^ 0b1111) is None
+
+
+def test_simhash_similar_text():
+    text = " ".join(f"kata{i}" for i in range(200))
+    edited = text.replace("kata50", "ubah")
+    assert hamming(simhash(text), simhash(edited)) <= 3
+    assert simhash("terlalu pendek") is None
+
+
+def test_merge_dedupes_on_simhash_and_key(tmp_path):
+    value = random.Random(2).getrandbits(64)
+    main = SimHashIndex(tmp_path / "main.bin")
+    main.add(value, 1, 1)
+    main.add(value, 2, 1)
+    main.close()
+
+    # shard membaca index global sebagai base; log shard hanya berisi entry baru
+    shard = SimHashIndex(tmp_path / "shard.bin", base=tmp_path / "main.bin")
+    assert len(shard) == 2 and shard.query(value).cluster == 1
+    shard.add(value, 3, 1)
+    shard.add(value ^ 0xFFFF0000, 4, 4)
+    shard.close()
+    assert len(list(SimHashIndex.read_log(tmp_path / "shard.bin"))) == 2
+
+    main = SimHashIndex(tmp_path / "main.bin")
+    for _ in range(2):
+        main.merge(SimHashIndex.read_log(tmp_path / "shard.bin"))
+    main.close()
+    merged = sorted(SimHashIndex(tmp_path / "main.bin"))
+    assert [(k, c) for _, k, c in merged if _ == value] == [(1, 1), (2, 1), (3, 1)]
+    assert len(merged) == 4
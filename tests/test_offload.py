@@ -0,0 +1,24 @@
+import threading
+
+from twisted.internet import defer, reactor
+
+from bisnis_crawler import offload
+from bisnis_crawler.offload import ExtractionPool
+
+
+def test_close_errbacks_queued_jobs(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(offload, "extract_job", lambda *args: release.wait(5) and "ok")
+    pool = ExtractionPool(1, kind="thread")
+    running = pool._submit(b"", "utf-8", False)
+    queued = pool._submit(b"", "utf-8", False)
+    results = {}
+    running.addCallback(lambda value: results.setdefault("running", value))
+    queued.addErrback(lambda failure: results.setdefault("queued", failure.trap(defer.CancelledError)))
+
+    pool.close()
+    release.set()
+    pool._executor.shutdown(wait=True)
+    # callFromThread -> antrian reactor; jalankan tanpa start reactor
+    reactor.runUntilCurrent()
+    assert results == {"running": "ok", "queued": defer.CancelledError}
@@ -0,0 +1,86 @@
+import pytest
+
+from bisnis_crawler.revisit import RevisitScheduler
+
+HOUR = 3600.0
+T0 = 1_700_000_000.0
+
+
+def _poll(scheduler, key, started, ids, requests=1):
+    scheduler.start_poll(key, now=started)
+    for i in range(requests):
+        scheduler.record(key, ids if i == 0 else ())
+    scheduler.finish()
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    s = RevisitScheduler(tmp_path / "revisit.json", default_interval=900, min_interval=120, max_interval=7200,
+                         target_new=3, alpha=0.5)
+    s.register(["home", "index:market"])
+    return s
+
+
+def test_first_poll_only_sets_baseline(scheduler):
+    _poll(scheduler, "home", T0, [100, 105])
+    source = scheduler.sources["home"]
+    assert source["rate"] is None and source["max_id"] == 105
+    assert source["interval"] == 900
+    assert source["next_due"] == T0 + 900
+
+
+def test_interval_follows_publish_rate(scheduler):
+    _poll(scheduler, "home", T0, [100])
+    # 6 artikel baru dalam 1 jam -> 3 artikel baru tiap 30 menit
+    _poll(scheduler, "home", T0 + HOUR, range(101, 107))
+    source = scheduler.sources["home"]
+    assert source["rate"] == pytest.approx(6.0)
+    assert source["interval"] == pytest.approx(1800.0)
+    # EWMA: 0 baru di jam berikutnya -> laju 3/jam -> interval 1 jam
+    _poll(scheduler, "home", T0 + 2 * HOUR, [106])
+    assert source["rate"] == pytest.approx(3.0)
+    assert source["interval"] == pytest.approx(HOUR)
+
+
+def test_interval_is_clamped(scheduler):
+    _poll(scheduler, "home", T0, [100])
+    _poll(scheduler, "home", T0 + HOUR, range(101, 1101))
+    assert scheduler.sources["home"]["interval"] == 120
+
+
+def test_quiet_source_backs_off(scheduler):
+    _poll(scheduler, "home", T0, [100])
+    _poll(scheduler, "home", T0 + 900, [])
+    assert scheduler.sources["home"]["interval"] == 1800
+    _poll(scheduler, "home", T0 + 2700, [])
+    assert scheduler.sources["home"]["interval"] == 3600
+
+
+def test_failed_poll_keeps_schedule(scheduler):
+    _poll(scheduler, "home", T0, [100])
+    scheduler.start_poll("home", now=T0 + 500)
+    scheduler.record("home", failed=True)
+    scheduler.finish()
+    source = scheduler.sources["home"]
+    assert source["polls"] == 1 and source["last_poll"] == T0
+    assert source["next_due"] == T0 + 500 + 900
+
+
+def test_budget_scales_all_intervals(scheduler):
+    scheduler.budget = 4  # request listing per jam
+    # 2 sumber x 1 request x 4 poll/jam = 8/jam -> faktor 2
+    assert scheduler.budget_factor() == pytest.approx(2.0)
+    assert scheduler.effective_interval("home") == pytest.approx(1800)
+    assert scheduler.snapshot()["home"]["interval_s"] == 1800
+
+
+def test_due_and_state_roundtrip(scheduler, tmp_path):
+    _poll(scheduler, "home", T0, [100])
+    assert scheduler.due(now=T0 + 10) == ["index:market"]
+    assert scheduler.next_cycle_delay(now=T0 + 10) == scheduler.min_gap
+    scheduler.save()
+    reloaded = RevisitScheduler(tmp_path / "revisit.json")
+    reloaded.register(["home"])
+    assert reloaded.sources["home"]["max_id"] == 100
+    assert reloaded.last_poll("home").timestamp() == T0
+    assert reloaded.window_start(["home", "index:market"]).timestamp() == T0
@@ -0,0 +1,73 @@
+from bisnis_crawler.seenstore import KeySet, SeenStore, state_lock
+
+
+def test_flush_and_reload(tmp_path):
+    path = tmp_path / "seen.u64"
+    store = SeenStore(path, flush_every=0)
+    store.update([5, 1, 9])
+    store.add(3)
+    # key baru terlihat sebelum flush
+    assert 3 in store and 9 in store and 4 not in store
+    store.flush()
+    store.add(7)
+    store.close()
+
+    reloaded = SeenStore(path)
+    assert sorted(reloaded) == [1, 3, 5, 7, 9]
+    assert 7 in reloaded and 2 not in reloaded
+    # file = array uint64 terurut
+    assert path.stat().st_size == 5 * 8
+    reloaded.close()
+
+
+def test_reload_ignores_partial_tail(tmp_path):
+    path = tmp_path / "seen.u64"
+    store = SeenStore(path)
+    store.update([10, 20])
+    store.close()
+    with path.open("ab") as fh:
+        fh.write(b"\x01\x02\x03")
+
+    reloaded = SeenStore(path, bloom_bits=1024)
+    assert len(reloaded) == 2 and 20 in reloaded
+    reloaded.add_url("https://ekonomi.bisnis.com/read/20251114/10/1928839/judul")
+    reloaded.close()
+    assert SeenStore(path).contains_url("https://ekonomi.bisnis.com/read/20251114/10/1928839/lain")
+
+
+def test_keyset_compact():
+    keys = KeySet([4, 2], merge_every=2)
+    assert keys.add(8) and not keys.add(2)
+    keys.compact()
+    assert list(keys) == [2, 4, 8] and 8 in keys and 5 not in keys
+
+
+def test_held_keys_wait_for_release(tmp_path):
+    path = tmp_path / "seen.u64"
+    store = SeenStore(path, flush_every=1)
+    store.add(1)
+    # key held terlihat, tapi tidak ikut flush (auto maupun manual) sebelum release
+    store.add(2, held=True)
+    store.flush()
+    assert 2 in store and len(store) == 2
+    assert sorted(SeenStore(path)) == [1]
+
+    store.release()
+    assert sorted(SeenStore(path)) == [1, 2]
+    store.add(3, held=True)
+    store.close()
+    assert sorted(SeenStore(path)) == [1, 2]
+
+
+def test_flush_keeps_keys_from_other_writer(tmp_path):
+    path = tmp_path / "seen.u64"
+    daemon = SeenStore(path, flush_every=0)
+    daemon.add(5)
+    # writer lain (merge backtrack) mengganti file setelah daemon membuka store
+    with state_lock(path):
+        other = SeenStore(path, flush_every=0)
+        other.update([1, 5, 9])
+        other.close()
+    daemon.add(3)
+    daemon.close()
+    assert sorted(SeenStore(path)) == [1, 3, 5, 9]
@@ -0,0 +1,44 @@
+import json
+
+from bisnis_crawler.sink import JsonlSink
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_checkpoint_recovery_keeps_complete_lines(tmp_path):
+    path = tmp_path / "out.jsonl"
+    sink = JsonlSink(path, fsync_interval=0)
+    for i in range(3):
+        sink.write({"i": i})
+    sink.checkpoint()
+    ckpt = JsonlSink.read_checkpoint(path)
+    assert ckpt == {"offset": path.stat().st_size, "records": 3}
+    sink.close()
+
+    # process di-kill setelah checkpoint: satu baris lengkap + satu baris terpotong
+    with path.open("ab") as fh:
+        fh.write(b'{"i": 3}\n{"i": 4')
+    JsonlSink.checkpoint_path(path).write_text(json.dumps(ckpt), encoding="utf-8")
+
+    sink = JsonlSink(path, append=True)
+    assert sink.records == 4
+    sink.write({"i": 5})
+    sink.close()
+    assert [r["i"] for r in _lines(path)] == [0, 1, 2, 3, 5]
+    assert JsonlSink.read_checkpoint(path)["records"] == 5
+
+
+def test_stale_checkpoint_rescans_file(tmp_path):
+    path = tmp_path / "out.jsonl"
+    path.write_text('{"i": 0}\nnot json\n{"i": 2}\n', encoding="utf-8")
+    # checkpoint di luar ukuran file (file diganti/di-truncate): scan dari awal
+    JsonlSink.checkpoint_path(path).write_text(json.dumps({"offset": 10 ** 6, "records": 99}), encoding="utf-8")
+
+    # baris rusak di tengah dilewati (tidak dihitung), record sesudahnya tetap ada
+    sink = JsonlSink(path, append=True)
+    assert sink.records == 2
+    sink.write({"i": 3})
+    sink.close()
+    assert path.read_text(encoding="utf-8") == '{"i": 0}\nnot json\n{"i": 2}\n{"i": 3}\n'
@@ -0,0 +1,90 @@
+import pytest
+
+from bisnis_crawler import store as store_mod
+from bisnis_crawler.store import INDEX_FILE, REPACK_INDEX_FILE, OutputStore, read_index, read_range
+
+
+def _record(i, day="2025-11-14"):
+    return {
+        "link": f"https://ekonomi.bisnis.com/read/{day.replace('-', '')}/9/{1900000 + i}/judul-{i}",
+        "published_at": f"{day}T10:00:00+07:00",
+        "content": f"isi artikel {i}",
+    }
+
+
+def _fill(root, n=40, days=("2025-11-13", "2025-11-14")):
+    # flush per record -> banyak blok kecil (kandidat repack)
+    store = OutputStore(root, block_records=64)
+    records = [_record(i, days[i % len(days)]) for i in range(n)]
+    for record in records:
+        store.add(record)
+        store.flush()
+    return store, records
+
+
+def test_locate_by_url_key_and_day(tmp_path):
+    store, records = _fill(tmp_path)
+    for record in records:
+        assert store.get(record["link"]) == record
+    day, entry = store.locate(1900001)
+    assert day == "2025-11-14" and entry.key == 1900001
+    assert store.locate(1900001, day="2025-11-13") is None
+    assert store.get(1999999) is None
+    assert read_range(tmp_path / "2025-11-14") == (1900001, 1900039)
+
+
+def test_locate_skips_partitions_outside_key_range(tmp_path, monkeypatch):
+    store, _ = _fill(tmp_path)
+    reads = []
+    real = store_mod.read_index
+    monkeypatch.setattr(store_mod, "read_index", lambda *a, **kw: reads.append(a[0]) or real(*a, **kw))
+    assert store.locate(5) is None
+    assert reads == []
+
+
+def test_locate_sees_appends_after_first_lookup(tmp_path):
+    store, _ = _fill(tmp_path)
+    assert store.get(1900100) is None
+    late = _record(100)
+    store.add(late)
+    store.flush()
+    assert store.get(late["link"]) == late
+
+
+def test_repack_merges_blocks(tmp_path):
+    store, records = _fill(tmp_path)
+    part = tmp_path / "2025-11-14"
+    assert len({(e.segment, e.offset) for e in read_index(part)}) == 20
+    assert store.repack("2025-11-14")
+    assert len({(e.segment, e.offset) for e in read_index(part)}) == 1
+    assert sorted(p.name for p in part.iterdir()) == [INDEX_FILE, "index.range", "seg-000002.jsonl.gz"]
+    reopened = OutputStore(tmp_path)
+    for record in records:
+        assert reopened.get(record["link"]) == record
+    assert len(list(reopened.iter_lines())) == len(records)
+
+
+def test_repack_crash_before_swap_keeps_partition(tmp_path, monkeypatch):
+    store, records = _fill(tmp_path)
+    part = tmp_path / "2025-11-14"
+    before = (part / INDEX_FILE).read_bytes()
+
+    def crash(src, dst):
+        raise OSError("crash")
+
+    monkeypatch.setattr(store_mod.os, "replace", crash)
+    with pytest.raises(OSError):
+        store.repack("2025-11-14")
+    monkeypatch.undo()
+
+    # index lama utuh; segment & index baru hanya sisa yang tidak direferensikan
+    assert (part / INDEX_FILE).read_bytes() == before
+    assert (part / REPACK_INDEX_FILE).exists()
+    reopened = OutputStore(tmp_path, block_records=64)
+    assert len(list(reopened.iter_lines("2025-11-14", "2025-11-14"))) == len(records) // 2
+    # repack berikutnya membuang sisa crash lalu berhasil
+    assert reopened.repack("2025-11-14")
+    assert not (part / REPACK_INDEX_FILE).exists()
+    assert len(list(part.glob("seg-*.jsonl.gz"))) == 1
+    for record in records:
+        assert reopened.get(record["link"]) == record